@@ -1,21 +1,28 @@
 #!/usr/bin/env python3
 """
-Étape 1 : Récupérer toutes les villes de Lombardie avec +10.000 habitants.
-Source: GeoNames API (compte gratuit requis)
+Étape 1 : Récupérer toutes les villes de la région du site avec +10.000 habitants.
+Source: dumps locaux GeoNames (IT.txt) + ISTAT, hors-ligne, si présents
+Sinon : GeoNames API (compte gratuit requis)
 Fallback: Wikidata SPARQL (pas de compte requis)
+
+Usage :
+    python scripts/01_fetch_cities.py                   # région de config.py
+    python scripts/01_fetch_cities.py --region Veneto   # autre région (dumps)
+    python scripts/01_fetch_cities.py --all             # toute l'Italie (dumps)
 """
 
-import json
+import argparse
+import csv
 import os
 import sys
 import time
-import requests
 import unicodedata
 import re
 
 # Ajouter le dossier parent au path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.config import *
+from scripts.city_model import City, save_cities
 
 
 def slugify(text):
@@ -28,9 +35,10 @@ def slugify(text):
     return text
 
 
-def fetch_from_wikidata():
+def fetch_from_wikidata(region=REGION, region_qid=WIKIDATA_REGION):
     """
-    Récupère les villes de Lombardie via Wikidata SPARQL.
+    Récupère les villes d'une région via Wikidata SPARQL.
+    region_qid : QID Wikidata de la région (config.SITES, « wikidata_region »).
     Pas besoin de compte — méthode recommandée.
     """
     print("📡 Récupération des villes via Wikidata SPARQL...")
@@ -38,7 +46,7 @@ def fetch_from_wikidata():
     query = """
     SELECT ?city ?cityLabel ?population ?coordinates ?province ?provinceLabel ?postalCode ?area WHERE {
       ?city wdt:P31 wd:Q747074 .            # instance of: comune of Italy
-      ?city wdt:P131* wd:Q1210 .             # located in: Lombardy (recursive)
+      ?city wdt:P131* wd:%s .                # located in: région (récursif)
       ?city wdt:P1082 ?population .          # population
       OPTIONAL { ?city wdt:P625 ?coordinates . }
       OPTIONAL { ?city wdt:P131 ?province . ?province wdt:P31 wd:Q15089 . }
@@ -48,7 +56,7 @@ def fetch_from_wikidata():
       SERVICE wikibase:label { bd:serviceParam wikibase:language "it,en" . }
     }
     ORDER BY DESC(?population)
-    """
+    """ % region_qid
 
     url = "https://query.wikidata.org/sparql"
     headers = {
@@ -56,6 +64,8 @@ def fetch_from_wikidata():
         "User-Agent": "RossiniEnergySEO/1.0 (info@rossinienergy.com)"
     }
 
+    import requests  # seulement sans les dumps locaux
+
     response = requests.get(url, params={"query": query}, headers=headers, timeout=60)
     response.raise_for_status()
     data = response.json()
@@ -79,27 +89,27 @@ def fetch_from_wikidata():
                 lng = float(match.group(1))
                 lat = float(match.group(2))
 
-        city = {
-            "name": name,
-            "slug": slugify(name),
-            "population": int(float(item["population"]["value"])),
-            "latitude": lat,
-            "longitude": lng,
-            "province": item.get("provinceLabel", {}).get("value", ""),
-            "postal_code": item.get("postalCode", {}).get("value", ""),
-            "area_km2": round(float(item["area"]["value"]), 1) if "area" in item else None,
-            "wikidata_id": item["city"]["value"].split("/")[-1],
-            "region": "Lombardia",
-            "country": "IT"
-        }
+        city = City(
+            name=name,
+            slug=slugify(name),
+            population=int(float(item["population"]["value"])),
+            latitude=lat,
+            longitude=lng,
+            province=item.get("provinceLabel", {}).get("value", ""),
+            postal_code=item.get("postalCode", {}).get("value", ""),
+            area_km2=round(float(item["area"]["value"]), 1) if "area" in item else None,
+            wikidata_id=item["city"]["value"].split("/")[-1],
+            region=region,
+            country="IT"
+        )
         cities.append(city)
 
     return cities
 
 
-def fetch_from_geonames():
+def fetch_from_geonames(region=REGION):
     """
-    Récupère les villes via GeoNames API.
+    Récupère les villes d'une région via GeoNames API.
     Nécessite un compte gratuit (username dans config.py).
     """
     if GEONAMES_USERNAME == "YOUR_USERNAME":
@@ -108,11 +118,10 @@ def fetch_from_geonames():
 
     print("📡 Récupération des villes via GeoNames API...")
 
-    # Code admin1 pour Lombardie dans GeoNames : 09
     url = "http://api.geonames.org/searchJSON"
     params = {
         "country": "IT",
-        "adminCode1": "09",  # Lombardia
+        "adminCode1": GEONAMES_ADMIN1[region],
         "featureClass": "P",
         "featureCode": "PPL",
         "maxRows": 500,
@@ -120,6 +129,8 @@ def fetch_from_geonames():
         "username": GEONAMES_USERNAME
     }
 
+    import requests
+
     cities = []
     response = requests.get(url, params=params, timeout=30)
     data = response.json()
@@ -133,31 +144,248 @@ def fetch_from_geonames():
         if pop < MIN_POPULATION:
             continue
 
-        city = {
-            "name": g["name"],
-            "slug": slugify(g["name"]),
-            "population": pop,
-            "latitude": float(g["lat"]),
-            "longitude": float(g["lng"]),
-            "province": g.get("adminName2", ""),
-            "postal_code": "",
-            "area_km2": None,
-            "geonames_id": g["geonameId"],
-            "region": "Lombardia",
-            "country": "IT"
-        }
+        city = City(
+            name=g["name"],
+            slug=slugify(g["name"]),
+            population=pop,
+            latitude=float(g["lat"]),
+            longitude=float(g["lng"]),
+            province=g.get("adminName2", ""),
+            postal_code="",
+            area_km2=None,
+            geonames_id=g["geonameId"],
+            region=region,
+            country="IT"
+        )
         cities.append(city)
 
     return cities
 
 
+# Codes admin1 GeoNames des régions italiennes
+GEONAMES_ADMIN1 = {
+    "Abruzzo": "01", "Basilicata": "02", "Calabria": "03", "Campania": "04",
+    "Emilia-Romagna": "05", "Friuli-Venezia Giulia": "06", "Lazio": "07",
+    "Liguria": "08", "Lombardia": "09", "Marche": "10", "Molise": "11",
+    "Piemonte": "12", "Puglia": "13", "Sardegna": "14", "Sicilia": "15",
+    "Toscana": "16", "Trentino-Alto Adige": "17", "Umbria": "18",
+    "Valle d'Aosta": "19", "Veneto": "20",
+}
+
+# Colonnes de IT.txt (format « geoname » de GeoNames)
+GN_ID, GN_NAME, GN_LAT, GN_LNG, GN_CLASS, GN_CODE = 0, 1, 4, 5, 6, 7
+GN_ADMIN1, GN_ADMIN2, GN_ADMIN3, GN_POPULATION = 10, 11, 12, 14
+
+
+def open_text(path):
+    """Ouvre un CSV en UTF-8, ou en Windows-1252 (export ISTAT historique)."""
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+    try:
+        head.decode("utf-8")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "cp1252"
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def normalize_istat(code):
+    """Code ISTAT comune sur 6 chiffres (« 15146 » → « 015146 »)."""
+    code = (code or "").strip()
+    return code.zfill(6) if code.isdigit() else code
+
+
+def read_geonames_dump(path, admin1_codes=None):
+    """
+    Lit IT.txt ligne par ligne et ne garde que la région demandée.
+    Retourne (comuni ADM3 par code ISTAT, lieu habité le plus peuplé par code ISTAT).
+    Pour l'Italie, le code admin3 de GeoNames est le code ISTAT du comune.
+    """
+    comuni, places = {}, {}
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) <= GN_POPULATION:
+                continue
+            if admin1_codes and row[GN_ADMIN1] not in admin1_codes:
+                continue
+            istat = normalize_istat(row[GN_ADMIN3])
+            if not istat:
+                continue
+
+            entry = {
+                "geonames_id": int(row[GN_ID]),
+                "name": row[GN_NAME],
+                "latitude": float(row[GN_LAT]),
+                "longitude": float(row[GN_LNG]),
+                "population": int(row[GN_POPULATION] or 0),
+                "admin1": row[GN_ADMIN1],
+                "admin2": row[GN_ADMIN2],
+            }
+
+            if row[GN_CLASS] == "A" and row[GN_CODE] == "ADM3":
+                comuni[istat] = entry
+            elif row[GN_CLASS] == "P":
+                best = places.get(istat)
+                if best is None or entry["population"] > best["population"]:
+                    places[istat] = entry
+
+    return comuni, places
+
+
+def _column(header, prefix):
+    """Index de la colonne ISTAT dont le nom (normalisé) commence par prefix."""
+    for i, name in enumerate(header):
+        if " ".join(name.split()).lower().startswith(prefix):
+            return i
+    return None
+
+
+def read_istat_comuni(path, region=None):
+    """
+    Lit l'elenco comuni ISTAT (CSV « ; »).
+    Retourne {code ISTAT: {name, region, province, population}}.
+    """
+    comuni = {}
+    with open_text(path) as f:
+        reader = csv.reader(f, delimiter=";")
+        header = next(reader)
+        col_code = _column(header, "codice comune formato alfanumerico")
+        col_name = _column(header, "denominazione in italiano")
+        col_region = _column(header, "denominazione regione")
+        col_uts = _column(header, "denominazione dell'unità territoriale sovracomunale")
+        col_uts_type = _column(header, "tipologia di unità territoriale sovracomunale")
+        col_population = _column(header, "popolazione legale")
+
+        # ISTAT renomme parfois ses colonnes d'une édition à l'autre
+        required = {
+            "codice comune formato alfanumerico": col_code,
+            "denominazione in italiano": col_name,
+            "denominazione regione": col_region,
+        }
+        missing = [name for name, col in required.items() if col is None]
+        if missing:
+            print(f"❌ {path} : colonne(s) introuvable(s) dans l'en-tête : {', '.join(missing)}")
+            sys.exit(1)
+
+        for row in reader:
+            if len(row) <= max(col_code, col_name, col_region):
+                continue
+            # « Valle d'Aosta/Vallée d'Aoste » → « Valle d'Aosta »
+            region_name = row[col_region].split("/")[0].strip()
+            if region and region_name.lower() != region.lower():
+                continue
+
+            uts = row[col_uts].strip() if col_uts is not None else ""
+            # Tipologia 3 = città metropolitana, sinon provincia / libero consorzio
+            if uts and col_uts_type is not None and row[col_uts_type].strip() == "3":
+                province = f"città metropolitana di {uts}"
+            else:
+                province = f"provincia di {uts}" if uts else ""
+
+            population = None
+            if col_population is not None:
+                digits = re.sub(r"\D", "", row[col_population])
+                population = int(digits) if digits else None
+
+            comuni[normalize_istat(row[col_code])] = {
+                "name": row[col_name].strip(),
+                "region": region_name,
+                "province": province,
+                "population": population,
+            }
+    return comuni
+
+
+def read_wikidata_istat(path):
+    """Correspondance code ISTAT → QID Wikidata (CSV item,istat)."""
+    mapping = {}
+    with open_text(path) as f:
+        for row in csv.DictReader(f):
+            qid = row.get("item", "").rsplit("/", 1)[-1]
+            istat = normalize_istat(row.get("istat", ""))
+            if qid and istat:
+                mapping[istat] = qid
+    return mapping
+
+
+def load_from_dumps(region=REGION):
+    """
+    Construit la liste des villes depuis les dumps locaux, sans réseau.
+    region=None : toute l'Italie.
+    """
+    if not os.path.exists(GEONAMES_DUMP):
+        return None
+
+    print(f"📂 Lecture des dumps locaux ({GEONAMES_DUMP})...")
+    admin1 = {GEONAMES_ADMIN1[region]} if region else None
+    gn_comuni, gn_places = read_geonames_dump(GEONAMES_DUMP, admin1)
+
+    # Liste de référence : ISTAT si disponible, sinon les ADM3 de GeoNames
+    if os.path.exists(ISTAT_COMUNI_CSV):
+        comuni = read_istat_comuni(ISTAT_COMUNI_CSV, region)
+    else:
+        comuni = {
+            code: {"name": g["name"], "region": region or "", "province": "", "population": None}
+            for code, g in gn_comuni.items()
+        }
+
+    qids = read_wikidata_istat(WIKIDATA_ISTAT_CSV) if os.path.exists(WIKIDATA_ISTAT_CSV) else {}
+
+    cities = []
+    for code, comune in comuni.items():
+        adm3 = gn_comuni.get(code)
+        place = gn_places.get(code)
+
+        population = comune["population"]
+        if population is None:
+            population = max((g["population"] for g in (adm3, place) if g), default=0)
+        if population < MIN_POPULATION:
+            continue
+
+        # Coordonnées : centroïde ADM3, sinon le lieu habité principal
+        geo = adm3 if adm3 and adm3["latitude"] else place
+
+        cities.append(City(
+            name=comune["name"],
+            slug=slugify(comune["name"]),
+            population=population,
+            latitude=geo["latitude"] if geo else None,
+            longitude=geo["longitude"] if geo else None,
+            province=comune["province"],
+            postal_code="",
+            area_km2=None,
+            wikidata_id=qids.get(code),
+            geonames_id=adm3["geonames_id"] if adm3 else None,
+            istat_code=code,
+            region=comune["region"] or region or "",
+            country="IT"
+        ))
+
+    missing = sum(1 for c in cities if c.latitude is None)
+    if missing:
+        print(f"⚠️  {missing} comuni sans coordonnées dans {GEONAMES_DUMP}")
+    return cities
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Liste des villes d'une région (ou de l'Italie)")
+    parser.add_argument("--region", default=REGION, choices=sorted(GEONAMES_ADMIN1))
+    parser.add_argument("--all", action="store_true", help="toute l'Italie (dumps locaux requis)")
+    args = parser.parse_args()
+    region = None if args.all else args.region
+
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    # Essayer GeoNames d'abord, sinon Wikidata
-    cities = fetch_from_geonames()
+    # Dumps locaux d'abord (hors-ligne), puis GeoNames API, sinon Wikidata
+    cities = load_from_dumps(region)
+    if not cities and region != REGION:
+        print(f"❌ Les APIs ne couvrent que {REGION} : placer les dumps dans {os.path.dirname(GEONAMES_DUMP)}/")
+        sys.exit(1)
+    if not cities:
+        cities = fetch_from_geonames(region)
     if not cities:
-        cities = fetch_from_wikidata()
+        cities = fetch_from_wikidata(region)
 
     if not cities:
         print("❌ Aucune ville récupérée !")
@@ -167,24 +395,23 @@ def main():
     seen_slugs = set()
     unique_cities = []
     for c in cities:
-        if c["slug"] not in seen_slugs:
-            seen_slugs.add(c["slug"])
+        if c.slug not in seen_slugs:
+            seen_slugs.add(c.slug)
             unique_cities.append(c)
     cities = unique_cities
 
     # Trier par population décroissante
-    cities.sort(key=lambda x: x["population"], reverse=True)
+    cities.sort(key=lambda x: x.population, reverse=True)
 
     # Sauvegarder
-    output_path = os.path.join(DATA_DIR, "cities_lombardia.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    output_path = os.path.join(DATA_DIR, f"cities_{slugify(region or 'Italia')}.json")
+    save_cities(cities, output_path)
 
-    print(f"\n✅ {len(cities)} villes trouvées en Lombardie (+{MIN_POPULATION} habitants)")
+    print(f"\n✅ {len(cities)} villes trouvées en {region or 'Italia'} (+{MIN_POPULATION} habitants)")
     print(f"📄 Sauvegardé dans {output_path}")
     print(f"\n🏙️ Top 10 :")
     for i, c in enumerate(cities[:10], 1):
-        print(f"   {i}. {c['name']} — {c['population']:,} hab. ({c['province']})")
+        print(f"   {i}. {c.name} — {c.population:,} hab. ({c.province})")
 
 
 if __name__ == "__main__":
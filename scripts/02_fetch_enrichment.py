@@ -6,23 +6,30 @@
 - Overpass (OSM) : POIs pertinents (stations-service, parkings, centres commerciaux, supermarchés)
 """
 
-import json
 import os
 import sys
-import time
-import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.config import *
+from scripts.city_model import Climate, load_cities, save_cities
+from scripts import http_cache
+from scripts.field_usage import unused_steps
+from scripts.overpass import count_pois
+from scripts.sites import get_site, reuse_enrichment
 
 
-def enrich_wikidata(city):
-    """Récupère description, image et infos complémentaires depuis Wikidata."""
-    wikidata_id = city.get("wikidata_id")
-    if not wikidata_id:
-        return city
+WIKIDATA_URL = "https://query.wikidata.org/sparql"
+CLIMATE_URL = "https://climate-api.open-meteo.com/v1/climate"
+WIKIPEDIA_SUMMARY_URL = "https://it.wikipedia.org/api/rest_v1/page/summary/"
+
+# Pause après chaque requête réseau, par API (s) ; aucune après une réponse en cache
+WIKIDATA_PAUSE_S = 0.5
+WIKIPEDIA_PAUSE_S = 0.3
+CLIMATE_PAUSE_S = 0.3
+
 
-    url = "https://query.wikidata.org/sparql"
+def wikidata_params(wikidata_id):
+    """Paramètres de la requête SPARQL d'une ville (aussi utilisés par 19_fetch_plan.py)."""
     query = f"""
     SELECT ?description ?image ?website ?altitude ?inception WHERE {{
       OPTIONAL {{ wd:{wikidata_id} schema:description ?description . FILTER(LANG(?description) = "it") }}
@@ -33,6 +40,30 @@ def enrich_wikidata(city):
     }}
     LIMIT 1
     """
+    return {"query": query}
+
+
+def climate_params(lat, lng):
+    return {
+        "latitude": lat,
+        "longitude": lng,
+        "start_date": "2020-01-01",
+        "end_date": "2024-12-31",
+        "models": "EC_Earth3P_HR",
+        "monthly": "temperature_2m_mean,precipitation_sum",
+    }
+
+
+def wikipedia_summary_url(city_name):
+    """Résumé Wikipedia IT d'une ville (extrait pour 02, image pour 05 : même réponse en cache)."""
+    return WIKIPEDIA_SUMMARY_URL + city_name.replace(" ", "_")
+
+
+def enrich_wikidata(city):
+    """Récupère description, image et infos complémentaires depuis Wikidata."""
+    wikidata_id = city.wikidata_id
+    if not wikidata_id:
+        return city
 
     headers = {
         "Accept": "application/json",
@@ -40,41 +71,32 @@ def enrich_wikidata(city):
     }
 
     try:
-        resp = requests.get(url, params={"query": query}, headers=headers, timeout=30)
+        resp = http_cache.get(WIKIDATA_URL, params=wikidata_params(wikidata_id), headers=headers, timeout=30,
+                              pause=WIKIDATA_PAUSE_S)
         resp.raise_for_status()
         results = resp.json()["results"]["bindings"]
 
         if results:
             r = results[0]
-            city["description_it"] = r.get("description", {}).get("value", "")
-            city["image_url"] = r.get("image", {}).get("value", "")
-            city["official_website"] = r.get("website", {}).get("value", "")
-            city["altitude_m"] = float(r["altitude"]["value"]) if "altitude" in r else None
+            city.description_it = r.get("description", {}).get("value", "")
+            city.image_url = r.get("image", {}).get("value", "")
+            city.official_website = r.get("website", {}).get("value", "")
+            city.altitude_m = float(r["altitude"]["value"]) if "altitude" in r else None
 
     except Exception as e:
-        print(f"  ⚠️ Wikidata erreur pour {city['name']}: {e}")
+        print(f"  ⚠️ Wikidata erreur pour {city.name}: {e}")
 
     return city
 
 
 def enrich_climate(city):
     """Récupère les données climatiques annuelles via Open-Meteo."""
-    lat, lng = city.get("latitude"), city.get("longitude")
+    lat, lng = city.latitude, city.longitude
     if not lat or not lng:
         return city
 
-    url = "https://climate-api.open-meteo.com/v1/climate"
-    params = {
-        "latitude": lat,
-        "longitude": lng,
-        "start_date": "2020-01-01",
-        "end_date": "2024-12-31",
-        "models": "EC_Earth3P_HR",
-        "monthly": "temperature_2m_mean,precipitation_sum",
-    }
-
     try:
-        resp = requests.get(url, params=params, timeout=30)
+        resp = http_cache.get(CLIMATE_URL, params=climate_params(lat, lng), timeout=30, pause=CLIMATE_PAUSE_S)
         resp.raise_for_status()
         data = resp.json()
 
@@ -83,94 +105,48 @@ def enrich_climate(city):
         precip = monthly.get("precipitation_sum", [])
 
         if temps:
-            city["climate"] = {
-                "temp_avg_annual": round(sum(temps) / len(temps), 1),
-                "temp_min_month": round(min(temps), 1),
-                "temp_max_month": round(max(temps), 1),
-                "precipitation_annual_mm": round(sum(precip)) if precip else None
-            }
+            city.climate = Climate(
+                temp_avg_annual=round(sum(temps) / len(temps), 1),
+                temp_min_month=round(min(temps), 1),
+                temp_max_month=round(max(temps), 1),
+                precipitation_annual_mm=round(sum(precip)) if precip else None
+            )
 
     except Exception as e:
-        print(f"  ⚠️ Open-Meteo erreur pour {city['name']}: {e}")
+        print(f"  ⚠️ Open-Meteo erreur pour {city.name}: {e}")
 
     return city
 
 
 def enrich_pois(city):
     """
-    Récupère les POIs pertinents via Overpass API (OpenStreetMap).
+    Récupère les POIs pertinents via Overpass API (OpenStreetMap), en une
+    seule requête pour toutes les catégories (overpass.count_pois).
     POIs liés à l'activité de Rossini Energy :
     - Parkings (pour carports solaires)
     - Stations-service (transition énergétique)
     - Centres commerciaux / supermarchés (clients potentiels)
     - Bornes de recharge existantes (concurrence / densité)
     """
-    lat, lng = city.get("latitude"), city.get("longitude")
+    lat, lng = city.latitude, city.longitude
     if not lat or not lng:
         return city
 
-    # Rayon de recherche autour du centre-ville (en mètres)
-    radius = 5000
-
-    overpass_url = "https://overpass-api.de/api/interpreter"
-
-    query = f"""
-    [out:json][timeout:30];
-    (
-      node["amenity"="parking"](around:{radius},{lat},{lng});
-      way["amenity"="parking"](around:{radius},{lat},{lng});
-      node["amenity"="fuel"](around:{radius},{lat},{lng});
-      node["shop"="supermarket"](around:{radius},{lat},{lng});
-      node["shop"="mall"](around:{radius},{lat},{lng});
-      node["amenity"="charging_station"](around:{radius},{lat},{lng});
-    );
-    out count;
-    """
-
     try:
-        resp = requests.post(overpass_url, data={"data": query}, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-
-        total = data.get("elements", [{}])[0].get("tags", {}).get("total", 0)
-        # On fait une 2ème requête plus détaillée pour les counts par type
-        query_detail = f"""
-        [out:json][timeout:30];
-        (
-          node["amenity"="parking"](around:{radius},{lat},{lng});
-          way["amenity"="parking"](around:{radius},{lat},{lng});
-        );
-        out count;
-        """
-        resp2 = requests.post(overpass_url, data={"data": query_detail}, timeout=60)
-        parking_count = resp2.json().get("elements", [{}])[0].get("tags", {}).get("total", 0) if resp2.ok else 0
-
-        query_ev = f"""
-        [out:json][timeout:30];
-        node["amenity"="charging_station"](around:{radius},{lat},{lng});
-        out count;
-        """
-        resp3 = requests.post(overpass_url, data={"data": query_ev}, timeout=60)
-        ev_count = resp3.json().get("elements", [{}])[0].get("tags", {}).get("total", 0) if resp3.ok else 0
-
-        city["pois"] = {
-            "parking_count": int(parking_count),
-            "ev_charging_stations": int(ev_count),
-        }
-
+        city.pois = count_pois(lat, lng)
     except Exception as e:
-        print(f"  ⚠️ Overpass erreur pour {city['name']}: {e}")
+        print(f"  ⚠️ Overpass erreur pour {city.name}: {e}")
 
     return city
 
 
 def get_wikipedia_extract(city_name):
     """Récupère un extrait Wikipedia en italien pour la ville."""
-    url = "https://it.wikipedia.org/api/rest_v1/page/summary/" + city_name.replace(" ", "_")
     headers = {"User-Agent": "RossiniEnergySEO/1.0"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = http_cache.get(wikipedia_summary_url(city_name), headers=headers, timeout=15,
+                              pause=WIKIPEDIA_PAUSE_S)
         if resp.ok:
             data = resp.json()
             return data.get("extract", "")
@@ -180,50 +156,61 @@ def get_wikipedia_extract(city_name):
 
 
 def main():
-    input_path = os.path.join(DATA_DIR, "cities_lombardia.json")
-    output_path = os.path.join(DATA_DIR, "cities_enriched.json")
+    input_path = os.path.join(DATA_DIR, CITIES_FILE)
+    output_path = os.path.join(DATA_DIR, ENRICHED_FILE)
 
     if not os.path.exists(input_path):
         print(f"❌ Fichier {input_path} introuvable. Lance d'abord 01_fetch_cities.py")
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
+    cities = load_cities(input_path)
+
+    # Comuni déjà enrichis par un autre site régional (communes frontalières)
+    reused = reuse_enrichment(cities, get_site())
+    if reused:
+        print(f"♻️ {len(reused)} villes reprises d'un autre site")
+
+    # Requêtes dont aucun champ n'est lu par les pages (scripts/field_usage.py)
+    skipped = unused_steps("enrich") if SKIP_UNUSED_ENRICHMENT else set()
+    if skipped:
+        print(f"⏭️  Non lus par les pages, sautés : {', '.join(sorted(skipped))} (ROSSINI_ALL_FIELDS=1 pour les récupérer)")
 
     print(f"📊 Enrichissement de {len(cities)} villes...\n")
 
     for i, city in enumerate(cities):
-        print(f"[{i+1}/{len(cities)}] {city['name']}...")
+        if city.slug in reused and city.climate:
+            continue
+
+        print(f"[{i+1}/{len(cities)}] {city.name}...")
 
         # 1. Wikidata
-        city = enrich_wikidata(city)
-        time.sleep(0.5)
+        if "enrich_wikidata" not in skipped:
+            city = enrich_wikidata(city)
 
         # 2. Wikipedia extract
-        city["wikipedia_extract"] = get_wikipedia_extract(city["name"])
-        time.sleep(0.3)
+        if "get_wikipedia_extract" not in skipped:
+            city.wikipedia_extract = get_wikipedia_extract(city.name)
 
         # 3. Climat
-        city = enrich_climate(city)
-        time.sleep(0.3)
+        if "enrich_climate" not in skipped:
+            city = enrich_climate(city)
 
-        # 4. POIs (attention au rate limit Overpass)
-        # city = enrich_pois(city)
-        # time.sleep(2)  # Overpass demande du fair-use
+        # 4. POIs : une requête Overpass (rythme géré par le limiteur adaptatif)
+        if not city.pois and "enrich_pois" not in skipped:
+            city = enrich_pois(city)
 
         cities[i] = city
 
     # Sauvegarder
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    save_cities(cities, output_path)
 
     print(f"\n✅ Enrichissement terminé !")
     print(f"📄 Sauvegardé dans {output_path}")
 
     # Stats
-    with_desc = sum(1 for c in cities if c.get("wikipedia_extract"))
-    with_climate = sum(1 for c in cities if c.get("climate"))
-    with_pois = sum(1 for c in cities if c.get("pois"))
+    with_desc = sum(1 for c in cities if c.wikipedia_extract)
+    with_climate = sum(1 for c in cities if c.climate)
+    with_pois = sum(1 for c in cities if c.pois)
     print(f"   📝 {with_desc}/{len(cities)} avec description Wikipedia")
     print(f"   🌡️ {with_climate}/{len(cities)} avec données climat")
     print(f"   📍 {with_pois}/{len(cities)} avec POIs")
@@ -4,17 +4,27 @@
 Utilise Jinja2 pour le templating.
 """
 
-import json
 import os
 import sys
-import math
-from datetime import datetime
+import functools
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.config import *
+from scripts.build_info import build_year
+from scripts.city_model import Industry, Pois, load_cities
+from scripts.facades import apply_facades, deferred_embeds, script_size
+from scripts.i18n import (alternates, capfirst, display_number, format_number, locale_prefix,
+                          localize_province, page_url, region_forms, root_prefix, texts)
+from scripts.link_graph import coordinates, plan_links
+from scripts.live_data import LIVE_DIR, write_live_fragments
+from scripts.prefetch_hints import add_prefetch_hints, prefetch_targets, transfer_size
+from scripts.roi_tables import ROI_DIR, roi_summary, roi_tables, write_roi_tables
+from scripts.sites import get_site
 
 try:
-    from jinja2 import Environment, FileSystemLoader
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 except ImportError:
     print("❌ Jinja2 requis: pip install jinja2")
     sys.exit(1)
@@ -61,72 +71,38 @@ def fix_image_url(image_url):
     return image_url
 
 
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Distance en km entre deux points GPS."""
-    R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    return R * 2 * math.asin(math.sqrt(a))
-
-
-def find_nearby_cities(target, all_cities, max_count=8, max_distance_km=50):
-    """Trouve les villes les plus proches pour le maillage interne."""
-    if not target.get("latitude") or not target.get("longitude"):
+def plan_nearby(cities):
+    """
+    Villes voisines liées depuis chaque page (maillage interne), calculées
+    pour tout le site d'un coup : LINK_BUDGET liens dans LINK_RADIUS_KM,
+    équilibrés pour que les comuni isolés reçoivent aussi des liens.
+    """
+    if not cities:
         return []
+    lat, lon = coordinates(cities)
+    links = plan_links(lat, lon, LINK_BUDGET, LINK_RADIUS_KM, LINK_BALANCE)
+    return [[cities[j] for j in row if j >= 0] for row in links.tolist()]
 
-    nearby = []
-    for city in all_cities:
-        if city["slug"] == target["slug"]:
-            continue
-        if not city.get("latitude") or not city.get("longitude"):
-            continue
-        dist = haversine_distance(
-            target["latitude"], target["longitude"],
-            city["latitude"], city["longitude"]
-        )
-        if dist <= max_distance_km:
-            nearby.append((dist, city))
-
-    nearby.sort(key=lambda x: x[0])
-    return [c for _, c in nearby[:max_count]]
 
-
-def get_seo_title(city_name, province, city_index):
+def get_seo_title(city_name, province, city_index, locale=DEFAULT_LOCALE):
     """Génère un title SEO avec rotation (5 variantes)."""
-    titles = [
-        f"Tettoia Fotovoltaica per Parcheggio a {city_name} | Rossini Energy",
-        f"Pensilina Fotovoltaica a {city_name}, {province} - Preventivo Gratuito | Rossini Energy",
-        f"Parcheggio Fotovoltaico a {city_name} | Installazione Chiavi in Mano | Rossini Energy",
-        f"Installatore Pensiline Fotovoltaiche a {city_name} | Rossini Energy",
-        f"Tettoia Solare per Parcheggio Aziendale a {city_name} | Rossini Energy"
-    ]
-    return titles[city_index % 5]
+    titles = texts(locale)["seo_titles"]
+    return titles[city_index % len(titles)].format(city=city_name, province=province)
 
 
-def get_seo_description(city_name, province, city_index):
+def get_seo_description(city_name, province, city_index, locale=DEFAULT_LOCALE):
     """Génère une meta description SEO avec rotation (5 variantes)."""
-    descriptions = [
-        f"Rossini Energy installa tettoie fotovoltaiche per parcheggi aziendali a {city_name}. Struttura in legno, pannelli bifacciali. Preventivo gratuito.",
-        f"Pensilina fotovoltaica a {city_name}: trasforma il parcheggio della tua azienda in una fonte di energia rinnovabile. Installazione chiavi in mano.",
-        f"Parcheggio fotovoltaico a {city_name}, {province}. Riduci i costi energetici della tua azienda con le pensiline solari TOSSO® di Rossini Energy.",
-        f"Installazione tettoie fotovoltaiche per aziende e PMI a {city_name}. Legno Douglas, pannelli bifacciali. Contattaci per un sopralluogo gratuito.",
-        f"Copri il parcheggio della tua azienda a {city_name} con una pensilina fotovoltaica. Energia solare + protezione veicoli. Rossini Energy."
-    ]
-    return descriptions[city_index % 5]
+    descriptions = texts(locale)["seo_descriptions"]
+    return descriptions[city_index % len(descriptions)].format(city=city_name, province=province)
 
 
-def get_h1_text(city_name, city_index):
+def get_h1_text(city_name, city_index, locale=DEFAULT_LOCALE):
     """Génère un H1 avec rotation (3 variantes)."""
-    h1_variants = [
-        f"Tettoia Fotovoltaica per Parcheggio a <strong>{city_name}</strong>",
-        f"Pensilina Fotovoltaica a <strong>{city_name}</strong>",
-        f"Parcheggio Fotovoltaico a <strong>{city_name}</strong>"
-    ]
-    return h1_variants[city_index % 3]
+    h1_variants = texts(locale)["h1"]
+    return h1_variants[city_index % len(h1_variants)].format(city=city_name)
 
 
-def get_city_profile(city):
+def get_city_profile(city, site=None):
     """
     Classifie les villes en 6 profils basés sur leurs caractéristiques.
 
@@ -137,34 +113,28 @@ def get_city_profile(city):
     D - Residenziale: principalement résidentiel
     E - Turistico: indicateurs touristiques
     F - Capoluogo: chef-lieu de province
+
+    Chefs-lieux et villes touristiques dépendent du site régional.
     """
-    population = city.get("population", 0)
-    province = city.get("province", "")
-    name = city.get("name", "")
+    site = site or get_site()
+    population = city.population
+    province = city.province
+    name = city.name
 
     # Données industrielles
-    industry = city.get("industry", {})
-    industrial_zones = industry.get("industrial_zones_count", 0)
-    industrial_area = industry.get("industrial_area_hectares", 0)
-    commercial_zones = industry.get("commercial_zones_count", 0)
-    malls = industry.get("malls_count", 0)
-
-    # POIs
-    pois = city.get("pois", {})
-    hotels = pois.get("hotels_count", 0)
-
-    # Liste des chefs-lieux de province lombards
-    capoluoghi = [
-        "Milano", "Brescia", "Bergamo", "Como", "Cremona", "Lecco",
-        "Lodi", "Mantova", "Monza", "Pavia", "Sondrio", "Varese"
-    ]
-
-    # Villes touristiques connues (Lac de Garde, Lac de Côme, etc.)
-    tourist_cities = [
-        "Desenzano del Garda", "Salò", "Lonato del Garda",
-        "Sirmione", "Limone sul Garda", "Gardone Riviera",
-        "Bellagio", "Menaggio", "Varenna", "Tremezzina"
-    ]
+    industry = city.industry or Industry()
+    industrial_zones = industry.industrial_zones_count
+    industrial_area = industry.industrial_area_hectares
+    commercial_zones = industry.commercial_zones_count
+    malls = industry.malls_count
+
+    # POIs (les hôtels ne sont pas encore collectés)
+    pois = city.pois or Pois()
+    hotels = getattr(pois, "hotels_count", 0)
+
+    # Chefs-lieux de province et villes touristiques connues de la région
+    capoluoghi = site.capoluoghi
+    tourist_cities = site.tourist_cities
 
     # Profil A - Metropoli
     if population > 100000:
@@ -190,197 +160,324 @@ def get_city_profile(city):
     return "D", "Residenziale"
 
 
-def generate_unique_city_content(city):
-    """Génère un contenu unique pour chaque ville basé sur son profil."""
-    city_name = city.get("name", "")
-    province_raw = city.get("province", "")
-    population = city.get("population", 0)
-
+def city_facts(city, site=None):
+    """Profil et chiffres d'une ville, indépendants de la langue."""
+    site = site or get_site()
     # Normaliser la province pour éviter les duplications
-    province = normalize_province(province_raw)
-    # Extraire juste le nom de la province sans "provincia di"
-    province_name_only = province.replace("provincia di ", "").replace("Provincia di ", "") if province else ""
+    province = normalize_province(city.province)
+    profile_code, _ = get_city_profile(city, site)
 
-    # Obtenir le profil de la ville
-    profile_code, profile_name = get_city_profile(city)
+    has_pois = city.pois is not None
+    industry = city.industry or Industry()
 
-    # Données disponibles
-    has_pois = bool(city.get("pois"))
-    parking_count = city.get("pois", {}).get("parking_count", 0) if has_pois else 0
-    ev_stations = city.get("pois", {}).get("ev_charging_stations", 0) if has_pois else 0
+    return {
+        "province": province,
+        # Juste le nom de la province sans "provincia di"
+        "province_name": province.replace("provincia di ", "").replace("Provincia di ", "") if province else "",
+        "profile": profile_code,
+        "region": site.region,
+        "population": city.population,
+        "has_pois": has_pois,
+        "parking_count": city.pois.parking_count if has_pois else 0,
+        "ev_stations": city.pois.ev_charging_stations if has_pois else 0,
+        "industrial_zones": industry.industrial_zones_count,
+        "surface_parking": industry.surface_parking_count,
+    }
 
-    industry = city.get("industry", {})
-    industrial_zones = industry.get("industrial_zones_count", 0)
-    industrial_area = industry.get("industrial_area_hectares", 0)
-    surface_parking = industry.get("surface_parking_count", 0)
+
+def generate_unique_city_content(city, locale=DEFAULT_LOCALE, facts=None):
+    """Génère un contenu unique pour chaque ville basé sur son profil."""
+    facts = facts or city_facts(city)
+    t = texts(locale)
+    profile_code = facts["profile"]
+
+    values = {
+        "city": city.name,
+        "province": localize_province(facts["province"], locale),
+        "province_name": facts["province_name"],
+        "population": format_number(facts["population"], locale),
+        "zones": facts["industrial_zones"],
+        "surface_parking": facts["surface_parking"],
+        "ev": facts["ev_stations"],
+        "region_adjective": region_forms(facts["region"], locale)["adjective"],
+    }
+    values["in_province"] = t["in_province"].format(**values) if facts["province_name"] else ""
+    values["with_zones"] = t["with_zones"].format(**values) if facts["industrial_zones"] > 0 else ""
 
     # Contenu adapté par profil
-    if profile_code == "A":  # Metropoli
-        h2 = f"Tettoie Fotovoltaiche per Grandi Aziende a {city_name}"
-        intro = f"{city_name}, metropoli lombarda con {population:,} abitanti, concentra numerose aziende e sedi direzionali. "
-        intro += "I vasti parcheggi aziendali rappresentano un'opportunità unica per installare tettoie fotovoltaiche TOSSO® "
-        intro += "e produrre energia rinnovabile su larga scala. "
-
-    elif profile_code == "B":  # Polo industriale
-        h2 = f"Pensiline Fotovoltaiche per Aziende Industriali a {city_name}"
-        intro = f"{city_name} è un importante polo industriale"
-        if province_name_only:
-            intro += f" della provincia di {province_name_only}"
-        if industrial_zones > 0:
-            intro += f", con {industrial_zones} zone industriali censite"
-        intro += ". "
-        intro += "Le aziende manifatturiere e logistiche possono ridurre drasticamente i costi energetici "
-        intro += "coprendo i parcheggi e le aree operative con tettoie fotovoltaiche ad alta efficienza. "
-
-    elif profile_code == "C":  # Centro commerciale
-        h2 = f"Pensiline Fotovoltaiche per Centri Commerciali a {city_name}"
-        intro = f"{city_name} dispone di un tessuto commerciale dinamico. "
-        intro += "Centri commerciali, supermercati e aziende del terziario possono valorizzare i propri parcheggi "
-        intro += "installando pensiline fotovoltaiche che producono energia e offrono riparo ai clienti. "
-
-    elif profile_code == "E":  # Turistico
-        h2 = f"Tettoie Fotovoltaiche per Strutture Turistiche a {city_name}"
-        intro = f"{city_name}, con la sua vocazione turistica, può beneficiare di pensiline fotovoltaiche "
-        intro += "per hotel, ristoranti e strutture ricettive. Un investimento che riduce i costi energetici "
-        intro += "e rafforza l'immagine green dell'attività. "
-
-    elif profile_code == "F":  # Capoluogo
-        h2 = f"Pensiline Fotovoltaiche a {city_name}, Capoluogo di Provincia"
-        intro = f"{city_name}, capoluogo di provincia, riunisce enti pubblici, aziende e PMI. "
-        intro += "Le tettoie fotovoltaiche TOSSO® sono ideali per parcheggi aziendali, sedi comunali, "
-        intro += "e strutture sanitarie che vogliono investire in energie rinnovabili. "
-
-    else:  # D - Residenziale
-        h2 = f"Parcheggi Fotovoltaici per Aziende e PMI a {city_name}"
-        intro = f"A {city_name} ({province}), le aziende locali possono beneficiare dell'energia solare. "
-        intro += "Installare una tettoia fotovoltaica sul parcheggio aziendale significa produrre energia pulita, "
-        intro += "proteggere i veicoli e ridurre le bollette energetiche. "
+    h2, intro = (text.format(**values) for text in t["profiles"][profile_code])
 
     # Compléter l'intro avec les données disponibles
-    if surface_parking > 0 and industrial_zones > 0:
-        intro += f"Il territorio conta {surface_parking} parcheggi di superficie, "
-        intro += "molti dei quali potrebbero essere trasformati in impianti fotovoltaici. "
+    if facts["surface_parking"] > 0 and facts["industrial_zones"] > 0:
+        intro += t["parking"].format(**values)
 
-    if has_pois and ev_stations > 0:
-        intro += f"Con {ev_stations} punti di ricarica EV già presenti, {city_name} dimostra "
-        intro += "attenzione alla mobilità elettrica. Le nostre tettoie integrano colonnine di ricarica. "
+    if facts["has_pois"] and facts["ev_stations"] > 0:
+        intro += t["ev"].format(**values)
 
     # Avantages personnalisés
-    benefits = "I vantaggi per la tua azienda: produzione di energia solare autoconsumata, "
-    benefits += "riduzione dei costi energetici fino al 70%, protezione dei veicoli, "
-    benefits += "valorizzazione dell'immagine aziendale green"
-
+    benefits = t["benefits"]
     if profile_code in ["A", "B"]:
-        benefits += ", e possibilità di vendere l'energia in eccesso alla rete."
+        benefits += t["benefits_grid"]
     else:
-        benefits += ", e accesso agli incentivi fiscali per le energie rinnovabili."
+        benefits += t["benefits_incentives"]
 
     return {
         "h2": h2,
         "intro": intro,
         "benefits": benefits,
         "profile": profile_code,
-        "profile_name": profile_name
+        "profile_name": t["profile_names"][profile_code]
     }
 
 
-def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
-    if not os.path.exists(input_path):
-        # Fallback sur le fichier non-enrichi
-        input_path = os.path.join(DATA_DIR, "cities_lombardia.json")
-        if not os.path.exists(input_path):
-            print(f"❌ Aucun fichier de données trouvé. Lance d'abord les scripts 01 et 02.")
-            sys.exit(1)
-        print("⚠️ Utilisation des données non-enrichies (lance 02_fetch_enrichment.py pour plus de contenu)")
+def find_input_path(site=None):
+    """Fichier de données à utiliser (enrichi si disponible), ou None."""
+    return (site or get_site()).input_path()
+
+
+def jinja_cache_dir():
+    path = os.path.join(CACHE_DIR, "jinja")
+    os.makedirs(path, exist_ok=True)
+    return path
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
 
-    # Setup Jinja2
+def create_environment():
+    """
+    Environnement Jinja2 partagé par le build et le serveur de dev.
+    Les templates compilés sont gardés dans .cache/jinja/ : tous les
+    processus et tous les sites les relisent au lieu de recompiler.
+    """
     env = Environment(
         loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=FileSystemBytecodeCache(jinja_cache_dir()),
         autoescape=False
     )
+    env.filters["province"] = localize_province
+    env.filters["capfirst"] = capfirst
+    env.filters["number"] = display_number
+    return env
 
-    city_template = env.get_template("city_template.html")
-    index_template = env.get_template("index_template.html")
-
-    year = datetime.now().year
-    os.makedirs(os.path.join(OUTPUT_DIR, "citta"), exist_ok=True)
 
-    # === Générer les pages de chaque ville ===
-    print(f"🏗️ Génération de {len(cities)} pages ville...\n")
+@functools.lru_cache(maxsize=None)
+def shared_environment():
+    """Environnement unique par processus : un worker qui rend plusieurs sites compile une fois."""
+    return create_environment()
 
-    for i, city in enumerate(cities):
-        nearby = find_nearby_cities(city, cities)
 
-        # Normaliser la province
-        province_normalized = normalize_province(city.get("province", ""))
+def build_city_view(city, index, nearby, site=None, roi=None):
+    """
+    Calculs d'une ville communs à toutes les langues : voisines (issues de
+    plan_nearby), profil, chiffres, image, rentabilité (table de roi_tables).
+    Faits une seule fois, puis rendus dans chaque langue.
+    """
+    return {
+        "city": city,
+        "index": index,
+        "nearby_cities": nearby,
+        "province_normalized": normalize_province(city.province),
+        "image_url_fixed": fix_image_url(city.image_url),
+        "facts": city_facts(city, site),
+        "roi": roi_summary(roi),
+    }
 
-        # Fixer les URLs d'images
-        image_url_fixed = fix_image_url(city.get("image_url", ""))
 
-        # SEO dynamique avec rotation
-        seo_title = get_seo_title(city["name"], province_normalized, i)
-        seo_description = get_seo_description(city["name"], province_normalized, i)
-        h1_text = get_h1_text(city["name"], i)
+def render_city_page(template, view, year, locale=DEFAULT_LOCALE, site=None):
+    """Rend la page d'une ville dans une langue (index = position, utilisée pour la rotation SEO)."""
+    site = site or get_site()
+    city = view["city"]
+    index = view["index"]
+    province = localize_province(view["province_normalized"], locale)
+    path = f"citta/{city.slug}.html"
 
-        # Contenu unique généré
-        unique_content = generate_unique_city_content(city)
+    # SEO dynamique avec rotation
+    seo_title = get_seo_title(city.name, province, index, locale)
+    seo_description = get_seo_description(city.name, province, index, locale)
+    h1_text = get_h1_text(city.name, index, locale)
 
-        html = city_template.render(
-            city=city,
-            company=COMPANY,
-            domain=DOMAIN,
-            year=year,
-            nearby_cities=nearby,
-            seo_title=seo_title,
-            seo_description=seo_description,
-            h1_text=h1_text,
-            unique_content=unique_content,
-            province_normalized=province_normalized,
-            image_url_fixed=image_url_fixed
-        )
+    # Contenu unique généré
+    unique_content = generate_unique_city_content(city, locale, view["facts"])
 
-        output_path = os.path.join(OUTPUT_DIR, "citta", f"{city['slug']}.html")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
+    html = template.render(
+        city=city,
+        company=COMPANY,
+        domain=site.domain,
+        region=region_forms(site.region, locale),
+        year=year,
+        locale=locale,
+        canonical_url=page_url(locale, path, site.domain),
+        index_url=page_url(locale, "index.html", site.domain),
+        root=root_prefix(locale, path),
+        alternates=alternates(path, locale, site.domain),
+        nearby_cities=view["nearby_cities"],
+        seo_title=seo_title,
+        seo_description=seo_description,
+        h1_text=h1_text,
+        unique_content=unique_content,
+        province_normalized=province,
+        image_url_fixed=view["image_url_fixed"],
+        roi=view["roi"],
+    )
+    return apply_facades(html, template.name)
 
-        print(f"  ✅ {city['name']} → citta/{city['slug']}.html")
 
-    # === Générer la page index ===
+def count_provinces(cities):
+    """Nombre de villes par province, trié par nombre de villes puis par nom."""
     provinces = {}
     for c in cities:
-        p = c.get("province", "Altro")
+        p = c.province
         provinces[p] = provinces.get(p, 0) + 1
-    # Trier par nombre de villes
-    provinces = dict(sorted(provinces.items(), key=lambda x: -x[1]))
+    return dict(sorted(provinces.items(), key=lambda x: (-x[1], x[0])))
+
 
-    index_html = index_template.render(
+def render_index_page(template, cities, year, locale=DEFAULT_LOCALE, provinces=None, site=None):
+    """Rend la page index (liste des villes par province)."""
+    site = site or get_site()
+    if provinces is None:
+        provinces = count_provinces(cities)
+
+    html = template.render(
         cities=cities,
         provinces=provinces,
         company=COMPANY,
-        domain=DOMAIN,
-        year=year
+        domain=site.domain,
+        region=region_forms(site.region, locale),
+        year=year,
+        locale=locale,
+        canonical_url=page_url(locale, "index.html", site.domain),
+        root=root_prefix(locale, "index.html"),
+        alternates=alternates("index.html", locale, site.domain)
     )
+    return apply_facades(html, template.name)
+
+
+def render_locale(locale, views, cities, provinces, year, site=None):
+    """
+    Rend et écrit toutes les pages d'une langue d'un site à partir des vues
+    partagées. Exécuté dans un processus par langue (et par site pour
+    build_sites.py) ; retourne le nombre de pages ville.
+    Les pages sont toutes rendues avant d'être écrites : les règles de
+    préchargement de chacune dépendent du poids des pages voisines.
+    """
+    site = site or get_site()
+    env = shared_environment()
+    city_template = env.get_template("city_template.html")
+    index_template = env.get_template("index_template.html")
+
+    locale_dir = os.path.join(site.output_dir, locale_prefix(locale))
+    os.makedirs(os.path.join(locale_dir, "citta"), exist_ok=True)
+
+    pages = {view["city"].slug: render_city_page(city_template, view, year, locale, site) for view in views}
+    sizes = {slug: transfer_size(html) for slug, html in pages.items()}
 
-    with open(os.path.join(OUTPUT_DIR, "index.html"), "w", encoding="utf-8") as f:
+    for view in views:
+        slug = view["city"].slug
+        targets = prefetch_targets(view["city"], view["nearby_cities"], sizes)
+        output_path = os.path.join(locale_dir, "citta", f"{slug}.html")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(add_prefetch_hints(pages[slug], targets))
+
+    index_html = render_index_page(index_template, cities, year, locale, provinces, site)
+    with open(os.path.join(locale_dir, "index.html"), "w", encoding="utf-8") as f:
         f.write(index_html)
-    print(f"\n  ✅ index.html")
 
+    return len(views)
+
+
+def sort_cities(cities):
+    """Ordre stable des villes d'un build à l'autre : population décroissante, puis slug."""
+    return sorted(cities, key=lambda c: (-c.population, c.slug))
+
+
+def prepare_site(site):
+    """Charge les villes d'un site et calcule les vues communes à toutes les langues."""
+    cities = sort_cities(load_cities(site.input_path()))
+    nearby = plan_nearby(cities)
+    tables = roi_tables(cities)
+    views = [build_city_view(city, i, nearby[i], site, tables.get(city.slug)) for i, city in enumerate(cities)]
+    return cities, views, count_provinces(cities)
+
+
+def write_site_files(site, cities):
+    """
+    robots.txt, assets statiques, tables du simulateur et fragments live d'un
+    site ; retourne (fragments, octets).
+    """
     # === Générer robots.txt ===
     robots = f"""User-agent: *
 Allow: /
 
-Sitemap: {DOMAIN}/sitemap.xml
+Sitemap: {site.domain}/sitemap.xml
 """
-    with open(os.path.join(OUTPUT_DIR, "robots.txt"), "w") as f:
+    with open(os.path.join(site.output_dir, "robots.txt"), "w") as f:
         f.write(robots)
+
+    # === Copier les assets statiques (CSS, JS) ===
+    shutil.copytree(
+        os.path.join(TEMPLATES_DIR, "assets"),
+        os.path.join(site.output_dir, "assets"),
+        dirs_exist_ok=True
+    )
+
+    # === Tables du simulateur d'économies ===
+    tables, table_size = write_roi_tables(cities, site.output_dir)
+    print(f"  ✅ {ROI_DIR}/ ({tables} tables mises à jour, {table_size / 1024:.1f} Ko au total)")
+
+    # === Fragments live (qualité de l'air, ...) ===
+    return write_live_fragments(cities, site.output_dir)
+
+
+def print_facade_report(output_dir):
+    """Intégrations tierces différées par les façades : requêtes et octets évités par page."""
+    sizes = {}
+    for template, (pages, counts) in deferred_embeds(output_dir).items():
+        for embed, count in sorted(counts.items()):
+            if embed not in sizes:
+                sizes[embed] = script_size(embed)
+            requests_per_page = 1 + THIRD_PARTY_EMBEDS[embed]["requests"]
+            weight = (f"{sizes[embed] / 1024:.1f} Ko de script" if sizes[embed] is not None
+                      else "poids du script inconnu (hors ligne)")
+            print(f"  🧩 {template} · {embed} ({FACADES.get(template, {}).get(embed, '?')}) : "
+                  f"{count}/{pages} pages, {requests_per_page} requêtes et {weight} différés par page "
+                  f"({count * requests_per_page} requêtes au total)")
+
+
+def main():
+    site = get_site()
+    input_path = find_input_path(site)
+    if input_path is None:
+        print(f"❌ Aucun fichier de données trouvé. Lance d'abord les scripts 01 et 02.")
+        sys.exit(1)
+    if input_path != site.enriched_path:
+        # Fallback sur le fichier non-enrichi
+        print("⚠️ Utilisation des données non-enrichies (lance 02_fetch_enrichment.py pour plus de contenu)")
+
+    year = build_year()
+
+    # === Calculs par ville, communs à toutes les langues ===
+    cities, views, provinces = prepare_site(site)
+
+    # === Rendu des pages, une langue par processus ===
+    print(f"🏗️ Génération de {len(cities)} pages ville × {len(LOCALES)} langues...\n")
+
+    with ProcessPoolExecutor(max_workers=len(LOCALES)) as pool:
+        futures = {
+            locale: pool.submit(render_locale, locale, views, cities, provinces, year, site)
+            for locale in LOCALES
+        }
+        for locale, future in futures.items():
+            count = future.result()
+            prefix = locale_prefix(locale)
+            print(f"  ✅ [{locale}] {count} pages → {prefix}citta/ + {prefix}index.html")
+
+    # === robots.txt, assets, fragments live ===
+    written, size = write_site_files(site, cities)
     print(f"  ✅ robots.txt")
+    print(f"  ✅ assets/")
+    print(f"  ✅ {LIVE_DIR}/ ({written} fragments mis à jour, {size / 1024:.1f} Ko)")
+    print_facade_report(site.output_dir)
 
-    print(f"\n🎉 Site généré avec succès dans /{OUTPUT_DIR}/")
-    print(f"   📄 {len(cities)} pages ville + index + robots.txt")
+    print(f"\n🎉 Site généré avec succès dans /{site.output_dir}/")
+    print(f"   📄 {len(cities)} pages ville × {len(LOCALES)} langues + index + robots.txt")
 
 
 if __name__ == "__main__":
@@ -1,36 +1,31 @@
 #!/usr/bin/env python3
 """
 Étape 4 : Générer le sitemap.xml pour le site.
+Chaque page est listée dans toutes les langues, avec ses alternates hreflang
+(xhtml:link) pour que les moteurs associent les versions entre elles.
 """
 
-import json
 import os
 import sys
-from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.config import *
+from scripts.build_info import build_date
+from scripts.city_model import load_cities
+from scripts.i18n import alternates, page_url
+from scripts.sites import get_site
 
 
-def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
-    if not os.path.exists(input_path):
-        input_path = os.path.join(DATA_DIR, "cities_lombardia.json")
-
-    if not os.path.exists(input_path):
-        print("❌ Aucun fichier de données trouvé.")
-        sys.exit(1)
+def build_sitemap(cities, site):
+    """XML du sitemap d'un site ; retourne (xml, nombre d'URLs)."""
+    # Date des sources, pas du lancement : un rebuild ne modifie pas le sitemap
+    today = build_date().strftime("%Y-%m-%d")
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
-
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    urls = []
+    pages = []
 
     # Page d'accueil
-    urls.append({
-        "loc": f"{DOMAIN}/index.html",
+    pages.append({
+        "path": "index.html",
         "lastmod": today,
         "changefreq": "weekly",
         "priority": "1.0"
@@ -39,40 +34,67 @@ def main():
     # Pages ville
     for city in cities:
         # Priorité basée sur la population
-        if city["population"] > 100000:
+        if city.population > 100000:
             priority = "0.9"
-        elif city["population"] > 50000:
+        elif city.population > 50000:
             priority = "0.8"
         else:
             priority = "0.7"
 
-        urls.append({
-            "loc": f"{DOMAIN}/citta/{city['slug']}.html",
+        pages.append({
+            "path": f"citta/{city.slug}.html",
             "lastmod": today,
             "changefreq": "monthly",
             "priority": priority
         })
 
-    # Construire le XML
+    # Construire le XML : une entrée par page et par langue
     xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-
-    for url in urls:
-        xml_lines.append("  <url>")
-        xml_lines.append(f"    <loc>{url['loc']}</loc>")
-        xml_lines.append(f"    <lastmod>{url['lastmod']}</lastmod>")
-        xml_lines.append(f"    <changefreq>{url['changefreq']}</changefreq>")
-        xml_lines.append(f"    <priority>{url['priority']}</priority>")
-        xml_lines.append("  </url>")
+    xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                     'xmlns:xhtml="http://www.w3.org/1999/xhtml">')
+
+    urls = 0
+    for page in pages:
+        links = alternates(page["path"], DEFAULT_LOCALE, site.domain)
+        for locale in LOCALES:
+            xml_lines.append("  <url>")
+            xml_lines.append(f"    <loc>{page_url(locale, page['path'], site.domain)}</loc>")
+            for link in links:
+                xml_lines.append(
+                    f'    <xhtml:link rel="alternate" hreflang="{link["lang"]}" href="{link["url"]}"/>'
+                )
+            xml_lines.append(f"    <lastmod>{page['lastmod']}</lastmod>")
+            xml_lines.append(f"    <changefreq>{page['changefreq']}</changefreq>")
+            xml_lines.append(f"    <priority>{page['priority']}</priority>")
+            xml_lines.append("  </url>")
+            urls += 1
 
     xml_lines.append("</urlset>")
+    return "\n".join(xml_lines), urls
+
 
-    output_path = os.path.join(OUTPUT_DIR, "sitemap.xml")
+def write_sitemap(cities, site):
+    """Écrit sitemap.xml dans le dossier du site ; retourne (chemin, nombre d'URLs)."""
+    xml, urls = build_sitemap(cities, site)
+    output_path = os.path.join(site.output_dir, "sitemap.xml")
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(xml_lines))
+        f.write(xml)
+    return output_path, urls
+
+
+def main():
+    site = get_site()
+    input_path = site.input_path()
+
+    if input_path is None:
+        print("❌ Aucun fichier de données trouvé.")
+        sys.exit(1)
+
+    cities = load_cities(input_path)
+    output_path, urls = write_sitemap(cities, site)
 
     print(f"✅ Sitemap généré : {output_path}")
-    print(f"   📍 {len(urls)} URLs ({len(cities)} villes + index)")
+    print(f"   📍 {urls} URLs (({len(cities)} villes + index) × {len(LOCALES)} langues)")
 
 
 if __name__ == "__main__":
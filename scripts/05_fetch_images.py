@@ -3,14 +3,24 @@
 Script pour récupérer les images des villes depuis Wikipedia IT.
 """
 
-import json
+import importlib
 import os
 import sys
-import time
-import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.config import DATA_DIR
+from scripts import http_cache
+from scripts.config import DATA_DIR, ENRICHED_FILE
+from scripts.city_model import load_cities, save_cities
+
+# Même URL que l'extrait Wikipedia de l'étape 02 : réponse partagée par le cache HTTP
+wikipedia_summary_url = importlib.import_module("scripts.02_fetch_enrichment").wikipedia_summary_url
+
+# Pause après chaque requête réseau (s) ; aucune après une réponse en cache
+PAUSE_S = 0.5
+
+
+def needs_image(city):
+    return not city.image_url
 
 
 def fetch_city_image(city_name):
@@ -18,11 +28,7 @@ def fetch_city_image(city_name):
     Récupère l'image d'une ville depuis l'API Wikipedia IT.
     """
     try:
-        # Encode le nom de la ville pour l'URL
-        encoded_name = city_name.replace(" ", "_")
-        url = f"https://it.wikipedia.org/api/rest_v1/page/summary/{encoded_name}"
-
-        response = requests.get(url, timeout=10)
+        response = http_cache.get(wikipedia_summary_url(city_name), timeout=10, pause=PAUSE_S)
 
         if response.status_code == 200:
             data = response.json()
@@ -41,17 +47,16 @@ def fetch_city_image(city_name):
 
 
 def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
 
     if not os.path.exists(input_path):
         print(f"❌ Fichier {input_path} introuvable.")
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
+    cities = load_cities(input_path)
 
     # Identifier les villes sans images
-    cities_without_images = [c for c in cities if not c.get("image_url")]
+    cities_without_images = [c for c in cities if needs_image(c)]
 
     print(f"📊 Récupération d'images pour {len(cities_without_images)} villes...\n")
 
@@ -62,41 +67,33 @@ def main():
     success_count = 0
 
     for i, city in enumerate(cities_without_images):
-        print(f"[{i+1}/{len(cities_without_images)}] {city['name']}...", end=" ")
+        print(f"[{i+1}/{len(cities_without_images)}] {city.name}...", end=" ")
 
         # Récupérer l'image
-        image_url = fetch_city_image(city["name"])
+        image_url = fetch_city_image(city.name)
 
         if image_url:
             print(f"✅ {image_url[:60]}...")
             success_count += 1
 
-            # Mettre à jour dans la liste complète
-            for j, c in enumerate(cities):
-                if c["name"] == city["name"]:
-                    cities[j]["image_url"] = image_url
-                    break
+            # La ville est partagée avec la liste complète
+            city.image_url = image_url
         else:
             print("❌ Aucune image trouvée")
 
-        # Pause pour respecter les limites de l'API
-        time.sleep(0.5)
-
         # Sauvegarder progressivement tous les 20 villes
         if (i + 1) % 20 == 0:
-            with open(input_path, "w", encoding="utf-8") as f:
-                json.dump(cities, f, ensure_ascii=False, indent=2)
+            save_cities(cities, input_path)
             print(f"  💾 Sauvegarde intermédiaire ({i+1}/{len(cities_without_images)})")
 
     # Sauvegarder final
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    save_cities(cities, input_path)
 
     print(f"\n✅ Récupération terminée !")
     print(f"📄 Sauvegardé dans {input_path}")
 
     # Stats finales
-    with_images = sum(1 for c in cities if c.get("image_url"))
+    with_images = sum(1 for c in cities if c.image_url)
     print(f"   🖼️  {with_images}/{len(cities)} villes avec images ({success_count} nouvelles)")
 
 
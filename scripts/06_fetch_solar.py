@@ -1,16 +1,55 @@
 #!/usr/bin/env python3
 """
 Script pour récupérer les données de production solaire via EU PVGIS API.
+
+- PVcalc : production de l'installation de référence (30 kWc, 15°)
+- MRcalc : irradiation horizontale, part diffuse et température mensuelles,
+  entrées du modèle local (scripts/pv_model.py) qui calcule ensuite toute
+  autre installation sans appel distant
 """
 
-import json
 import os
 import sys
-import time
-import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.config import DATA_DIR
+from scripts import http_cache
+from scripts.config import DATA_DIR, ENRICHED_FILE
+from scripts.city_model import Solar, load_cities, save_cities
+
+PVCALC_URL = "https://re.jrc.ec.europa.eu/api/v5_2/PVcalc"
+MRCALC_URL = "https://re.jrc.ec.europa.eu/api/v5_2/MRcalc"
+
+# Pause après chaque requête PVGIS réseau (s ; deux par ville) ; aucune après une réponse en cache
+PAUSE_S = 0.5
+
+
+def needs_solar(city):
+    """Ville sans données solaires, ou sans les moyennes mensuelles MRcalc."""
+    return not city.solar or not city.solar.monthly_horizontal_kwh_m2
+
+
+def pvcalc_params(lat, lon):
+    return {
+        "lat": lat,
+        "lon": lon,
+        "peakpower": 30,
+        "loss": 14,
+        "outputformat": "json",
+        "pvtechchoice": "crystSi",
+        "mountingplace": "building",
+        "angle": 15
+    }
+
+
+def mrcalc_params(lat, lon):
+    return {
+        "lat": lat,
+        "lon": lon,
+        "horirrad": 1,
+        "d2glob": 1,
+        "avtemp": 1,
+        "outputformat": "json",
+    }
 
 
 def fetch_solar_data(lat, lon):
@@ -19,19 +58,7 @@ def fetch_solar_data(lat, lon):
     Paramètres : 30 kWp, pertes 14%, cristallin, angle 15°
     """
     try:
-        url = "https://re.jrc.ec.europa.eu/api/v5_2/PVcalc"
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "peakpower": 30,
-            "loss": 14,
-            "outputformat": "json",
-            "pvtechchoice": "crystSi",
-            "mountingplace": "building",
-            "angle": 15
-        }
-
-        response = requests.get(url, params=params, timeout=30)
+        response = http_cache.get(PVCALC_URL, params=pvcalc_params(lat, lon), timeout=30, pause=PAUSE_S)
 
         if response.status_code == 200:
             data = response.json()
@@ -53,18 +80,46 @@ def fetch_solar_data(lat, lon):
         return None
 
 
+def fetch_monthly_radiation(lat, lon):
+    """
+    Moyennes mensuelles PVGIS MRcalc (toutes les années disponibles) :
+    irradiation horizontale (kWh/m²), part diffuse, température (°C).
+    """
+    try:
+        response = http_cache.get(MRCALC_URL, params=mrcalc_params(lat, lon), timeout=30, pause=PAUSE_S)
+        if response.status_code != 200:
+            return None
+
+        rows = response.json().get("outputs", {}).get("monthly", [])
+        by_month = {month: [r for r in rows if r.get("month") == month] for month in range(1, 13)}
+        if not all(by_month.values()):
+            return None
+
+        def average(key, digits):
+            return [round(sum(r[key] for r in by_month[m]) / len(by_month[m]), digits) for m in range(1, 13)]
+
+        return {
+            "monthly_horizontal_kwh_m2": average("H(h)_m", 1),
+            "monthly_diffuse_ratio": average("Kd", 3),
+            "monthly_temp_c": average("T2m", 1),
+        }
+
+    except Exception as e:
+        print(f"  ⚠️ Erreur PVGIS MRcalc: {e}")
+        return None
+
+
 def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
 
     if not os.path.exists(input_path):
         print(f"❌ Fichier {input_path} introuvable.")
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
+    cities = load_cities(input_path)
 
-    # Villes sans données solaires
-    cities_without_solar = [c for c in cities if not c.get("solar")]
+    # Villes sans données solaires (ou sans les moyennes mensuelles MRcalc)
+    cities_without_solar = [c for c in cities if needs_solar(c)]
 
     print(f"📊 Récupération données solaires PVGIS pour {len(cities_without_solar)} villes...\n")
 
@@ -75,44 +130,40 @@ def main():
     success_count = 0
 
     for i, city in enumerate(cities_without_solar):
-        if not city.get("latitude") or not city.get("longitude"):
-            print(f"[{i+1}/{len(cities_without_solar)}] {city['name']} ⏭️  Pas de coordonnées")
+        if not city.latitude or not city.longitude:
+            print(f"[{i+1}/{len(cities_without_solar)}] {city.name} ⏭️  Pas de coordonnées")
             continue
 
-        print(f"[{i+1}/{len(cities_without_solar)}] {city['name']}...", end=" ")
+        print(f"[{i+1}/{len(cities_without_solar)}] {city.name}...", end=" ")
 
-        solar_data = fetch_solar_data(city["latitude"], city["longitude"])
+        solar_data = city.solar.to_dict() if city.solar else fetch_solar_data(city.latitude, city.longitude)
 
         if solar_data and solar_data["annual_production_kwh"] > 0:
-            print(f"✅ {int(solar_data['annual_production_kwh'])} kWh/an")
+            radiation = fetch_monthly_radiation(city.latitude, city.longitude)
+            if radiation:
+                solar_data.update(radiation)
+            print(f"✅ {int(solar_data['annual_production_kwh'])} kWh/an"
+                  + (f", {sum(radiation['monthly_horizontal_kwh_m2']):.0f} kWh/m² horizontal" if radiation else ""))
             success_count += 1
 
-            # Mettre à jour dans la liste complète
-            for j, c in enumerate(cities):
-                if c["name"] == city["name"]:
-                    cities[j]["solar"] = solar_data
-                    break
+            # La ville est partagée avec la liste complète
+            city.solar = Solar.from_dict(solar_data)
         else:
             print("❌ Échec")
 
-        # Pause pour respecter les limites de l'API
-        time.sleep(1)
-
         # Sauvegarder progressivement tous les 20 villes
         if (i + 1) % 20 == 0:
-            with open(input_path, "w", encoding="utf-8") as f:
-                json.dump(cities, f, ensure_ascii=False, indent=2)
+            save_cities(cities, input_path)
             print(f"  💾 Sauvegarde intermédiaire ({i+1}/{len(cities_without_solar)})")
 
     # Sauvegarder final
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    save_cities(cities, input_path)
 
     print(f"\n✅ Récupération terminée !")
     print(f"📄 Sauvegardé dans {input_path}")
 
     # Stats finales
-    with_solar = sum(1 for c in cities if c.get("solar"))
+    with_solar = sum(1 for c in cities if c.solar)
     print(f"   ☀️  {with_solar}/{len(cities)} villes avec données solaires ({success_count} nouvelles)")
 
 
@@ -3,24 +3,32 @@
 Script pour récupérer les données industrielles et de parking via Overpass API.
 """
 
-import json
 import os
 import sys
-import time
-import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.config import DATA_DIR
+from scripts.config import DATA_DIR, ENRICHED_FILE
+from scripts.city_model import Industry, load_cities, save_cities
+from scripts.overpass import stream_elements
 
+try:
+    from scripts.geometry import assemble_rings, dissolved_area
+except ImportError:
+    print("❌ NumPy requis: pip install numpy")
+    sys.exit(1)
 
-def fetch_industrial_data(lat, lon, city_name):
-    """Récupère les données industrielles et de parking via Overpass API."""
-    try:
-        # Rayon de 5km
-        radius = 5000
 
-        # Query Overpass complexe pour toutes les données en une seule requête
-        overpass_query = f"""
+# Rayon de recherche autour du centre-ville (m)
+INDUSTRIAL_RADIUS_M = 5000
+
+
+def needs_industry(city):
+    return not city.industry
+
+
+def industrial_query(lat, lon, radius=INDUSTRIAL_RADIUS_M):
+    """Requête Overpass complexe pour toutes les données en une seule requête."""
+    return f"""
         [out:json][timeout:25];
         (
           // Zones industrielles
@@ -45,87 +53,65 @@ def fetch_industrial_data(lat, lon, city_name):
           way["landuse"="commercial"](around:{radius},{lat},{lon});
           relation["landuse"="commercial"](around:{radius},{lat},{lon});
         );
-        out body;
-        >;
-        out skel qt;
+        out body geom qt;
         """
 
-        response = requests.post(
-            "https://overpass-api.de/api/interpreter",
-            data={"data": overpass_query},
-            timeout=30
-        )
-
-        if response.status_code != 200:
-            return None
 
-        data = response.json()
-        elements = data.get("elements", [])
-
-        # Analyser les résultats
-        industrial_zones = []
-        surface_parking = []
-        private_parking = []
-        malls = []
-        commercial_zones = []
-
-        # Map pour stocker les nodes des ways
-        nodes_map = {}
-        for elem in elements:
-            if elem["type"] == "node":
-                nodes_map[elem["id"]] = elem
+def fetch_industrial_data(lat, lon, city_name):
+    """Récupère les données industrielles et de parking via Overpass API."""
+    try:
+        # Agrégats uniquement : chaque élément est traité puis oublié,
+        # seuls les anneaux des zones industrielles sont conservés
+        counts = {
+            "industrial_zones": 0,
+            "surface_parking": 0,
+            "private_parking": 0,
+            "malls": 0,
+            "commercial_zones": 0,
+        }
+        industrial_shapes = []
 
-        for elem in elements:
+        # `out geom` embarque la géométrie des ways et des membres de relations
+        for elem in stream_elements(industrial_query(lat, lon), timeout=30):
             tags = elem.get("tags", {})
 
             # Zones industrielles
             if tags.get("landuse") == "industrial":
                 if elem["type"] in ["way", "relation"]:
-                    industrial_zones.append(elem)
+                    counts["industrial_zones"] += 1
+                    shape = industrial_shape(elem)
+                    if shape:
+                        industrial_shapes.append(shape)
 
             # Parkings de surface
             if tags.get("amenity") == "parking" and tags.get("parking") == "surface":
-                surface_parking.append(elem)
+                counts["surface_parking"] += 1
 
             # Parkings privés
             if tags.get("amenity") == "parking" and tags.get("access") == "private":
-                private_parking.append(elem)
+                counts["private_parking"] += 1
 
             # Centres commerciaux et supermarchés
             if tags.get("shop") in ["mall", "supermarket"]:
-                malls.append(elem)
+                counts["malls"] += 1
 
             # Zones commerciales
             if tags.get("landuse") == "commercial":
                 if elem["type"] in ["way", "relation"]:
-                    commercial_zones.append(elem)
-
-        # Calculer la surface totale des zones industrielles (approximation)
-        total_industrial_area = 0
-        for zone in industrial_zones:
-            if zone["type"] == "way" and "nodes" in zone:
-                # Approximation simple : calculer l'aire du polygone
-                coords = []
-                for node_id in zone["nodes"]:
-                    if node_id in nodes_map:
-                        node = nodes_map[node_id]
-                        coords.append((node["lat"], node["lon"]))
-
-                if len(coords) >= 3:
-                    # Formule de Shoelace pour calculer l'aire
-                    area = calculate_polygon_area(coords)
-                    total_industrial_area += area
-
-        # Convertir en hectares (1 hectare = 10,000 m²)
+                    counts["commercial_zones"] += 1
+
+        # Surface dissoute (chevauchements way/relation comptés une fois),
+        # convertie en hectares (1 hectare = 10,000 m²)
+        total_industrial_area = dissolved_area(industrial_shapes)
         industrial_area_hectares = round(total_industrial_area / 10000, 1)
 
         return {
-            "industrial_zones_count": len(industrial_zones),
+            "industrial_zones_count": counts["industrial_zones"],
             "industrial_area_hectares": industrial_area_hectares,
-            "surface_parking_count": len(surface_parking),
-            "private_parking_count": len(private_parking),
-            "commercial_zones_count": len(commercial_zones),
-            "malls_count": len(malls)
+            "surface_parking_count": counts["surface_parking"],
+            "private_parking_count": counts["private_parking"],
+            "commercial_zones_count": counts["commercial_zones"],
+            "malls_count": counts["malls"]
         }
 
     except Exception as e:
@@ -133,51 +119,39 @@ def fetch_industrial_data(lat, lon, city_name):
         return None
 
 
-def calculate_polygon_area(coords):
-    """
-    Calcule l'aire d'un polygone en m² à partir de coordonnées lat/lon.
-    Utilise la formule de Shoelace avec conversion en mètres.
-    """
-    if len(coords) < 3:
-        return 0
+def geometry_points(geometry):
+    """Convertit une géométrie Overpass (`out geom`) en points (lat, lon)."""
+    return [(p["lat"], p["lon"]) for p in geometry or [] if p]
 
-    # Conversion approximative : 1° lat ≈ 111km, 1° lon ≈ 111km * cos(lat)
-    # On prend la latitude moyenne
-    avg_lat = sum(c[0] for c in coords) / len(coords)
-    lat_to_m = 111000  # mètres par degré de latitude
-    lon_to_m = 111000 * abs(cosine(avg_lat))  # mètres par degré de longitude
-
-    # Convertir en coordonnées métriques
-    coords_m = [(lat * lat_to_m, lon * lon_to_m) for lat, lon in coords]
-
-    # Formule de Shoelace
-    area = 0
-    for i in range(len(coords_m)):
-        j = (i + 1) % len(coords_m)
-        area += coords_m[i][0] * coords_m[j][1]
-        area -= coords_m[j][0] * coords_m[i][1]
-
-    return abs(area) / 2
 
+def industrial_shape(elem):
+    """
+    Anneaux (lat, lon) d'une zone industrielle : le contour d'un way fermé,
+    ou les anneaux extérieurs et intérieurs assemblés d'un multipolygon.
+    """
+    if elem["type"] == "way":
+        coords = geometry_points(elem.get("geometry"))
+        return [coords] if len(coords) >= 3 else []
 
-def cosine(degrees):
-    """Calcule le cosinus d'un angle en degrés."""
-    import math
-    return math.cos(math.radians(degrees))
+    ways = [
+        geometry_points(m.get("geometry"))
+        for m in elem.get("members", [])
+        if m.get("type") == "way" and m.get("role") in ("outer", "inner", "")
+    ]
+    return assemble_rings(ways)
 
 
 def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
 
     if not os.path.exists(input_path):
         print(f"❌ Fichier {input_path} introuvable.")
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
+    cities = load_cities(input_path)
 
     # Villes sans données industrielles
-    cities_without_industry = [c for c in cities if not c.get("industry")]
+    cities_without_industry = [c for c in cities if needs_industry(c)]
 
     print(f"📊 Récupération données industrielles pour {len(cities_without_industry)} villes...\n")
 
@@ -188,16 +162,16 @@ def main():
     success_count = 0
 
     for i, city in enumerate(cities_without_industry):
-        if not city.get("latitude") or not city.get("longitude"):
-            print(f"[{i+1}/{len(cities_without_industry)}] {city['name']} ⏭️  Pas de coordonnées")
+        if not city.latitude or not city.longitude:
+            print(f"[{i+1}/{len(cities_without_industry)}] {city.name} ⏭️  Pas de coordonnées")
             continue
 
-        print(f"[{i+1}/{len(cities_without_industry)}] {city['name']}...", end=" ")
+        print(f"[{i+1}/{len(cities_without_industry)}] {city.name}...", end=" ")
 
         industry_data = fetch_industrial_data(
-            city["latitude"],
-            city["longitude"],
-            city["name"]
+            city.latitude,
+            city.longitude,
+            city.name
         )
 
         if industry_data:
@@ -207,32 +181,26 @@ def main():
             print(f"✅ {zones} zones ind., {area}ha, {parking} parkings")
             success_count += 1
 
-            # Mettre à jour dans la liste complète
-            for j, c in enumerate(cities):
-                if c["name"] == city["name"]:
-                    cities[j]["industry"] = industry_data
-                    break
+            # La ville est partagée avec la liste complète
+            city.industry = Industry.from_dict(industry_data)
         else:
             print("❌ Échec")
 
-        # Pause pour respecter rate limit Overpass (3 secondes)
-        time.sleep(3)
+        # Le rythme des requêtes Overpass est géré par le limiteur adaptatif
 
         # Sauvegarder progressivement tous les 10 villes
         if (i + 1) % 10 == 0:
-            with open(input_path, "w", encoding="utf-8") as f:
-                json.dump(cities, f, ensure_ascii=False, indent=2)
+            save_cities(cities, input_path)
             print(f"  💾 Sauvegarde intermédiaire ({i+1}/{len(cities_without_industry)})")
 
     # Sauvegarder final
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    save_cities(cities, input_path)
 
     print(f"\n✅ Récupération terminée !")
     print(f"📄 Sauvegardé dans {input_path}")
 
     # Stats finales
-    with_industry = sum(1 for c in cities if c.get("industry"))
+    with_industry = sum(1 for c in cities if c.industry)
     print(f"   🏭 {with_industry}/{len(cities)} villes avec données industrielles ({success_count} nouvelles)")
 
 
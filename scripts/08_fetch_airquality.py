@@ -3,14 +3,31 @@
 Script pour récupérer les données de qualité de l'air via Open-Meteo Air Quality API.
 """
 
-import json
 import os
 import sys
 import time
 import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.config import DATA_DIR
+from scripts.config import DATA_DIR, ENRICHED_FILE
+from scripts.city_model import AirQuality, load_cities, save_cities
+
+AIR_QUALITY_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+
+# Pause après chaque ville (s) ; données live, jamais mises en cache
+PAUSE_S = 0.5
+
+
+def needs_air_quality(city):
+    return not city.air_quality
+
+
+def air_quality_params(lat, lon):
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "current": "european_aqi,pm10,pm2_5,nitrogen_dioxide"
+    }
 
 
 def get_quality_label(aqi):
@@ -28,14 +45,7 @@ def get_quality_label(aqi):
 def fetch_air_quality(lat, lon):
     """Récupère les données de qualité de l'air via Open-Meteo."""
     try:
-        url = "https://air-quality-api.open-meteo.com/v1/air-quality"
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "european_aqi,pm10,pm2_5,nitrogen_dioxide"
-        }
-
-        response = requests.get(url, params=params, timeout=15)
+        response = requests.get(AIR_QUALITY_URL, params=air_quality_params(lat, lon), timeout=15)
 
         if response.status_code == 200:
             data = response.json()
@@ -61,17 +71,16 @@ def fetch_air_quality(lat, lon):
 
 
 def main():
-    input_path = os.path.join(DATA_DIR, "cities_enriched.json")
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
 
     if not os.path.exists(input_path):
         print(f"❌ Fichier {input_path} introuvable.")
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        cities = json.load(f)
+    cities = load_cities(input_path)
 
     # Villes sans données air
-    cities_without_air = [c for c in cities if not c.get("air_quality")]
+    cities_without_air = [c for c in cities if needs_air_quality(c)]
 
     print(f"📊 Récupération qualité de l'air pour {len(cities_without_air)} villes...\n")
 
@@ -82,44 +91,39 @@ def main():
     success_count = 0
 
     for i, city in enumerate(cities_without_air):
-        if not city.get("latitude") or not city.get("longitude"):
-            print(f"[{i+1}/{len(cities_without_air)}] {city['name']} ⏭️  Pas de coordonnées")
+        if not city.latitude or not city.longitude:
+            print(f"[{i+1}/{len(cities_without_air)}] {city.name} ⏭️  Pas de coordonnées")
             continue
 
-        print(f"[{i+1}/{len(cities_without_air)}] {city['name']}...", end=" ")
+        print(f"[{i+1}/{len(cities_without_air)}] {city.name}...", end=" ")
 
-        air_data = fetch_air_quality(city["latitude"], city["longitude"])
+        air_data = fetch_air_quality(city.latitude, city.longitude)
 
         if air_data:
             print(f"✅ AQI: {air_data['european_aqi']} ({air_data['quality_label']})")
             success_count += 1
 
-            # Mettre à jour dans la liste complète
-            for j, c in enumerate(cities):
-                if c["name"] == city["name"]:
-                    cities[j]["air_quality"] = air_data
-                    break
+            # La ville est partagée avec la liste complète
+            city.air_quality = AirQuality.from_dict(air_data)
         else:
             print("❌ Échec")
 
         # Pause courte
-        time.sleep(0.5)
+        time.sleep(PAUSE_S)
 
         # Sauvegarder progressivement tous les 30 villes
         if (i + 1) % 30 == 0:
-            with open(input_path, "w", encoding="utf-8") as f:
-                json.dump(cities, f, ensure_ascii=False, indent=2)
+            save_cities(cities, input_path)
             print(f"  💾 Sauvegarde intermédiaire ({i+1}/{len(cities_without_air)})")
 
     # Sauvegarder final
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(cities, f, ensure_ascii=False, indent=2)
+    save_cities(cities, input_path)
 
     print(f"\n✅ Récupération terminée !")
     print(f"📄 Sauvegardé dans {input_path}")
 
     # Stats finales
-    with_air = sum(1 for c in cities if c.get("air_quality"))
+    with_air = sum(1 for c in cities if c.air_quality)
     print(f"   🌫️  {with_air}/{len(cities)} villes avec données qualité air ({success_count} nouvelles)")
 
 
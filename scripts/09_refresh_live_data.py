@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rafraîchit les données « live » (qualité de l'air) sans régénérer le site.
+
+Récupère les valeurs à jour pour toutes les villes, les enregistre dans
+cities_enriched.json puis réécrit uniquement les fragments output/live/*.json
+qui ont changé. Les pages HTML ne sont pas touchées.
+
+Usage :
+    python scripts/09_refresh_live_data.py             # fetch + fragments
+    python scripts/09_refresh_live_data.py --no-fetch  # fragments seuls
+"""
+
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DATA_DIR, ENRICHED_FILE, OUTPUT_DIR
+from scripts.city_model import AirQuality, load_cities, save_cities
+from scripts.live_data import LIVE_DIR, write_live_fragments
+
+
+def refresh_air_quality(cities):
+    """Remplace les données de qualité de l'air de toutes les villes."""
+    # Client Open-Meteo de l'étape 08 (et requests), inutile avec --no-fetch
+    fetch_air_quality = importlib.import_module("scripts.08_fetch_airquality").fetch_air_quality
+
+    updated = 0
+    for i, city in enumerate(cities):
+        if not city.latitude or not city.longitude:
+            continue
+
+        print(f"[{i+1}/{len(cities)}] {city.name}...", end=" ")
+        air_data = fetch_air_quality(city.latitude, city.longitude)
+
+        if air_data:
+            city.air_quality = AirQuality.from_dict(air_data)
+            updated += 1
+            print(f"✅ AQI: {air_data['european_aqi']}")
+        else:
+            print("❌ Échec (valeur précédente conservée)")
+
+        time.sleep(0.5)
+
+    return updated
+
+
+def main():
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
+
+    if not os.path.exists(input_path):
+        print(f"❌ Fichier {input_path} introuvable.")
+        sys.exit(1)
+
+    cities = load_cities(input_path)
+
+    if "--no-fetch" not in sys.argv[1:]:
+        print(f"📊 Rafraîchissement qualité de l'air pour {len(cities)} villes...\n")
+        updated = refresh_air_quality(cities)
+        save_cities(cities, input_path)
+        print(f"\n   🌫️  {updated}/{len(cities)} villes mises à jour")
+
+    written, size = write_live_fragments(cities, OUTPUT_DIR)
+    print(f"\n✅ {written} fragments réécrits dans {OUTPUT_DIR}/{LIVE_DIR}/ ({size / 1024:.1f} Ko)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Étape 10 : Empreinte des assets et manifeste d'en-têtes de cache.
+
+- Chaque fichier de output/assets/ est copié sous un nom contenant le hash
+  de son contenu (style.css → style.3f2a9c1b7e.css)
+- Toutes les pages HTML générées sont réécrites pour pointer vers ces noms
+- output/assets/manifest.json : nom d'origine → nom empreinté
+- output/_headers : cache `immutable` d'un an pour les assets empreintés,
+  cache court avec revalidation pour le HTML (format Netlify / Cloudflare Pages)
+- output/sw.js : service worker (source templates/sw.js) versionné par le hash
+  du manifeste, qui précharge les assets partagés et sert les pages déjà vues
+  depuis son cache en les revalidant ; un build aux assets modifiés l'invalide
+- les sorties de 17_compression_dictionary.py (dictionnaires, variantes
+  .html.dcz, <link rel="compression-dictionary">) sont supprimées : elles
+  décrivent les pages d'avant, et _headers est réécrit sans leurs en-têtes
+  (relancer 17_compression_dictionary.py ensuite)
+
+À lancer après 03_generate_html.py ; relançable sans risque.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DEFAULT_LOCALE, LOCALES, OUTPUT_DIR, TEMPLATES_DIR
+from scripts.live_data import LIVE_DIR
+from scripts.roi_tables import ROI_DIR
+
+ASSETS_DIR = os.path.join(OUTPUT_DIR, "assets")
+MANIFEST_PATH = os.path.join(ASSETS_DIR, "manifest.json")
+HEADERS_PATH = os.path.join(OUTPUT_DIR, "_headers")
+SW_TEMPLATE = os.path.join(TEMPLATES_DIR, "sw.js")
+SW_PATH = os.path.join(OUTPUT_DIR, "sw.js")
+
+# Assets préchargés à l'installation du service worker (les autres, ex. images,
+# sont mis en cache à leur première utilisation) et pages HTML gardées
+SW_PRECACHE_EXTENSIONS = (".css", ".js", ".woff2", ".svg")
+SW_PAGES = 50
+
+HASH_LENGTH = 10
+HASHED_NAME = re.compile(r"\.[0-9a-f]{%d}(\.[^./]+)$" % HASH_LENGTH)
+
+# Politiques de cache
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_HTML = "public, max-age=300, must-revalidate"
+CACHE_LIVE = "public, max-age=600"
+CACHE_SW = "no-cache"
+
+# Sorties de 17_compression_dictionary.py, périmées dès que les pages changent
+DICTIONARY_DIR = "dictionaries"
+DICTIONARY_LINK = re.compile(r'[ \t]*<link rel="compression-dictionary"[^>]*>\n?')
+
+
+def content_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+
+
+def source_assets():
+    """Assets d'origine (hors fichiers déjà empreintés et manifeste), triés."""
+    assets = []
+    for dirpath, _, filenames in os.walk(ASSETS_DIR):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, ASSETS_DIR).replace(os.sep, "/")
+            if HASHED_NAME.search(name) or path == MANIFEST_PATH:
+                continue
+            assets.append(rel)
+    return sorted(assets)
+
+
+def fingerprint(assets):
+    """Copie chaque asset sous son nom empreinté ; supprime les anciennes versions."""
+    manifest = {}
+    for rel in assets:
+        root, ext = os.path.splitext(rel)
+        hashed = f"{root}.{content_hash(os.path.join(ASSETS_DIR, rel))}{ext}"
+        manifest[rel] = hashed
+        target = os.path.join(ASSETS_DIR, hashed)
+        if not os.path.exists(target):
+            shutil.copyfile(os.path.join(ASSETS_DIR, rel), target)
+
+    # Nettoyage des empreintes périmées d'une précédente exécution
+    current = set(manifest.values())
+    for dirpath, _, filenames in os.walk(ASSETS_DIR):
+        for name in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, name), ASSETS_DIR).replace(os.sep, "/")
+            if HASHED_NAME.search(name) and rel not in current:
+                os.remove(os.path.join(dirpath, name))
+
+    return manifest
+
+
+def reference_pattern(manifest):
+    """Regex des références « assets/<chemin> » (empreintées ou non)."""
+    alternatives = []
+    for rel in sorted(manifest, key=len, reverse=True):
+        root, ext = os.path.splitext(rel)
+        alternatives.append(
+            f"(?P<a{len(alternatives)}>{re.escape(root)}(?:\\.[0-9a-f]{{{HASH_LENGTH}}})?{re.escape(ext)})"
+        )
+    return re.compile(r"assets/(?:" + "|".join(alternatives) + r")(?![\w.-])")
+
+
+def html_pages():
+    pages = []
+    for dirpath, _, filenames in os.walk(OUTPUT_DIR):
+        for name in filenames:
+            if name.endswith(".html"):
+                pages.append(os.path.join(dirpath, name))
+    return sorted(pages)
+
+
+def rewrite_references(pages, manifest):
+    """
+    Remplace dans chaque page les chemins d'assets par leur version empreintée
+    et retire le lien vers un dictionnaire de compression.
+    """
+    pattern = reference_pattern(manifest)
+    originals = sorted(manifest, key=len, reverse=True)
+
+    def replace(match):
+        index = int(match.lastgroup[1:])
+        return "assets/" + manifest[originals[index]]
+
+    changed = 0
+    for path in pages:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        new_html = DICTIONARY_LINK.sub("", pattern.sub(replace, html))
+        if new_html != html:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(new_html)
+            changed += 1
+    return changed
+
+
+def write_headers(manifest):
+    """Manifeste d'en-têtes HTTP (syntaxe _headers de Netlify / Cloudflare Pages)."""
+    lines = []
+    for hashed in sorted(manifest.values()):
+        lines += [f"/assets/{hashed}", f"  Cache-Control: {CACHE_IMMUTABLE}", ""]
+    routes = ["/", "/index.html", "/citta/*", "/sitemap.xml", "/robots.txt"]
+    for locale in LOCALES:
+        if locale != DEFAULT_LOCALE:
+            routes += [f"/{locale}/", f"/{locale}/index.html", f"/{locale}/citta/*"]
+    for route in routes:
+        lines += [route, f"  Cache-Control: {CACHE_HTML}", ""]
+    lines += [f"/{ROI_DIR}/*", f"  Cache-Control: {CACHE_HTML}", ""]
+    lines += [f"/{LIVE_DIR}/*", f"  Cache-Control: {CACHE_LIVE}", ""]
+    lines += ["/sw.js", f"  Cache-Control: {CACHE_SW}", ""]
+
+    with open(HEADERS_PATH, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def remove_dictionaries():
+    """Supprime dictionnaires et variantes .html.dcz ; retourne le nombre de variantes supprimées."""
+    dictionary_dir = os.path.join(OUTPUT_DIR, DICTIONARY_DIR)
+    if os.path.isdir(dictionary_dir):
+        shutil.rmtree(dictionary_dir)
+    removed = 0
+    for dirpath, _, filenames in os.walk(OUTPUT_DIR):
+        for name in filenames:
+            if name.endswith(".html.dcz"):
+                os.remove(os.path.join(dirpath, name))
+                removed += 1
+    return removed
+
+
+def write_service_worker(manifest):
+    """output/sw.js : BUILD (version = hash du manifeste, assets à précharger) + templates/sw.js."""
+    build = {
+        "version": hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:HASH_LENGTH],
+        "precache": sorted(f"/assets/{hashed}" for rel, hashed in manifest.items()
+                           if rel.endswith(SW_PRECACHE_EXTENSIONS)),
+        "pages": SW_PAGES,
+        "live": LIVE_DIR,
+        "roi": ROI_DIR,
+    }
+    with open(SW_TEMPLATE, "r", encoding="utf-8") as f:
+        source = f.read()
+    with open(SW_PATH, "w", encoding="utf-8") as f:
+        f.write(f"var BUILD = {json.dumps(build, indent=4)};\n\n{source}")
+    return build
+
+
+def main():
+    if not os.path.isdir(ASSETS_DIR):
+        print(f"❌ Dossier {ASSETS_DIR} introuvable. Lance d'abord 03_generate_html.py")
+        sys.exit(1)
+
+    assets = source_assets()
+    manifest = fingerprint(assets)
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    pages = html_pages()
+    changed = rewrite_references(pages, manifest)
+    write_headers(manifest)
+    variants = remove_dictionaries()
+    build = write_service_worker(manifest)
+
+    print(f"✅ {len(manifest)} assets empreintés")
+    for rel, hashed in manifest.items():
+        print(f"   🔖 {rel} → {hashed}")
+    print(f"   📄 {changed}/{len(pages)} pages réécrites")
+    print(f"   🗂️  {MANIFEST_PATH} + {HEADERS_PATH}")
+    print(f"   👷 {SW_PATH} (version {build['version']}, {len(build['precache'])} assets préchargés)")
+    if variants:
+        print(f"   🗑️  {variants} variantes .html.dcz périmées supprimées (relancer 17_compression_dictionary.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Étape 11 : Valider le site généré avant déploiement.
+
+- Analyse toutes les pages HTML de output/ en parallèle
+- Résout chaque lien et asset interne dans l'arborescence output/
+- Parse chaque bloc <script type="application/ld+json">
+- Croise sitemap.xml et les fichiers (URLs mortes, pages orphelines)
+- Vérifie les images : fichiers locaux, URLs externes via un cache local
+  (.cache/image_status.json), interrogé en réseau seulement avec --check-images
+
+Incrémental : le résultat de l'analyse de chaque page est mis en cache par
+hash de contenu, seules les pages modifiées sont ré-analysées.
+
+Usage :
+    python scripts/11_validate_site.py [--check-images] [--full]
+Code retour 1 en cas d'erreur.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import CACHE_DIR, DOMAIN, OUTPUT_DIR
+
+PAGE_CACHE_PATH = os.path.join(CACHE_DIR, "validate_pages.json")
+IMAGE_CACHE_PATH = os.path.join(CACHE_DIR, "image_status.json")
+
+CSS_URL = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+EXTERNAL_SCHEMES = ("mailto:", "tel:", "javascript:", "data:")
+
+
+class PageParser(HTMLParser):
+    """Extrait liens, assets, images et blocs JSON-LD d'une page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.assets = []
+        self.images = []
+        self.jsonld = []
+        self._in_jsonld = False
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag == "link" and attrs.get("href"):
+            rel = attrs.get("rel", "")
+            if rel in ("canonical", "alternate"):
+                self.links.append(attrs["href"])
+            elif rel not in ("preconnect", "dns-prefetch"):
+                self.assets.append(attrs["href"])
+        elif tag == "script":
+            if attrs.get("src"):
+                self.assets.append(attrs["src"])
+            elif attrs.get("type") == "application/ld+json":
+                self._in_jsonld = True
+                self._buffer = []
+        elif tag == "img" and attrs.get("src"):
+            self.images.append(attrs["src"])
+        elif tag == "meta" and attrs.get("property") == "og:image" and attrs.get("content"):
+            self.images.append(attrs["content"])
+
+        if attrs.get("style"):
+            self.images.extend(CSS_URL.findall(attrs["style"]))
+
+    def handle_data(self, data):
+        if self._in_jsonld:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._in_jsonld:
+            self.jsonld.append(("".join(self._buffer), self.getpos()[0]))
+            self._in_jsonld = False
+
+
+def analyse_page(path):
+    """Analyse une page (exécuté dans un processus séparé)."""
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    parser = PageParser()
+    parser.feed(html)
+
+    jsonld_errors = []
+    for block, line in parser.jsonld:
+        try:
+            json.loads(block)
+        except json.JSONDecodeError as e:
+            jsonld_errors.append(f"JSON-LD invalide (bloc fini ligne {line}) : {e.msg}, ligne {e.lineno} du bloc")
+
+    return {
+        "links": parser.links,
+        "assets": parser.assets,
+        "images": parser.images,
+        "jsonld_blocks": len(parser.jsonld),
+        "jsonld_errors": jsonld_errors,
+    }
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def resolve(page_rel, url):
+    """
+    Chemin relatif à output/ visé par une URL interne,
+    ou None si l'URL est externe.
+    """
+    if url.startswith(DOMAIN):
+        url = url[len(DOMAIN):] or "/"
+    elif url.startswith(("http://", "https://", "//")) or url.startswith(EXTERNAL_SCHEMES):
+        return None
+
+    path = urlsplit(url).path
+    if not path:
+        return page_rel  # ancre dans la page même
+    if path.startswith("/"):
+        target = path.lstrip("/")
+    else:
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(page_rel), path))
+    if target in ("", "."):
+        target = "index.html"
+    elif target.endswith("/"):
+        target += "index.html"
+    return target
+
+
+def output_files():
+    files = set()
+    for dirpath, _, filenames in os.walk(OUTPUT_DIR):
+        for name in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, name), OUTPUT_DIR)
+            files.add(rel.replace(os.sep, "/"))
+    return files
+
+
+def load_json(path, default):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def analyse_pages(pages, full=False):
+    """Analyse en parallèle les pages modifiées depuis la dernière exécution."""
+    cache = {} if full else load_json(PAGE_CACHE_PATH, {})
+    hashes = {rel: file_hash(os.path.join(OUTPUT_DIR, rel)) for rel in pages}
+
+    todo = [rel for rel in pages if cache.get(rel, {}).get("hash") != hashes[rel]]
+    if todo:
+        with ProcessPoolExecutor() as pool:
+            paths = [os.path.join(OUTPUT_DIR, rel) for rel in todo]
+            for rel, result in zip(todo, pool.map(analyse_page, paths, chunksize=16)):
+                cache[rel] = dict(result, hash=hashes[rel])
+
+    results = {rel: cache[rel] for rel in pages}
+    save_json(PAGE_CACHE_PATH, results)
+    return results, len(todo)
+
+
+def check_remote_images(urls, image_cache):
+    """Interroge (HEAD) les images externes absentes du cache."""
+    import requests
+
+    def head(url):
+        target = "https:" + url if url.startswith("//") else url
+        try:
+            resp = requests.head(target, allow_redirects=True, timeout=15,
+                                 headers={"User-Agent": "RossiniEnergySEO/1.0"})
+            return url, resp.status_code
+        except requests.RequestException:
+            return url, 0
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for url, status in pool.map(head, urls):
+            image_cache[url] = status
+
+
+def sitemap_paths():
+    """Chemins (relatifs à output/) listés dans sitemap.xml."""
+    path = os.path.join(OUTPUT_DIR, "sitemap.xml")
+    if not os.path.exists(path):
+        return None
+    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+    locs = [loc.text.strip() for loc in ET.parse(path).getroot().findall("sm:url/sm:loc", ns)]
+    return {loc: resolve("index.html", loc) for loc in locs}
+
+
+def main():
+    args = sys.argv[1:]
+    if not os.path.isdir(OUTPUT_DIR):
+        print(f"❌ Dossier {OUTPUT_DIR} introuvable. Lance d'abord 03_generate_html.py")
+        sys.exit(1)
+
+    files = output_files()
+    pages = sorted(f for f in files if f.endswith(".html"))
+    results, analysed = analyse_pages(pages, full="--full" in args)
+    print(f"🔍 {len(pages)} pages ({analysed} analysées, {len(pages) - analysed} depuis le cache)\n")
+
+    errors = {}
+    warnings = {}
+
+    def report(bucket, page, message):
+        bucket.setdefault(page, []).append(message)
+
+    # Liens, assets, JSON-LD
+    remote_images = set()
+    inbound = {}
+    for page, result in results.items():
+        for message in result["jsonld_errors"]:
+            report(errors, page, message)
+        if result["jsonld_blocks"] == 0 and page.startswith("citta/"):
+            report(warnings, page, "aucun bloc JSON-LD")
+
+        for url in result["links"]:
+            target = resolve(page, url)
+            if target is None:
+                continue
+            if target not in files:
+                report(errors, page, f"lien cassé : {url}")
+            elif target != page:
+                inbound[target] = inbound.get(target, 0) + 1
+
+        for url in result["assets"]:
+            target = resolve(page, url)
+            if target is not None and target not in files:
+                report(errors, page, f"asset manquant : {url}")
+
+        for url in result["images"]:
+            target = resolve(page, url)
+            if target is None:
+                remote_images.add(url)
+            elif target not in files:
+                report(errors, page, f"image manquante : {url}")
+
+    # Images externes via le cache local
+    image_cache = load_json(IMAGE_CACHE_PATH, {})
+    unknown = sorted(u for u in remote_images if u not in image_cache)
+    if unknown and "--check-images" in args:
+        print(f"🖼️  Vérification réseau de {len(unknown)} images externes...")
+        check_remote_images(unknown, image_cache)
+        save_json(IMAGE_CACHE_PATH, image_cache)
+        unknown = []
+
+    for page, result in results.items():
+        for url in result["images"]:
+            status = image_cache.get(url)
+            if status is not None and not 200 <= status < 400:
+                report(errors, page, f"image externe en erreur ({status or 'injoignable'}) : {url}")
+
+    # Sitemap ↔ fichiers
+    sitemap = sitemap_paths()
+    if sitemap is None:
+        report(errors, "sitemap.xml", "fichier absent")
+    else:
+        listed = set()
+        for loc, target in sitemap.items():
+            if target is None or target not in files:
+                report(errors, "sitemap.xml", f"URL sans fichier : {loc}")
+            else:
+                listed.add(target)
+        for page in pages:
+            if page.startswith("citta/") and page not in listed:
+                report(warnings, page, "absente du sitemap")
+            if page.startswith("citta/") and not inbound.get(page):
+                report(warnings, page, "aucun lien entrant")
+
+    # Rapport
+    for bucket, icon in ((errors, "❌"), (warnings, "⚠️ ")):
+        for page in sorted(bucket):
+            for message in bucket[page]:
+                print(f"{icon} {page} : {message}")
+
+    n_errors = sum(len(m) for m in errors.values())
+    n_warnings = sum(len(m) for m in warnings.values())
+    print(f"\n{'✅' if not n_errors else '❌'} {n_errors} erreur(s), {n_warnings} avertissement(s)")
+    if unknown:
+        print(f"   🖼️  {len(unknown)} images externes non vérifiées (relancer avec --check-images)")
+
+    if n_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Étape 12 : Détecter les pages villes quasi dupliquées.
+
+- Extrait le texte visible de chaque page (hors <head>, scripts, en-tête,
+  navigation et pied de page communs à tout le site)
+- Découpe le texte en shingles de SHINGLE_SIZE mots
+- Calcule une signature MinHash par page (NumPy, en lot)
+- Regroupe les pages candidates par LSH (bandes de la signature) : seules
+  les paires partageant au moins une bande sont comparées, en temps
+  quasi linéaire au lieu de n² comparaisons
+- Vérifie chaque paire candidate par similarité de Jaccard exacte et
+  regroupe les quasi-doublons en clusters
+
+Usage :
+    python scripts/12_check_duplicates.py [--threshold 0.5] [--fail-above 0.8] [--top 15]
+Code retour 1 si une paire dépasse --fail-above.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import zlib
+from html.parser import HTMLParser
+from itertools import combinations
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import OUTPUT_DIR
+
+# Shingles de 5 mots : assez longs pour ignorer le vocabulaire commun,
+# assez courts pour repérer les paragraphes réécrits à la marge
+SHINGLE_SIZE = 5
+
+# Nombre de permutations MinHash (erreur type ≈ 1/sqrt(NUM_PERM) ≈ 0.09)
+NUM_PERM = 128
+
+# Premier de Mersenne 2^31 - 1 : a·x + b tient dans un uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Graine fixe : signatures reproductibles d'un build à l'autre
+SEED = 42
+
+# Similarité de Jaccard à partir de laquelle deux pages sont signalées
+DEFAULT_THRESHOLD = 0.5
+
+# Balises dont le texte n'est pas du contenu propre à la page
+SKIPPED_TAGS = {"head", "script", "style", "noscript", "template", "svg",
+                "header", "nav", "footer"}
+
+WORD = re.compile(r"\w+")
+
+
+class TextExtractor(HTMLParser):
+    """Texte visible du corps de la page, hors gabarit commun."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def visible_text(html):
+    parser = TextExtractor()
+    parser.feed(html)
+    return " ".join(parser.parts)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Ensemble des hash 32 bits des n-grammes de mots du texte."""
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def permutations(num_perm=NUM_PERM, seed=SEED):
+    """Coefficients (a, b) des fonctions de hachage h(x) = (a·x + b) mod p."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(hashes, a, b):
+    """Signature MinHash (num_perm,) d'un ensemble de hash de shingles."""
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % MERSENNE_PRIME
+    values = (a[:, None] * x[None, :] + b[:, None]) % MERSENNE_PRIME
+    return values.min(axis=1)
+
+
+def lsh_params(threshold, num_perm=NUM_PERM):
+    """
+    Choisit (bandes, lignes par bande) pour que le seuil de détection
+    (1/b)^(1/r) soit le plus proche possible de `threshold` sans le
+    dépasser : les paires au-dessus du seuil sont presque toutes candidates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) > threshold:
+            break
+        best = (bands, rows)
+    return best
+
+
+def candidate_pairs(signatures, bands, rows):
+    """Paires d'indices partageant au moins une bande de signature."""
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(chunk):
+            buckets.setdefault(key.tobytes(), []).append(i)
+        for members in buckets.values():
+            pairs.update(combinations(members, 2))
+    return pairs
+
+
+def jaccard(a, b):
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+def clusters(n, pairs):
+    """Composantes connexes (union-find) des paires de quasi-doublons."""
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return sorted((g for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Détection des pages villes quasi dupliquées")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"similarité de Jaccard signalée (défaut : {DEFAULT_THRESHOLD})")
+    parser.add_argument("--fail-above", type=float, default=None,
+                        help="code retour 1 si une paire atteint cette similarité")
+    parser.add_argument("--top", type=int, default=15, help="nombre de paires affichées")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(OUTPUT_DIR, "citta", "*.html")))
+    if not paths:
+        print(f"❌ Aucune page dans {OUTPUT_DIR}/citta. Lance d'abord 03_generate_html.py")
+        sys.exit(1)
+
+    names = [os.path.relpath(p, OUTPUT_DIR) for p in paths]
+    sets = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            sets.append(shingles(visible_text(f.read())))
+
+    a, b = permutations()
+    signatures = np.vstack([minhash(s, a, b) for s in sets])
+
+    threshold = min(args.threshold, args.fail_above or args.threshold)
+    bands, rows = lsh_params(threshold)
+    candidates = candidate_pairs(signatures, bands, rows)
+
+    n = len(paths)
+    print(f"🔍 {n} pages, {np.mean([len(s) for s in sets]):.0f} shingles en moyenne")
+    print(f"   LSH {bands}×{rows} : {len(candidates)} paires candidates "
+          f"sur {n * (n - 1) // 2} possibles")
+
+    # Vérification exacte des seules paires candidates
+    similar = []
+    for i, j in candidates:
+        score = jaccard(sets[i], sets[j])
+        if score >= threshold:
+            similar.append((score, i, j))
+    similar.sort(reverse=True)
+
+    if not similar:
+        print(f"\n✅ Aucune paire au-dessus de {threshold:.2f}")
+        return
+
+    print(f"\n📋 Paires les plus similaires (≥ {threshold:.2f}) :")
+    for score, i, j in similar[:args.top]:
+        print(f"   {score:.2f}  {names[i]} ↔ {names[j]}")
+
+    groups = clusters(n, [(i, j) for score, i, j in similar if score >= args.threshold])
+    if groups:
+        print(f"\n🧩 {len(groups)} cluster(s) de quasi-doublons :")
+        for group in groups[:args.top]:
+            listed = ", ".join(os.path.basename(names[i])[:-len(".html")] for i in group[:8])
+            more = f" (+{len(group) - 8})" if len(group) > 8 else ""
+            print(f"   {len(group):3d} pages : {listed}{more}")
+
+    if args.fail_above is not None:
+        failing = [s for s in similar if s[0] >= args.fail_above]
+        if failing:
+            print(f"\n❌ {len(failing)} paire(s) au-dessus de {args.fail_above:.2f}")
+            sys.exit(1)
+        print(f"\n✅ Aucune paire au-dessus de {args.fail_above:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Étape 13 : Manifeste de déploiement et liste des fichiers à publier.
+
+Le build étant reproductible (date des sources, ordre stable), un fichier
+inchangé est identique octet pour octet. Le manifeste (chemin → sha256) du
+build précédent permet de ne publier que les fichiers ajoutés ou modifiés et
+de supprimer les disparus.
+
+Sorties, hors du dossier publié (output/.nojekyll fait servir les fichiers en « . ») :
+- .cache/deploy/<site>/manifest.json : manifeste du build courant
+- .cache/deploy/<site>/changes.json  : {"added": [...], "changed": [...], "removed": [...]}
+
+Usage :
+    python scripts/13_deploy_manifest.py [--previous MANIFEST] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import CACHE_DIR, OUTPUT_DIR, SITE
+
+DEPLOY_DIR = os.path.join(CACHE_DIR, "deploy", SITE)
+MANIFEST_PATH = os.path.join(DEPLOY_DIR, "manifest.json")
+CHANGES_PATH = os.path.join(DEPLOY_DIR, "changes.json")
+
+# Anciens emplacements, dans le dossier publié : repris une fois puis supprimés
+LEGACY_MANIFEST_PATH = os.path.join(OUTPUT_DIR, ".deploy-manifest.json")
+LEGACY_CHANGES_PATH = os.path.join(OUTPUT_DIR, ".deploy-changes.json")
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_manifest(output_dir=OUTPUT_DIR):
+    """Chemin relatif (séparateur /) → sha256 de chaque fichier publié, trié par chemin."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(output_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, output_dir).replace(os.sep, "/")
+            files[rel] = file_hash(path)
+    return dict(sorted(files.items()))
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["files"]
+
+
+def diff_manifests(previous, current):
+    return {
+        "added": sorted(set(current) - set(previous)),
+        "changed": sorted(p for p in current if p in previous and previous[p] != current[p]),
+        "removed": sorted(set(previous) - set(current)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Liste les fichiers à publier depuis le dernier build")
+    parser.add_argument("--previous", default=MANIFEST_PATH,
+                        help="manifeste de référence (défaut : celui du build précédent)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="affiche le diff sans écrire le manifeste")
+    args = parser.parse_args()
+
+    if not os.path.isdir(OUTPUT_DIR):
+        print(f"❌ Dossier {OUTPUT_DIR} introuvable. Lance d'abord 03_generate_html.py")
+        sys.exit(1)
+
+    previous_path = args.previous
+    if previous_path == MANIFEST_PATH and not os.path.exists(MANIFEST_PATH):
+        previous_path = LEGACY_MANIFEST_PATH
+    previous = load_manifest(previous_path)
+
+    if not args.dry_run:
+        for legacy in (LEGACY_MANIFEST_PATH, LEGACY_CHANGES_PATH):
+            if os.path.exists(legacy):
+                os.remove(legacy)
+    current = build_manifest()
+    changes = diff_manifests(previous, current)
+
+    if not args.dry_run:
+        os.makedirs(DEPLOY_DIR, exist_ok=True)
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump({"files": current}, f, indent=2)
+            f.write("\n")
+        with open(CHANGES_PATH, "w", encoding="utf-8") as f:
+            json.dump(changes, f, indent=2)
+            f.write("\n")
+
+    total = sum(len(paths) for paths in changes.values())
+    if not previous:
+        print(f"🆕 Aucun manifeste précédent : {len(current)} fichiers à publier")
+    elif total == 0:
+        print(f"✅ Aucun changement depuis le dernier build ({len(current)} fichiers)")
+    else:
+        print(f"📦 {total} fichier(s) à publier sur {len(current)} :")
+        for kind, icon in (("added", "➕"), ("changed", "✏️ "), ("removed", "➖")):
+            for path in changes[kind]:
+                print(f"   {icon} {path}")
+
+    if not args.dry_run:
+        print(f"   🗂️  {MANIFEST_PATH} + {CHANGES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Étape 14 : Analyser le maillage interne « villes voisines ».
+
+- Construit le graphe des liens internes (matrice creuse : pages ville +
+  index) tel que 03_generate_html.py le génère
+- Compare les plus proches voisines (équilibrage 0) et le plan équilibré
+  (LINK_BALANCE) : liens entrants par page, coefficient de Gini, PageRank
+- Liste les pages les moins bien servies (PageRank le plus bas)
+
+Ne lit que les données : à lancer avant ou après la génération.
+
+Usage :
+    python scripts/14_link_graph.py [--budget 8] [--radius 50] [--balance 0.5] [--top 10]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import LINK_BALANCE, LINK_BUDGET, LINK_RADIUS_KM
+from scripts.city_model import load_cities
+from scripts.link_graph import coordinates, link_stats, plan_links
+from scripts.sites import get_site
+
+generate = importlib.import_module("scripts.03_generate_html")
+
+
+def describe(label, stats, elapsed):
+    inbound = stats["inbound"]
+    rank = stats["pagerank"]
+    p10, median, p90 = np.percentile(inbound, [10, 50, 90])
+    print(f"\n{label} ({elapsed * 1000:.0f} ms)")
+    print(f"   🔗 {stats['links']} liens, entrants min {inbound.min():.0f} / p10 {p10:.0f} / "
+          f"médiane {median:.0f} / p90 {p90:.0f} / max {inbound.max():.0f}")
+    print(f"   📉 {stats['zero_inbound']} page(s) sans lien entrant, "
+          f"{int((inbound <= 1).sum())} avec un seul, Gini {stats['gini']:.3f}")
+    print(f"   ⚖️  PageRank max/min : {rank.max() / rank.min():.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse du maillage interne « villes voisines »")
+    parser.add_argument("--budget", type=int, default=LINK_BUDGET, help="liens par page")
+    parser.add_argument("--radius", type=float, default=LINK_RADIUS_KM, help="rayon de recherche (km)")
+    parser.add_argument("--balance", type=float, default=LINK_BALANCE,
+                        help="poids de l'équilibrage des liens entrants")
+    parser.add_argument("--top", type=int, default=10, help="pages les moins bien servies affichées")
+    args = parser.parse_args()
+
+    site = get_site()
+    input_path = site.input_path()
+    if input_path is None:
+        print("❌ Aucun fichier de données trouvé. Lance d'abord les scripts 01 et 02.")
+        sys.exit(1)
+
+    cities = generate.sort_cities(load_cities(input_path))
+    lat, lon = coordinates(cities)
+    print(f"🕸️  {len(cities)} pages ville, {args.budget} liens max par page dans {args.radius:g} km")
+
+    start = time.perf_counter()
+    nearest = plan_links(lat, lon, args.budget, args.radius, 0)
+    describe("Plus proches voisines", link_stats(nearest), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    balanced = plan_links(lat, lon, args.budget, args.radius, args.balance)
+    stats = link_stats(balanced)
+    describe(f"Plan équilibré (balance {args.balance:g})", stats, time.perf_counter() - start)
+
+    changed = int((np.sort(nearest, axis=1) != np.sort(balanced, axis=1)).any(axis=1).sum())
+    print(f"   ✏️  {changed} page(s) avec des liens différents des plus proches voisines")
+
+    print("\n🔎 Pages au PageRank le plus bas :")
+    for i in np.argsort(stats["pagerank"], kind="stable")[:args.top]:
+        city = cities[i]
+        print(f"   {stats['pagerank'][i] * 1000:.3f}‰  {city.name} "
+              f"({city.province or '—'}) : {stats['inbound'][i]:.0f} lien(s) entrant(s)")
+
+
+if __name__ == "__main__":
+    main()
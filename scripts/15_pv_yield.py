@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Étape 15 : Production photovoltaïque locale par profil de ville.
+
+- Valide le modèle local (scripts/pv_model.py) contre les calculs PVGIS déjà
+  dans les données : production mensuelle de référence pour les villes avec
+  les moyennes MRcalc, irradiation annuelle sur le plan H(i) pour les autres
+- Calcule en une passe toutes les installations type de PV_SYSTEMS
+  (config.py) pour toutes les villes, sans appel distant
+
+Usage :
+    python scripts/15_pv_yield.py [--city milano]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DATA_DIR, ENRICHED_FILE, PV_SYSTEMS
+from scripts.city_model import load_cities
+from scripts import pv_model
+
+generate = importlib.import_module("scripts.03_generate_html")
+
+MONTHS = ("Gen", "Feb", "Mar", "Apr", "Mag", "Giu", "Lug", "Ago", "Set", "Ott", "Nov", "Dic")
+
+
+def relative_errors(model, reference):
+    return (model - reference) / np.maximum(reference, 1e-9) * 100
+
+
+def describe_errors(label, errors):
+    print(f"   {label} : écart médian {np.median(errors):+.1f} %, "
+          f"p5 {np.percentile(errors, 5):+.1f} % / p95 {np.percentile(errors, 95):+.1f} %, "
+          f"écart absolu moyen {np.abs(errors).mean():.1f} %")
+
+
+def validate(cities, inputs):
+    """Compare le modèle aux résultats PVGIS stockés dans Solar."""
+    lat, horizontal, diffuse, temperature, measured = inputs
+    ref = pv_model.REFERENCE
+    print(f"🔬 Validation contre PVGIS ({ref['kwp']:g} kWc, {ref['tilt']:g}°, {ref['loss']:g} % de pertes)")
+
+    if measured.any():
+        subset = [c for c, m in zip(cities, measured) if m]
+        produced = pv_model.city_production(
+            subset, ref["kwp"], ref["tilt"], ref["azimuth"], ref["bifaciality"], ref["loss"],
+            mounting=ref["mounting"], inputs=tuple(a[measured] for a in inputs[:4]) + (measured[measured],),
+        )[:, 0]
+        pvgis = np.array([c.solar.monthly_production for c in subset])
+        print(f"   {len(subset)} villes avec les moyennes MRcalc")
+        describe_errors("production mensuelle", relative_errors(produced, pvgis).ravel())
+        describe_errors("production annuelle", relative_errors(produced.sum(axis=1), pvgis.sum(axis=1)))
+
+    # Irradiation sur le plan : contrôle indépendant de la transposition
+    # (pour les villes sans MRcalc, l'irradiation horizontale vient de la production)
+    known = ~np.isnan(diffuse).any(axis=1)
+    plane = np.empty(len(cities))
+    if (~known).any():
+        plane[~known] = pv_model.plane_irradiation(lat[~known], horizontal[~known], [ref["tilt"]],
+                                                   [ref["azimuth"]]).sum(axis=2)[:, 0]
+    if known.any():
+        plane[known] = pv_model.plane_irradiation(lat[known], horizontal[known], [ref["tilt"]],
+                                                  [ref["azimuth"]], diffuse[known]).sum(axis=2)[:, 0]
+    pvgis = np.array([c.solar.irradiation_kwh_m2 for c in cities])
+    print(f"   {int((~measured).sum())} villes sans MRcalc (irradiation retrouvée depuis la production)")
+    describe_errors("irradiation annuelle H(i)", relative_errors(plane, pvgis))
+
+
+def system_yields(cities, inputs):
+    """Production mensuelle (n, k, 12) des k installations de PV_SYSTEMS, une passe par type de pose."""
+    keys = list(PV_SYSTEMS)
+    out = np.zeros((len(cities), len(keys), 12))
+    for mounting in sorted({s["mounting"] for s in PV_SYSTEMS.values()}):
+        cols = [i for i, key in enumerate(keys) if PV_SYSTEMS[key]["mounting"] == mounting]
+        systems = [PV_SYSTEMS[keys[i]] for i in cols]
+        out[:, cols] = pv_model.city_production(
+            cities, *(np.array([s[p] for s in systems], dtype=float)
+                      for p in ("kwp", "tilt", "azimuth", "bifaciality", "loss")),
+            mounting=mounting, inputs=inputs,
+        )
+    return keys, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Production PV locale par profil de ville")
+    parser.add_argument("--city", help="détail mensuel d'une ville (slug)")
+    args = parser.parse_args()
+
+    input_path = os.path.join(DATA_DIR, ENRICHED_FILE)
+    if not os.path.exists(input_path):
+        print(f"❌ Fichier {input_path} introuvable.")
+        sys.exit(1)
+
+    cities = [c for c in load_cities(input_path)
+              if c.solar and c.latitude and c.longitude and len(c.solar.monthly_production) == 12]
+    if not cities:
+        print("❌ Aucune ville avec données solaires. Lance d'abord 06_fetch_solar.py")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    inputs = pv_model.location_inputs(cities)
+    validate(cities, inputs)
+
+    keys, monthly = system_yields(cities, inputs)
+    annual = monthly.sum(axis=2)
+    elapsed = time.perf_counter() - start
+    print(f"\n☀️  {len(cities)} villes × {len(keys)} installations en {elapsed * 1000:.0f} ms")
+
+    profiles = np.array([generate.get_city_profile(c)[0] for c in cities])
+    for j, key in enumerate(keys):
+        system = PV_SYSTEMS[key]
+        specific = annual[:, j] / system["kwp"]
+        count = int((profiles == key).sum())
+        print(f"   {key} · {system['label']} ({system['kwp']} kWc, {system['tilt']}°"
+              f"{', bifacciale' if system['bifaciality'] else ''}) : "
+              f"{np.median(specific):,.0f} kWh/kWc médian ({specific.min():,.0f} → {specific.max():,.0f}), "
+              f"{np.median(annual[:, j]):,.0f} kWh/an — {count} ville(s) du profil")
+
+    if args.city:
+        index = next((i for i, c in enumerate(cities) if c.slug == args.city), None)
+        if index is None:
+            print(f"❌ Ville inconnue ou sans données solaires : {args.city}")
+            sys.exit(1)
+        city = cities[index]
+        print(f"\n📍 {city.name} (profil {profiles[index]})")
+        print("   " + " ".join(f"{m:>7}" for m in ("", *MONTHS, "Anno")))
+        for j, key in enumerate(keys):
+            values = " ".join(f"{v:7.0f}" for v in monthly[index, j])
+            print(f"   {key:>7} {values} {annual[index, j]:7.0f}")
+
+
+if __name__ == "__main__":
+    main()
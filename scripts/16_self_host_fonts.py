@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Étape 16 : Polices et icônes auto-hébergées.
+
+Les templates chargent Poppins / Open Sans depuis fonts.googleapis.com et toute
+la feuille Font Awesome depuis cdnjs. Sur les pages générées, cette étape :
+- déduit de style.css (héritage et gras par défaut des titres compris) les
+  faces réellement affichées parmi celles du lien Google Fonts, et des pages
+  les caractères affichés
+- télécharge une fois ces faces en WOFF2 (cache HTTP partagé) en ne gardant
+  que les fichiers des plages Unicode utiles ; si fontTools (+ brotli) est
+  installé, chaque fichier est en plus réduit aux glyphes affichés
+- construit un sprite SVG (assets/icons.svg) des icônes fa-* utilisées et
+  remplace les <i class="fa-..."> par des <svg><use>
+- réécrit le <head> de chaque page : @font-face en ligne, preload des polices
+  du premier écran (titre et texte), plus aucune origine tierce
+
+À lancer après 03_generate_html.py et avant 10_fingerprint_assets.py (qui
+empreinte les polices et le sprite). Relançable : les blocs déjà insérés
+(attribut data-fonts) sont remplacés.
+
+Usage :
+    python scripts/16_self_host_fonts.py [--list]
+"""
+
+import argparse
+import html
+import io
+import os
+import re
+import shutil
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import FONT_AWESOME_SVG_URL, FONTS_USER_AGENT, OUTPUT_DIR
+from scripts import http_cache
+
+try:
+    from fontTools import subset as font_subset
+    import brotli  # noqa: F401 — requis par fontTools pour lire et écrire le WOFF2
+except ImportError:
+    font_subset = None
+
+ASSETS_DIR = os.path.join(OUTPUT_DIR, "assets")
+FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+STYLESHEET = os.path.join(ASSETS_DIR, "css", "style.css")
+SPRITE = "icons.svg"
+
+# Éléments en gras par défaut (feuille de style des navigateurs)
+BOLD_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "strong", "b", "th"}
+# Éléments du premier écran dont la police est préchargée
+CRITICAL_SELECTORS = ("h1", "body")
+# Toujours inclus : texte injecté par les scripts (simulateur, fragments live)
+EXTRA_CHARS = "".join(map(chr, range(0x20, 0x7f))) + "\u00a0\u202f€°–—…’«»"
+WEIGHT_KEYWORDS = {"normal": "400", "bold": "700"}
+
+ICON_STYLES = {"fa-solid": "solid", "fas": "solid", "fa-regular": "regular", "far": "regular",
+               "fa-brands": "brands", "fab": "brands"}
+ICON_MODIFIERS = re.compile(r"fa-(?:\d?x[sl]?|\d+x|sm|lg|fw|li|border|inverse|spin|pulse|beat|fade|bounce"
+                            r"|shake|flip(?:-\w+)?|rotate-\w+|stack(?:-\dx)?|pull-\w+)$")
+ICON_CSS = ".icon{display:inline-block;width:1em;height:1em;fill:currentColor;vertical-align:-.125em}"
+
+GOOGLE_LINK = re.compile(r'<link[^>]+href="(https://fonts\.googleapis\.com/css2\?[^"]+)"')
+FONT_LINKS = re.compile(r'[ \t]*<link[^>]+href="https://fonts\.(?:googleapis|gstatic)\.com[^"]*"[^>]*>\n?')
+ICON_LINK = re.compile(r'[ \t]*<link[^>]+href="https://cdnjs\.cloudflare\.com/ajax/libs/font-awesome/[^"]*"[^>]*>\n?')
+PRECONNECT_COMMENT = re.compile(r"[ \t]*<!-- Preconnect -->\n?")
+MANAGED = re.compile(r'[ \t]*<(?:link[^>]*\bdata-fonts\b[^>]*>|style data-fonts>[^<]*</style>)\n?')
+PREFIX = re.compile(r'href="((?:\.\./)*)assets/css/style\b')
+ICON = re.compile(r'<i class="([^"]*\bfa-[^"]*)"([^>]*)></i>')
+FONT_FACE = re.compile(r"/\*\s*([\w\[\]-]+)\s*\*/\s*@font-face\s*\{([^}]*)\}")
+
+
+# === Analyse ===
+
+def declarations(body):
+    props = {}
+    for declaration in body.split(";"):
+        name, _, value = declaration.partition(":")
+        if value.strip():
+            props[name.strip().lower()] = value.strip()
+    return props
+
+
+def css_rules(css):
+    """(sélecteurs, propriétés) de chaque règle ; les @media sont aplatis."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"@media[^{]*\{", "", css)
+    for selectors, body in re.findall(r"([^{}]+)\{([^{}]*)\}", css):
+        yield [s.strip() for s in selectors.split(",")], declarations(body)
+
+
+def font_family(value):
+    return value.split(",")[0].strip().strip("'\"")
+
+
+def element(selector):
+    """Balise ciblée par le dernier composé du sélecteur (« .hero h1 » → h1), ou None."""
+    match = re.match(r"[a-z][a-z0-9]*", re.split(r"[\s>+~]+", selector.strip())[-1])
+    return match.group(0) if match else None
+
+
+def used_faces(css):
+    """
+    Faces (famille, graisse, style) affichées selon style.css : {face: [sélecteurs]}.
+    Propriétés absentes : celles de la balise ciblée, puis la famille de body
+    et le gras par défaut des titres.
+    """
+    declared = {}
+    for selectors, props in css_rules(css):
+        fonts = {k: v for k, v in props.items() if k in ("font-family", "font-weight", "font-style")}
+        if fonts:
+            for selector in selectors:
+                declared.setdefault(selector, {}).update(fonts)
+    body = font_family(declared.get("body", {}).get("font-family", ""))
+
+    faces = {}
+    for selector in sorted(set(declared) | BOLD_TAGS | {"body"}):
+        face = selector_face(declared, body, selector)
+        if face:
+            faces.setdefault(face, []).append(selector)
+    return faces
+
+
+def selector_face(declared, body, selector):
+    own = declared.get(selector, {})
+    tag = element(selector)
+    inherited = declared.get(tag, {}) if tag and tag != selector else {}
+
+    def value(prop):
+        return own.get(prop) or inherited.get(prop)
+
+    family = font_family(value("font-family")) if value("font-family") else body
+    weight = WEIGHT_KEYWORDS.get(value("font-weight"), value("font-weight")) or ("700" if tag in BOLD_TAGS else "400")
+    if not weight.isdigit():
+        return None  # bolder, inherit... : relatif au parent, ignoré
+    style = "italic" if value("font-style") in ("italic", "oblique") else "normal"
+    return family, int(weight), style
+
+
+def requested_faces(url):
+    """Faces d'une URL css2 de Google Fonts (family=Poppins:ital,wght@0,400;1,700)."""
+    faces = set()
+    for spec in parse_qs(urlsplit(url).query).get("family", []):
+        name, _, axes = spec.partition(":")
+        keys, _, tuples = axes.partition("@")
+        for values in (tuples.split(";") if tuples else [""]):
+            axis = dict(zip(keys.split(","), values.split(",")))
+            faces.add((name, int(axis.get("wght", 400)), "italic" if axis.get("ital") == "1" else "normal"))
+    return faces
+
+
+def matching_face(face, available):
+    """
+    Face que le navigateur utilise pour `face` parmi `available` (règles de
+    correspondance CSS des graisses ; italique absent → face droite).
+    """
+    family, weight, style = face
+    for wanted in (style, "normal"):
+        weights = sorted(w for f, w, s in available if f == family and s == wanted)
+        if weights:
+            break
+    else:
+        return None
+
+    lighter = [w for w in reversed(weights) if w < weight]
+    heavier = [w for w in weights if w > weight]
+    if weight in weights:
+        order = [weight]
+    elif 400 <= weight <= 500:
+        order = [w for w in heavier if w <= 500] + lighter + [w for w in heavier if w > 500]
+    elif weight < 400:
+        order = lighter + heavier
+    else:
+        order = heavier + lighter
+    return family, order[0], wanted
+
+
+def page_text(text):
+    text = re.sub(r"<(script|style)\b.*?</\1>", " ", text, flags=re.S | re.I)
+    return html.unescape(re.sub(r"<[^>]+>", " ", text))
+
+
+def icon_of(classes):
+    """Classes d'un <i> → (style, nom) de l'icône Font Awesome, ou None."""
+    classes = classes.split()
+    style = next((ICON_STYLES[c] for c in classes if c in ICON_STYLES), "solid")
+    name = next((c[3:] for c in classes
+                 if c.startswith("fa-") and c not in ICON_STYLES and not ICON_MODIFIERS.match(c)), None)
+    return (style, name) if name else None
+
+
+def html_pages():
+    pages = []
+    for dirpath, _, filenames in os.walk(OUTPUT_DIR):
+        for name in filenames:
+            if name.endswith(".html"):
+                pages.append(os.path.join(dirpath, name))
+    return sorted(pages)
+
+
+def scan(pages):
+    """URL Google Fonts des templates, caractères affichés et icônes utilisées."""
+    url, chars, icons = None, set(EXTRA_CHARS), set()
+    for path in pages:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        match = GOOGLE_LINK.search(text)
+        if match and url is None:
+            url = html.unescape(match.group(1))
+        chars.update(c for c in page_text(text) if c.isprintable())
+        icons.update(filter(None, (icon_of(m.group(1)) for m in ICON.finditer(text))))
+    return url, chars, icons
+
+
+# === Polices ===
+
+def unicode_spans(value):
+    """« U+0000-00FF, U+0131, U+02??» → [(0x0, 0xff), (0x131, 0x131), (0x200, 0x2ff)]."""
+    spans = []
+    for part in value.split(","):
+        low, _, high = part.strip()[2:].partition("-")
+        if "?" in low:
+            low, high = low.replace("?", "0"), low.replace("?", "F")
+        spans.append((int(low, 16), int(high or low, 16)))
+    return spans
+
+
+def google_fonts_css(url):
+    resp = http_cache.get(url, headers={"User-Agent": FONTS_USER_AGENT}, timeout=30)
+    resp.raise_for_status()
+    return resp.text
+
+
+def font_files(css, faces, chars):
+    """
+    Fichiers WOFF2 de la feuille Google Fonts pour les faces retenues, limités
+    aux plages Unicode contenant au moins un caractère affiché.
+    """
+    files = []
+    for subset, body in FONT_FACE.findall(css):
+        props = declarations(body)
+        face = (font_family(props["font-family"]), int(props["font-weight"]), props["font-style"])
+        if face not in faces:
+            continue
+        spans = unicode_spans(props["unicode-range"])
+        used = {c for c in chars if any(low <= ord(c) <= high for low, high in spans)}
+        if used:
+            family, weight, style = face
+            name = f"{family.lower().replace(' ', '-')}-{weight}{'i' if style == 'italic' else ''}-{subset.strip('[]')}.woff2"
+            files.append({
+                "face": face, "name": name, "range": props["unicode-range"], "chars": used,
+                "src": re.search(r"url\(([^)]+)\)", props["src"]).group(1),
+            })
+    return files
+
+
+def subset_woff2(data, chars):
+    """Réduit une police WOFF2 aux glyphes (et variantes OpenType) des caractères donnés."""
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    font = font_subset.load_font(io.BytesIO(data), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(c) for c in chars])
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font_subset.save_font(font, out, options)
+    return out.getvalue()
+
+
+def write_fonts(files):
+    """
+    Télécharge (cache HTTP) et écrit les polices ; retourne (octets Google, octets publiés).
+    Tout est téléchargé avant de remplacer assets/fonts/ : un échec réseau le laisse intact.
+    """
+    downloads = []
+    for font in files:
+        resp = http_cache.get(font["src"], headers={"User-Agent": FONTS_USER_AGENT}, timeout=30)
+        resp.raise_for_status()
+        downloads.append((font, resp.content))
+
+    if os.path.isdir(FONTS_DIR):
+        shutil.rmtree(FONTS_DIR)
+    os.makedirs(FONTS_DIR)
+
+    original, written = 0, 0
+    for font, data in downloads:
+        original += len(data)
+        if font_subset:
+            data = subset_woff2(data, font["chars"])
+        with open(os.path.join(FONTS_DIR, font["name"]), "wb") as f:
+            f.write(data)
+        written += len(data)
+    return original, written
+
+
+def font_face_css(files, prefix):
+    return "".join(
+        f"@font-face{{font-family:'{family}';font-style:{style};font-weight:{weight};font-display:swap;"
+        f"src:url({prefix}assets/fonts/{font['name']}) format('woff2');unicode-range:{font['range']}}}"
+        for font in files
+        for family, weight, style in [font["face"]]
+    )
+
+
+def preloaded(files, faces):
+    """Pour chaque face critique, son fichier couvrant le plus de caractères affichés."""
+    names = []
+    for face in faces:
+        candidates = [f for f in files if f["face"] == face]
+        if candidates:
+            name = max(candidates, key=lambda f: len(f["chars"]))["name"]
+            if name not in names:
+                names.append(name)
+    return names
+
+
+# === Icônes ===
+
+def write_sprite(icons):
+    """Sprite SVG des icônes trouvées (<symbol id="solid-sun">) ; retourne les icônes incluses."""
+    symbols, found = [], set()
+    for style, name in sorted(icons):
+        resp = http_cache.get(FONT_AWESOME_SVG_URL.format(style=style, name=name), timeout=30)
+        if resp.status_code == 404:
+            print(f"   ⚠️  Icône introuvable : fa-{style} fa-{name}")
+            continue
+        resp.raise_for_status()
+        viewbox = re.search(r'viewBox="([^"]+)"', resp.text).group(1)
+        paths = re.sub(r"<!--.*?-->", "", re.search(r"<svg[^>]*>(.*)</svg>", resp.text, re.S).group(1), flags=re.S)
+        symbols.append(f'<symbol id="{style}-{name}" viewBox="{viewbox}">{paths.strip()}</symbol>')
+        found.add((style, name))
+
+    if symbols:
+        with open(os.path.join(ASSETS_DIR, SPRITE), "w", encoding="utf-8") as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg">' + "".join(symbols) + "</svg>")
+    return found
+
+
+# === Réécriture des pages ===
+
+def rewrite_page(text, files, preloads, icons, drop_icon_font):
+    match = PREFIX.search(text)
+    if match is None:
+        return text
+    prefix = match.group(1)
+
+    def replace_icon(m):
+        icon = icon_of(m.group(1))
+        if icon not in icons:
+            return m.group(0)
+        classes = " ".join(c for c in m.group(1).split()
+                           if not (c in ICON_STYLES or c == "fa" or c.startswith("fa-")))
+        attrs = m.group(2) if "aria-hidden" in m.group(2) else m.group(2) + ' aria-hidden="true"'
+        return (f'<svg class="{("icon " + classes).strip()}"{attrs}>'
+                f'<use href="{prefix}assets/{SPRITE}#{icon[0]}-{icon[1]}"></use></svg>')
+
+    text = ICON.sub(replace_icon, text)
+
+    patterns = [PRECONNECT_COMMENT, FONT_LINKS, MANAGED] + ([ICON_LINK] if drop_icon_font else [])
+    starts = [m.start() for p in patterns for m in p.finditer(text)]
+    if not starts:
+        return text
+    start = min(starts)
+    indent = re.match(r"[ \t]*", text[start:]).group(0)
+    rest = text[start:]
+    for pattern in patterns:
+        rest = pattern.sub("", rest)
+
+    block = [f'<link rel="preload" href="{prefix}assets/fonts/{name}" as="font" type="font/woff2" crossorigin data-fonts>'
+             for name in preloads]
+    block.append(f"<style data-fonts>{font_face_css(files, prefix)}{ICON_CSS if icons else ''}</style>")
+    return text[:start] + "".join(f"{indent}{line}\n" for line in block) + rest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polices et icônes auto-hébergées")
+    parser.add_argument("--list", action="store_true", help="affiche l'analyse sans rien télécharger ni réécrire")
+    args = parser.parse_args()
+
+    if not os.path.exists(STYLESHEET):
+        print(f"❌ {STYLESHEET} introuvable. Lance d'abord 03_generate_html.py")
+        sys.exit(1)
+
+    pages = html_pages()
+    url, chars, icons = scan(pages)
+    if url is None:
+        print("✅ Aucune page ne charge Google Fonts (déjà réécrites ? relancer 03_generate_html.py)")
+        return
+
+    with open(STYLESHEET, "r", encoding="utf-8") as f:
+        declared = used_faces(f.read())
+    requested = requested_faces(url)
+    faces = {}
+    for face, selectors in declared.items():
+        match = matching_face(face, requested)
+        if match:
+            faces.setdefault(match, []).extend(selectors)
+    critical = [matching_face(face, requested) for selector in CRITICAL_SELECTORS
+                for face, selectors in declared.items() if selector in selectors]
+
+    print(f"🔤 {len(faces)}/{len(requested)} faces du lien Google Fonts affichées, "
+          f"{len(chars)} caractères, {len(pages)} pages")
+    for face in sorted(faces):
+        family, weight, style = face
+        mark = " ⚡" if face in critical else ""
+        print(f"   {family} {weight}{' italic' if style == 'italic' else ''}{mark} ← {', '.join(faces[face][:4])}")
+    for face in sorted(requested - set(faces)):
+        print(f"   ✂️  {face[0]} {face[1]}{' italic' if face[2] == 'italic' else ''} (inutilisée)")
+    print(f"🎨 {len(icons)} icône(s) Font Awesome : {', '.join(f'{s}/{n}' for s, n in sorted(icons)) or 'aucune'}")
+    if args.list:
+        return
+
+    # Hors ligne (et cache HTTP incomplet) : pages inchangées, liens Google Fonts et cdnjs conservés
+    try:
+        files = font_files(google_fonts_css(url), set(faces), chars)
+        original, written = write_fonts(files)
+        found = write_sprite(icons) if icons else set()
+    except requests.RequestException as e:
+        print(f"⚠️  Téléchargement impossible ({type(e).__name__}) : pages laissées sur Google Fonts et cdnjs, "
+              f"relancer 16_self_host_fonts.py une fois en ligne")
+        return
+    tool = "fontTools" if font_subset else "plages Unicode seules, installer fonttools + brotli pour réduire"
+    print(f"✅ {len(files)} polices WOFF2 → assets/fonts/ ({written / 1024:.1f} Ko, "
+          f"{original / 1024:.1f} Ko chez Google ; {tool})")
+
+    drop_icon_font = found == icons
+    if icons:
+        print(f"✅ Sprite assets/{SPRITE} ({len(found)}/{len(icons)} icônes)")
+    if not drop_icon_font:
+        print("⚠️  Feuille Font Awesome conservée (icônes manquantes dans le sprite)")
+
+    preloads = preloaded(files, critical)
+    changed = 0
+    for path in pages:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        new_text = rewrite_page(text, files, preloads, found, drop_icon_font)
+        if new_text != text:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(new_text)
+            changed += 1
+    print(f"   ⚡ preload : {', '.join(preloads)}")
+    print(f"   📄 {changed}/{len(pages)} pages réécrites")
+
+
+if __name__ == "__main__":
+    main()
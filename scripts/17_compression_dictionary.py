@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Étape 17 : Dictionnaire de compression partagé des pages ville.
+
+Les pages ville d'une langue sortent du même template et ne diffèrent que par
+quelques centaines d'octets : compressées une à une, elles répètent toutes le
+même squelette. Pour chaque langue, cette étape :
+- construit un dictionnaire brut à partir des pages rendues : les lignes
+  présentes dans au moins DICTIONARY_MIN_SHARE des pages, les plus fréquentes
+  d'abord jusqu'à DICTIONARY_MAX_BYTES, remises dans l'ordre des pages
+- si zstd est disponible (module zstandard, ou compression.zstd de Python
+  3.14), publie output/dictionaries/<langue>.<hash>.dict, le déclare dans
+  chaque page (<link rel="compression-dictionary">) et écrit à côté de chaque
+  page sa variante .html.dcz (Compression Dictionary Transport), plus les
+  en-têtes Use-As-Dictionary / Vary dans output/_headers
+- indique le gain de poids transféré par page ; sans zstd, le gain est estimé
+  avec zlib et un dictionnaire prédéfini (zdict), sans rien publier
+
+Le serveur doit choisir la variante .dcz quand la requête annonce le
+dictionnaire (Available-Dictionary) : _headers ne sait pas négocier seul.
+Brotli (dcb) n'est pas produit : le module Python brotli ne prend pas de
+dictionnaire personnalisé.
+
+À lancer après 10_fingerprint_assets.py, qui réécrit _headers et supprime
+les sorties de cette étape (périmées dès que les pages changent) ; relançable.
+
+Usage :
+    python scripts/17_compression_dictionary.py [--pages]
+"""
+
+import argparse
+import glob
+import hashlib
+import importlib
+import os
+import shutil
+import sys
+import zlib
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DICTIONARY_MAX_BYTES, DICTIONARY_MIN_SHARE, LOCALES, OUTPUT_DIR, ZSTD_LEVEL
+from scripts.i18n import locale_prefix
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+fingerprint = importlib.import_module("scripts.10_fingerprint_assets")
+
+DICTIONARY_DIR = fingerprint.DICTIONARY_DIR
+# En-tête d'une réponse dcz : trame zstd « skippable » contenant le SHA-256 du dictionnaire
+DCZ_HEADER = bytes([0x5E, 0x2A, 0x4D, 0x18, 0x20, 0x00, 0x00, 0x00])
+DICTIONARY_LINK = fingerprint.DICTIONARY_LINK
+HEADERS_MARKER = "# Dictionnaires de compression (17_compression_dictionary.py)"
+
+
+def train_dictionary(pages):
+    """
+    Dictionnaire brut d'un ensemble de pages : lignes présentes dans au moins
+    DICTIONARY_MIN_SHARE des pages, retenues par fréquence décroissante dans la
+    limite de DICTIONARY_MAX_BYTES, puis remises dans l'ordre d'apparition.
+    """
+    frequency = Counter()
+    order = {}
+    for html in pages:
+        lines = html.splitlines(keepends=True)
+        frequency.update(set(lines))
+        for line in lines:
+            order.setdefault(line, len(order))
+
+    threshold = DICTIONARY_MIN_SHARE * len(pages)
+    candidates = sorted((line for line, count in frequency.items() if count >= threshold and line.strip()),
+                        key=lambda line: (-frequency[line], order[line]))
+    chosen, size = [], 0
+    for line in candidates:
+        length = len(line.encode("utf-8"))
+        if size + length > DICTIONARY_MAX_BYTES:
+            continue
+        chosen.append(line)
+        size += length
+    return "".join(sorted(chosen, key=order.get)).encode("utf-8")
+
+
+def zstd_codec(dictionary):
+    """(compression seule, compression avec le dictionnaire brut), ou None sans zstd."""
+    if zstandard is not None:
+        raw = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        plain = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        shared = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=raw)
+        return plain.compress, shared.compress
+    if zstd is not None:
+        raw = zstd.ZstdDict(dictionary, is_raw=True)
+        return (lambda data: zstd.compress(data, ZSTD_LEVEL),
+                lambda data: zstd.compress(data, ZSTD_LEVEL, zstd_dict=raw))
+    return None
+
+
+def zlib_codec(dictionary):
+    """Repli pour l'estimation : deflate avec dictionnaire prédéfini (32 derniers Ko du dictionnaire)."""
+    def compress(data, zdict=None):
+        compressor = zlib.compressobj(9, zdict=zdict) if zdict else zlib.compressobj(9)
+        return compressor.compress(data) + compressor.flush()
+
+    return compress, lambda data: compress(data, dictionary)
+
+
+def write_headers(dictionaries):
+    """Ajoute à output/_headers (réécrit par l'étape 10) le bloc des dictionnaires publiés."""
+    path = fingerprint.HEADERS_PATH
+    content = ""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read().split(HEADERS_MARKER)[0].rstrip("\n")
+
+    lines = []
+    for name, match in dictionaries:
+        lines += [f"/{DICTIONARY_DIR}/{name}",
+                  f"  Cache-Control: {fingerprint.CACHE_IMMUTABLE}",
+                  f'  Use-As-Dictionary: match="{match}", id="{name}"', ""]
+        lines += [match, "  Vary: Accept-Encoding, Available-Dictionary", ""]
+
+    if lines:
+        content = "\n".join([content, "", HEADERS_MARKER, *lines]) if content else "\n".join([HEADERS_MARKER, *lines])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content + ("" if content.endswith("\n") else "\n"))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dictionnaire de compression partagé des pages ville")
+    parser.add_argument("--pages", action="store_true", help="détail du gain pour chaque page")
+    args = parser.parse_args()
+
+    dictionary_dir = os.path.join(OUTPUT_DIR, DICTIONARY_DIR)
+    if os.path.isdir(dictionary_dir):
+        shutil.rmtree(dictionary_dir)
+    publish = zstandard is not None or zstd is not None
+    if publish:
+        os.makedirs(dictionary_dir)
+    else:
+        print("⚠️  zstd indisponible (pip install zstandard) : estimation zlib seulement, rien n'est publié")
+
+    published = []
+    for locale in LOCALES:
+        paths = sorted(glob.glob(os.path.join(OUTPUT_DIR, locale_prefix(locale), "citta", "*.html")))
+        if not paths:
+            continue
+        pages = {}
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages[path] = f.read()
+
+        dictionary = train_dictionary([DICTIONARY_LINK.sub("", html) for html in pages.values()])
+        digest = hashlib.sha256(dictionary).digest()
+        name = f"{locale}.{digest.hex()[:fingerprint.HASH_LENGTH]}.dict"
+        plain, shared = zstd_codec(dictionary) or zlib_codec(dictionary)
+
+        if publish:
+            with open(os.path.join(dictionary_dir, name), "wb") as f:
+                f.write(dictionary)
+            published.append((name, f"/{locale_prefix(locale)}citta/*"))
+
+        rows = []
+        for path, html in pages.items():
+            new_html = DICTIONARY_LINK.sub("", html)
+            if publish:
+                href = os.path.relpath(os.path.join(dictionary_dir, name), os.path.dirname(path)).replace(os.sep, "/")
+                new_html = new_html.replace(
+                    "</head>", f'    <link rel="compression-dictionary" href="{href}">\n</head>', 1)
+            if new_html != html:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(new_html)
+
+            data = new_html.encode("utf-8")
+            alone, together = len(plain(data)), len(shared(data))
+            if publish:
+                variant = DCZ_HEADER + digest + shared(data)
+                together = len(variant)
+                with open(path + ".dcz", "wb") as f:
+                    f.write(variant)
+            elif os.path.exists(path + ".dcz"):
+                os.remove(path + ".dcz")
+            rows.append((os.path.relpath(path, OUTPUT_DIR), len(data), alone, together))
+
+        saved = [1 - together / alone for _, _, alone, together in rows]
+        codec = "zstd" if publish else "zlib (estimation)"
+        print(f"🗜️  [{locale}] {len(rows)} pages, dictionnaire {len(dictionary) / 1024:.1f} Ko ({codec})")
+        print(f"   par page : {sum(r[2] for r in rows) / len(rows) / 1024:.1f} Ko seule → "
+              f"{sum(r[3] for r in rows) / len(rows) / 1024:.1f} Ko avec dictionnaire, gain médian "
+              f"{percentile(saved, 0.5):.0%} (p10 {percentile(saved, 0.1):.0%}, p90 {percentile(saved, 0.9):.0%})")
+        if args.pages:
+            for rel, size, alone, together in rows:
+                print(f"   {rel:<45} {size:>7} o → {alone:>6} o seule, {together:>6} o "
+                      f"({1 - together / alone:.0%} de moins)")
+
+    if publish:
+        write_headers(published)
+        print(f"✅ {len(published)} dictionnaire(s) dans {dictionary_dir}/, variantes .html.dcz et _headers")
+
+
+if __name__ == "__main__":
+    main()
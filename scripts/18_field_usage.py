@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Étape 18 : Champs d'enrichissement réellement affichés.
+
+Analyse statique (scripts/field_usage.py) des templates Jinja et du code de
+rendu (03_generate_html.py et ses modules) :
+- pour chaque champ d'enrichissement de City : où il est lu, et quelle
+  étape / fonction le récupère
+- les requêtes dont aucun champ n'est lu, et le nombre d'appels API évités
+  par run complet ; rossini et 02_fetch_enrichment.py les sautent
+  (SKIP_UNUSED_ENRICHMENT, ROSSINI_ALL_FIELDS=1 pour les relancer)
+- les champs non lus mais récupérés dans la même requête qu'un champ lu :
+  rien à économiser, à retirer de la requête si le template ne doit pas
+  les afficher
+
+Ne fait aucune requête ; à relancer après chaque modification de template.
+
+Usage :
+    python scripts/18_field_usage.py [--where]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import SKIP_UNUSED_ENRICHMENT
+from scripts.city_model import ENRICHMENT_FIELDS, load_cities
+from scripts.field_usage import code_fields, enrichment_steps, template_fields, unused_stage_fields, unused_steps
+from scripts.sites import get_site
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Champs d'enrichissement lus par le site")
+    parser.add_argument("--where", action="store_true", help="toutes les lectures de chaque champ")
+    args = parser.parse_args()
+
+    templates, code = template_fields(), code_fields()
+    steps = enrichment_steps()
+    producers = {}
+    for command, command_steps in steps.items():
+        for step, fields in command_steps.items():
+            for field in fields:
+                producers.setdefault(field, []).append(f"{command}/{step}")
+
+    print(f"🔎 {len(ENRICHMENT_FIELDS)} champs d'enrichissement, lus par les templates ou le code de rendu :\n")
+    width = max(len(field) for field in ENRICHMENT_FIELDS)
+    for field in ENRICHMENT_FIELDS:
+        reads = templates.get(field, []) + code.get(field, [])
+        source = ", ".join(producers.get(field, [])) or "aucune étape"
+        if reads:
+            shown = reads if args.where else reads[:2]
+            more = f" (+{len(reads) - len(shown)})" if len(reads) > len(shown) else ""
+            print(f"   ✅ {field:<{width}}  ← {source:<44} lu : {', '.join(shown)}{more}")
+        else:
+            print(f"   ❌ {field:<{width}}  ← {source:<44} jamais lu")
+
+    input_path = get_site().input_path()
+    count = len(load_cities(input_path)) if input_path else 0
+    skippable = {command: unused_steps(command) for command in steps}
+    print("\n⏭️  Requêtes sans champ lu" + (f" ({count} villes) :" if count else " :"))
+    saved = 0
+    for command, unused in skippable.items():
+        if unused_stage_fields(command):
+            print(f"   {command} : étape entière")
+        elif unused:
+            print(f"   {command} : {', '.join(sorted(unused))}")
+        saved += len(unused) * count
+    if not any(skippable.values()):
+        print("   aucune")
+    elif count:
+        print(f"   ≈ {saved} appels API évités par run complet (une requête par ville et par fonction)")
+
+    bundled = []
+    for command, command_steps in steps.items():
+        for step, fields in command_steps.items():
+            unread = sorted(field for field in fields if field not in templates and field not in code)
+            if unread and step not in skippable[command]:
+                bundled.append(f"{', '.join(unread)} ({command}/{step})")
+    if bundled:
+        print("\n📦 Non lus, mais dans la même requête qu'un champ lu (rien à gagner) :")
+        for line in bundled:
+            print(f"   {line}")
+
+    if SKIP_UNUSED_ENRICHMENT:
+        print("\n✅ rossini et 02_fetch_enrichment.py sautent ces requêtes (ROSSINI_ALL_FIELDS=1 pour les relancer)")
+    else:
+        print("\n⚠️  ROSSINI_ALL_FIELDS=1 : toutes les requêtes sont lancées")
+
+
+if __name__ == "__main__":
+    main()
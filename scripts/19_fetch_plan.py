@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Étape 19 : Plan des requêtes d'enrichissement, sans réseau (dry-run).
+
+Avant de lancer les étapes enrich* sur un nouveau jeu de villes, inspecte
+les données et le cache HTTP local pour chaque étape :
+- les requêtes exactes qu'elle ferait (mêmes sélections de villes et mêmes
+  URLs / paramètres que les scripts, clés du cache HTTP comprises), par API
+- celles déjà en cache, y compris grâce à une étape précédente du plan
+  (02 et 05 lisent le même résumé Wikipedia)
+- la durée estimée : latence médiane mesurée par API (durées enregistrées
+  dans le cache HTTP, sinon DEFAULT_LATENCY_S), pauses des scripts après
+  chaque requête réseau et rythme AIMD de RATE_LIMITS pour Overpass,
+  simulés sans attendre
+- ce que feraient gagner les requêtes par lots (APIs de BATCH_SIZES)
+
+Les étapes et fonctions sautées par field_usage (SKIP_UNUSED_ENRICHMENT)
+sont exclues. Les villes sont lues dans l'état actuel des données : une
+étape qui dépend d'une précédente (05 après 02) est estimée comme si elle
+était lancée maintenant.
+
+Usage :
+    python scripts/19_fetch_plan.py [--only=enrich,enrich-industrial] [--list]
+"""
+
+import argparse
+import importlib
+import math
+import os
+import statistics
+import sys
+from collections import defaultdict, namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts import http_cache
+from scripts.config import DATA_DIR, DEFAULT_LATENCY_S, RATE_LIMITS, SKIP_UNUSED_ENRICHMENT
+from scripts.city_model import load_cities
+from scripts.field_usage import unused_stage_fields, unused_steps
+from scripts.overpass import OVERPASS_URL, poi_count_query
+from scripts.rate_limit import AdaptiveRateLimiter
+from scripts.rossini import COMMANDS
+from scripts.sites import get_site, reuse_enrichment
+
+enrich = importlib.import_module("scripts.02_fetch_enrichment")
+remaining_pois = importlib.import_module("scripts.02b_enrich_remaining_pois")
+images = importlib.import_module("scripts.05_fetch_images")
+solar = importlib.import_module("scripts.06_fetch_solar")
+industrial = importlib.import_module("scripts.07_fetch_industrial")
+airquality = importlib.import_module("scripts.08_fetch_airquality")
+
+# Requêtes par lot possibles, par hôte : (villes par requête, comment)
+BATCH_SIZES = {
+    "query.wikidata.org": (50, "SPARQL VALUES ?item"),
+    "it.wikipedia.org": (20, "action=query&prop=extracts|pageimages, 20 titres"),
+    "climate-api.open-meteo.com": (50, "latitude/longitude en listes"),
+    "air-quality-api.open-meteo.com": (50, "latitude/longitude en listes"),
+}
+
+# Une requête prévue ; cacheable : passe par le cache HTTP ; pause : attendue
+# après la requête si elle part sur le réseau ; limiter : nom dans RATE_LIMITS ou None
+Fetch = namedtuple("Fetch", "host city method url params data cacheable pause limiter")
+
+
+def host_of(url):
+    return url.split("/")[2]
+
+
+def get(url, city, params=None, pause=0.0, cacheable=True):
+    return Fetch(host_of(url), city, "GET", url, params, None, cacheable, pause, None)
+
+
+def overpass(city, query, cacheable):
+    return Fetch(host_of(OVERPASS_URL), city, "POST", OVERPASS_URL, None, {"data": query}, cacheable, 0.0, "overpass")
+
+
+def plan_enrich(cities, site):
+    """02_fetch_enrichment.py : toutes les villes de la liste brute, sauf celles reprises d'un autre site."""
+    reused = reuse_enrichment(cities, site)
+    skipped = unused_steps("enrich") if SKIP_UNUSED_ENRICHMENT else set()
+    for city in cities:
+        if city.slug in reused and city.climate:
+            continue
+        if "enrich_wikidata" not in skipped and city.wikidata_id:
+            yield get(enrich.WIKIDATA_URL, city, enrich.wikidata_params(city.wikidata_id), enrich.WIKIDATA_PAUSE_S)
+        if "get_wikipedia_extract" not in skipped:
+            yield get(enrich.wikipedia_summary_url(city.name), city, pause=enrich.WIKIPEDIA_PAUSE_S)
+        has_coords = city.latitude and city.longitude
+        if "enrich_climate" not in skipped and has_coords:
+            yield get(enrich.CLIMATE_URL, city, enrich.climate_params(city.latitude, city.longitude),
+                      enrich.CLIMATE_PAUSE_S)
+        if not city.pois and "enrich_pois" not in skipped and has_coords:
+            yield overpass(city, poi_count_query(city.latitude, city.longitude), True)
+
+
+def plan_pois(cities, site):
+    for city in cities:
+        if remaining_pois.needs_pois(city) and city.latitude and city.longitude:
+            yield overpass(city, poi_count_query(city.latitude, city.longitude), True)
+
+
+def plan_images(cities, site):
+    for city in cities:
+        if images.needs_image(city):
+            yield get(images.wikipedia_summary_url(city.name), city, pause=images.PAUSE_S)
+
+
+def plan_solar(cities, site):
+    for city in cities:
+        if not (solar.needs_solar(city) and city.latitude and city.longitude):
+            continue
+        if not city.solar:
+            yield get(solar.PVCALC_URL, city, solar.pvcalc_params(city.latitude, city.longitude), solar.PAUSE_S)
+        yield get(solar.MRCALC_URL, city, solar.mrcalc_params(city.latitude, city.longitude), solar.PAUSE_S)
+
+
+def plan_industrial(cities, site):
+    """Réponses lues en streaming : jamais en cache."""
+    for city in cities:
+        if industrial.needs_industry(city) and city.latitude and city.longitude:
+            yield overpass(city, industrial.industrial_query(city.latitude, city.longitude), False)
+
+
+def plan_airquality(cities, site):
+    """Données live : jamais en cache."""
+    for city in cities:
+        if airquality.needs_air_quality(city) and city.latitude and city.longitude:
+            yield get(airquality.AIR_QUALITY_URL, city, airquality.air_quality_params(city.latitude, city.longitude),
+                      airquality.PAUSE_S, cacheable=False)
+
+
+# Commande rossini → (planificateur, lit la liste brute plutôt que le fichier enrichi)
+PLANNERS = {
+    "enrich": (plan_enrich, True),
+    "enrich-pois": (plan_pois, False),
+    "enrich-images": (plan_images, False),
+    "enrich-solar": (plan_solar, False),
+    "enrich-industrial": (plan_industrial, False),
+    "enrich-airquality": (plan_airquality, False),
+}
+
+
+def measured_latencies():
+    """{hôte: (latence médiane, nombre de mesures)} depuis le cache HTTP."""
+    return {host: (statistics.median(values), len(values)) for host, values in http_cache.latencies().items()}
+
+
+def new_limiter(name):
+    params = dict(RATE_LIMITS[name])
+    params.pop("status_url", None)
+    return AdaptiveRateLimiter(name, **params)
+
+
+def simulate(fetches, latency, planned, ramp=True):
+    """
+    Déroule le plan sans réseau. Retourne ({hôte: statistiques}, requêtes
+    réseau) ; statistiques : requêtes, en cache, déjà prévues par une étape
+    précédente, réseau et durée (s).
+    `planned` : clés déjà prévues (complété au passage). Sans `ramp`, les
+    limiteurs restent à leur intervalle initial.
+    """
+    stats = defaultdict(lambda: defaultdict(float))
+    network = []
+    limiters, next_slot = {}, defaultdict(float)
+    clock = 0.0
+    for fetch in fetches:
+        start = clock
+        host = stats[fetch.host]
+        host["requests"] += 1
+        key = http_cache.cache_key(fetch.method, fetch.url, fetch.params, fetch.data)
+        if fetch.cacheable and key in planned:
+            host["shared"] += 1
+            cached = True
+        else:
+            cached = fetch.cacheable and http_cache.is_cached(key)
+        if fetch.cacheable:
+            planned.add(key)
+
+        if cached:
+            host["cached"] += 1
+        else:
+            host["network"] += 1
+            network.append(fetch)
+            if fetch.limiter:
+                # Même espacement que AdaptiveRateLimiter.wait(), débit AIMD sans surcharge
+                limiter = limiters.setdefault(fetch.limiter, new_limiter(fetch.limiter))
+                clock = max(clock, next_slot[fetch.limiter])
+                next_slot[fetch.limiter] = clock + limiter.interval
+                if ramp:
+                    limiter.on_success()
+            # Pause de politesse : seulement après une vraie requête (http_cache.fetch)
+            clock += latency(fetch.host) + fetch.pause
+        host["time"] += clock - start
+    return stats, network
+
+
+def format_duration(seconds):
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+    if seconds >= 60:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds} s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requêtes d'enrichissement en attente et durée estimée (sans réseau)")
+    parser.add_argument("--only", help="étapes à planifier, séparées par des virgules (ex: --only=enrich-industrial)")
+    parser.add_argument("--list", action="store_true", help="liste chaque requête réseau prévue")
+    args = parser.parse_args()
+
+    stages = [name for name in COMMANDS if name in PLANNERS]
+    if args.only:
+        unknown = set(args.only.split(",")) - set(PLANNERS)
+        if unknown:
+            print(f"❌ Étape(s) inconnue(s) : {', '.join(sorted(unknown))} (choix : {', '.join(PLANNERS)})")
+            sys.exit(2)
+        stages = [name for name in stages if name in args.only.split(",")]
+
+    site = get_site()
+    measured = measured_latencies()
+
+    def latency(host):
+        return measured[host][0] if host in measured else DEFAULT_LATENCY_S
+
+    print(f"🧮 Plan des requêtes d'enrichissement, site {site.key} (aucune requête envoyée)")
+
+    planned, totals = set(), defaultdict(lambda: defaultdict(float))
+    for name in stages:
+        planner, raw = PLANNERS[name]
+        module = COMMANDS[name][0].split(".")[-1]
+        if SKIP_UNUSED_ENRICHMENT and unused_stage_fields(name):
+            print(f"\n⏭️  {name} ({module}.py) : sautée, aucun champ lu par les pages")
+            continue
+
+        path = site.cities_path if raw else site.enriched_path
+        note = ""
+        if not os.path.exists(path):
+            path = site.input_path()
+            note = " — liste des villes lue dans " + (path or "aucun fichier")
+        if path is None:
+            print(f"\n❌ {name} ({module}.py) : aucun fichier de données dans {DATA_DIR}/")
+            continue
+
+        fetches = list(planner(load_cities(path), site))
+        slowest, _ = simulate(fetches, latency, set(planned), ramp=False)
+        stats, network = simulate(fetches, latency, planned)
+        cities = len({fetch.city.slug for fetch in fetches})
+        print(f"\n▶️  {name} ({module}.py) : {cities} villes à interroger{note}")
+        if not any(host["requests"] for host in stats.values()):
+            print("   ✅ rien à récupérer")
+            continue
+
+        print(f"   {'API':<32} {'requêtes':>8} {'en cache':>8} {'réseau':>7} {'durée':>13}")
+        for host, values in stats.items():
+            if values["requests"]:
+                print(f"   {host:<32} {values['requests']:>8.0f} {values['cached']:>8.0f} "
+                      f"{values['network']:>7.0f} {format_duration(values['time']):>13}")
+            for field, value in values.items():
+                totals[host][field] += value
+        estimate = sum(values["time"] for values in stats.values())
+        bound = sum(values["time"] for values in slowest.values())
+        if bound - estimate >= 1:
+            limited = ", ".join(sorted({fetch.limiter for fetch in network if fetch.limiter}))
+            print(f"   ⏱️  ≈ {format_duration(estimate)} au débit AIMD sans surcharge, "
+                  f"{format_duration(bound)} à l'intervalle initial ({limited})")
+        else:
+            print(f"   ⏱️  ≈ {format_duration(estimate)}")
+
+        if args.list:
+            for fetch in network:
+                print(f"   [{fetch.host}] {fetch.city.name} : {fetch.method} {fetch.url}")
+
+    if not totals:
+        return
+
+    print(f"\n📊 Total par API :")
+    print(f"   {'API':<32} {'réseau':>7} {'latence':>15} {'durée':>13}")
+    for host, values in sorted(totals.items(), key=lambda item: -item[1]["time"]):
+        if not values["requests"]:
+            continue
+        source = f"{latency(host):.2f} s " + (f"({measured[host][1]} mes.)" if host in measured else "(défaut)")
+        print(f"   {host:<32} {values['network']:>7.0f} {source:>15} {format_duration(values['time']):>13}")
+    total = sum(values["time"] for values in totals.values())
+    print(f"   ⏱️  Durée totale estimée : {format_duration(total)}")
+
+    print("\n💡 Économies possibles :")
+    saved_any = False
+    shared = sum(values["shared"] for values in totals.values())
+    if shared:
+        saved_any = True
+        print(f"   ♻️  {shared:.0f} requêtes déjà faites par une étape précédente du plan (même URL, lue en cache)")
+    for host, (size, how) in BATCH_SIZES.items():
+        network = totals.get(host, {}).get("network", 0)
+        batches = math.ceil(network / size)
+        if network > batches:
+            saved_any = True
+            seconds = (network - batches) * latency(host)
+            print(f"   📦 {host} par lots de {size} ({how}) : {batches} requête{'s' if batches > 1 else ''} au lieu de "
+                  f"{network:.0f}, ≈ {format_duration(seconds)} de latence en moins (hors pauses)")
+    if not saved_any:
+        print("   aucune")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Date de build reproductible : deux builds des mêmes sources produisent les
+mêmes fichiers, quel que soit le jour où ils sont lancés (© {{ year }},
+<lastmod> du sitemap).
+
+Ordre de priorité :
+1. SOURCE_DATE_EPOCH (convention https://reproducible-builds.org)
+2. date du dernier commit git touchant les sources (data/, templates/, scripts/)
+   — les commits de output/ seul ne la font pas bouger
+3. date de modification la plus récente des données et templates
+"""
+
+import functools
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DATA_DIR, TEMPLATES_DIR
+
+SOURCE_DIRS = (DATA_DIR, TEMPLATES_DIR, "scripts")
+
+
+def _git_epoch():
+    try:
+        out = subprocess.run(
+            ["git", "log", "-1", "--format=%ct", "--", *SOURCE_DIRS],
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return int(out) if out.isdigit() else None
+
+
+def _mtime_epoch():
+    latest = 0
+    for root in (DATA_DIR, TEMPLATES_DIR):
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                latest = max(latest, os.path.getmtime(os.path.join(dirpath, name)))
+    return int(latest)
+
+
+@functools.lru_cache(maxsize=None)
+def build_epoch():
+    env = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if env.isdigit():
+        return int(env)
+    epoch = _git_epoch()
+    if epoch is None:
+        epoch = _mtime_epoch()
+    return epoch
+
+
+def build_date():
+    return datetime.fromtimestamp(build_epoch(), timezone.utc)
+
+
+def build_year():
+    return build_date().year
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Génère plusieurs sites régionaux (config.SITES) en un seul lancement.
+
+- Enrichissement partagé : les comuni communs à plusieurs sites reprennent
+  les blocs déjà récupérés par un autre site (sites.share_enrichment)
+- Templates compilés une fois : environnement Jinja2 par processus et
+  bytecode dans .cache/jinja/, relu par tous les workers et tous les sites
+- Rendu concurrent : une tâche par (site, langue) dans un même pool
+
+Chaque site est écrit dans son propre dossier (sitemap, robots.txt, assets,
+fragments live, CNAME). La récupération des données reste site par site :
+    ROSSINI_SITE=piemonte python scripts/01_fetch_cities.py
+    ROSSINI_SITE=piemonte python scripts/02_fetch_enrichment.py
+les réponses API passant par le cache HTTP partagé (.cache/http/).
+
+Usage :
+    python scripts/build_sites.py                 # tous les sites avec des données
+    python scripts/build_sites.py piemonte veneto
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.build_info import build_year
+from scripts.config import LOCALES, SITES
+from scripts.sites import get_site, share_enrichment
+
+generate = importlib.import_module("scripts.03_generate_html")
+sitemap = importlib.import_module("scripts.04_generate_sitemap")
+
+
+def write_cname(site):
+    """CNAME GitHub Pages du site (nom d'hôte du domaine)."""
+    with open(os.path.join(site.output_dir, "CNAME"), "w") as f:
+        f.write(urlparse(site.domain).hostname + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère plusieurs sites régionaux en parallèle")
+    parser.add_argument("sites", nargs="*", metavar="SITE",
+                        help=f"sites à générer parmi {', '.join(SITES)} (défaut : tous)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processus de rendu (défaut : nombre de CPU)")
+    args = parser.parse_args()
+
+    unknown = sorted(set(args.sites) - set(SITES))
+    if unknown:
+        parser.error(f"site(s) inconnu(s) : {', '.join(unknown)}")
+
+    sites = []
+    for key in args.sites or SITES:
+        site = get_site(key)
+        if site.input_path() is None:
+            print(f"⏭️  {key} : aucune donnée ({site.cities_file}). "
+                  f"Lance ROSSINI_SITE={key} python scripts/01_fetch_cities.py")
+            continue
+        sites.append(site)
+
+    if not sites:
+        print("❌ Aucun site à générer.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+
+    # === Enrichissement partagé entre sites (communes frontalières) ===
+    for key, count in share_enrichment(sites).items():
+        print(f"♻️ {key} : {count} villes complétées depuis un autre site")
+
+    year = build_year()
+
+    # === Calculs par ville, communs à toutes les langues d'un site ===
+    prepared = {site.key: generate.prepare_site(site) for site in sites}
+
+    pages = sum(len(cities) for cities, _, _ in prepared.values())
+    print(f"🏗️ Génération de {len(sites)} sites ({pages} villes) × {len(LOCALES)} langues...\n")
+
+    # === Rendu : une tâche par (site, langue) dans un pool commun ===
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {}
+        for site in sites:
+            cities, views, provinces = prepared[site.key]
+            for locale in LOCALES:
+                futures[site.key, locale] = pool.submit(
+                    generate.render_locale, locale, views, cities, provinces, year, site
+                )
+
+        for site in sites:
+            cities, _, _ = prepared[site.key]
+            counts = [futures[site.key, locale].result() for locale in LOCALES]
+
+            # === Fichiers du site : robots.txt, assets, live, sitemap, CNAME ===
+            generate.write_site_files(site, cities)
+            _, urls = sitemap.write_sitemap(cities, site)
+            write_cname(site)
+
+            print(f"  ✅ {site.key} → {site.output_dir}/ "
+                  f"({sum(counts)} pages, {urls} URLs dans le sitemap)")
+
+    print(f"\n🎉 {len(sites)} sites générés en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
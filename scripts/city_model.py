@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Modèle typé des villes : records à slots pour la ville et ses blocs
+d'enrichissement (pois, solar, industry, air_quality, climate).
+
+Les données sont validées une seule fois au chargement ; une erreur de
+type ou un champ inconnu lève CityDataError avec le chemin exact du champ
+au lieu d'exploser plus tard dans un template.
+
+Deux formats sur disque :
+- <nom>.json          : export lisible (indent=2), versionné dans git
+- <nom>.compact.json  : sérialisation compacte (orjson si disponible),
+                        relue en priorité quand elle est à jour
+"""
+
+import json
+import os
+import typing
+from dataclasses import dataclass, field, fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class CityDataError(ValueError):
+    """Donnée ville invalide (type incorrect, champ manquant ou inconnu)."""
+
+
+class _Record:
+    """Conversion dict ↔ record validée, commune à la ville et à ses blocs."""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        return _from_dict(cls, data, cls.__name__.lower())
+
+    def to_dict(self):
+        return _to_dict(self)
+
+
+@dataclass(slots=True)
+class Pois(_Record):
+    parking_count: int = 0
+    ev_charging_stations: int = 0
+    # Absents des villes comptées avant la requête unique (overpass.count_pois)
+    fuel_stations: typing.Optional[int] = None
+    supermarkets: typing.Optional[int] = None
+    malls: typing.Optional[int] = None
+
+
+@dataclass(slots=True)
+class Solar(_Record):
+    annual_production_kwh: float = 0.0
+    monthly_production: list[float] = field(default_factory=list)
+    irradiation_kwh_m2: float = 0.0
+    optimal_angle: int = 15
+    # Moyennes mensuelles PVGIS MRcalc, entrées du modèle local (scripts/pv_model.py)
+    monthly_horizontal_kwh_m2: typing.Optional[list[float]] = None
+    monthly_diffuse_ratio: typing.Optional[list[float]] = None
+    monthly_temp_c: typing.Optional[list[float]] = None
+
+
+@dataclass(slots=True)
+class Industry(_Record):
+    industrial_zones_count: int = 0
+    industrial_area_hectares: float = 0.0
+    surface_parking_count: int = 0
+    private_parking_count: int = 0
+    commercial_zones_count: int = 0
+    malls_count: int = 0
+
+
+@dataclass(slots=True)
+class AirQuality(_Record):
+    european_aqi: int
+    pm10: float
+    pm2_5: float
+    nitrogen_dioxide: float
+    quality_label: str
+
+
+@dataclass(slots=True)
+class Climate(_Record):
+    temp_avg_annual: float
+    temp_min_month: float
+    temp_max_month: float
+    precipitation_annual_mm: typing.Optional[float] = None
+
+
+# Champs toujours écrits (même vides), dans l'ordre de 01_fetch_cities.py
+CORE_FIELDS = (
+    "name", "slug", "population", "latitude", "longitude", "province",
+    "postal_code", "area_km2", "wikidata_id", "region", "country",
+)
+
+
+# Blocs remplis par les étapes 02 → 08 (chacune saute les villes déjà servies)
+ENRICHMENT_FIELDS = (
+    "description_it", "image_url", "official_website", "altitude_m",
+    "wikipedia_extract", "climate", "pois", "solar", "air_quality", "industry",
+)
+
+
+@dataclass(slots=True)
+class City(_Record):
+    name: str
+    slug: str
+    population: int
+    latitude: typing.Optional[float] = None
+    longitude: typing.Optional[float] = None
+    province: str = ""
+    postal_code: str = ""
+    area_km2: typing.Optional[float] = None
+    wikidata_id: typing.Optional[str] = None
+    geonames_id: typing.Optional[int] = None
+    istat_code: typing.Optional[str] = None
+    region: str = "Lombardia"
+    country: str = "IT"
+
+    # Enrichissement (02 → 08), absents du JSON tant que non récupérés
+    description_it: typing.Optional[str] = None
+    image_url: typing.Optional[str] = None
+    official_website: typing.Optional[str] = None
+    altitude_m: typing.Optional[float] = None
+    wikipedia_extract: typing.Optional[str] = None
+    climate: typing.Optional[Climate] = None
+    pois: typing.Optional[Pois] = None
+    solar: typing.Optional[Solar] = None
+    air_quality: typing.Optional[AirQuality] = None
+    industry: typing.Optional[Industry] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return _from_dict(cls, data, data.get("slug") or data.get("name") or "?")
+
+
+# === Validation ===
+
+_HINTS = {}
+
+
+def _hints(cls):
+    if cls not in _HINTS:
+        _HINTS[cls] = typing.get_type_hints(cls)
+    return _HINTS[cls]
+
+
+def _coerce(value, hint, path):
+    """Vérifie (et convertit int → float) une valeur selon son annotation."""
+    origin = typing.get_origin(hint)
+
+    if origin is typing.Union:
+        if value is None:
+            return None
+        inner = [a for a in typing.get_args(hint) if a is not type(None)][0]
+        return _coerce(value, inner, path)
+
+    if origin is list:
+        if not isinstance(value, list):
+            raise CityDataError(f"{path}: liste attendue, reçu {type(value).__name__}")
+        item_hint = typing.get_args(hint)[0]
+        return [_coerce(v, item_hint, f"{path}[{i}]") for i, v in enumerate(value)]
+
+    if hint is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CityDataError(f"{path}: nombre attendu, reçu {value!r}")
+        return float(value)
+
+    if hint is int:
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise CityDataError(f"{path}: entier attendu, reçu {value!r}")
+        return value
+
+    if hint is str:
+        if not isinstance(value, str):
+            raise CityDataError(f"{path}: texte attendu, reçu {value!r}")
+        return value
+
+    if isinstance(hint, type) and hasattr(hint, "__dataclass_fields__"):
+        if not isinstance(value, dict):
+            raise CityDataError(f"{path}: objet attendu, reçu {type(value).__name__}")
+        return _from_dict(hint, value, path)
+
+    return value
+
+
+def _from_dict(cls, data, path):
+    hints = _hints(cls)
+    unknown = set(data) - set(hints)
+    if unknown:
+        raise CityDataError(f"{path}: champ(s) inconnu(s) {sorted(unknown)}")
+
+    kwargs = {}
+    for f in fields(cls):
+        if f.name in data:
+            kwargs[f.name] = _coerce(data[f.name], hints[f.name], f"{path}.{f.name}")
+    try:
+        return cls(**kwargs)
+    except TypeError as e:
+        raise CityDataError(f"{path}: {e}") from None
+
+
+def _to_dict(obj):
+    out = {}
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        if value is None and f.name not in CORE_FIELDS:
+            continue
+        if hasattr(value, "__dataclass_fields__"):
+            value = _to_dict(value)
+        out[f.name] = value
+    return out
+
+
+# === Chargement / sauvegarde ===
+
+def compact_path(path):
+    """Chemin du fichier compact associé à un export JSON."""
+    root, _ = os.path.splitext(path)
+    return root + ".compact.json"
+
+
+def _loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def load_cities(path):
+    """
+    Charge et valide une liste de villes.
+    Le fichier compact est préféré s'il est plus récent que l'export lisible.
+    """
+    fast = compact_path(path)
+    source = path
+    if os.path.exists(fast) and (
+        not os.path.exists(path) or os.path.getmtime(fast) >= os.path.getmtime(path)
+    ):
+        source = fast
+
+    with open(source, "rb") as f:
+        raw = _loads(f.read())
+
+    if not isinstance(raw, list):
+        raise CityDataError(f"{source}: liste de villes attendue")
+    return [City.from_dict(c) for c in raw]
+
+
+def dump_compact(cities):
+    """Sérialisation compacte (bytes) de la liste de villes."""
+    if orjson:
+        # orjson sérialise nativement les dataclasses à slots
+        return orjson.dumps(cities)
+    rows = [c.to_dict() for c in cities]
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def save_cities(cities, path, compact=True):
+    """Écrit l'export lisible et, par défaut, sa version compacte."""
+    rows = [c.to_dict() for c in cities]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+
+    if compact:
+        with open(compact_path(path), "wb") as f:
+            f.write(dump_compact(cities))
@@ -1,7 +1,81 @@
 # === Configuration ===
 
-# Domaine de production (modifier pour le déploiement)
-DOMAIN = "https://lombardia.rossinienergy.it"
+import os
+
+# Sites régionaux : même pipeline, un domaine et un dossier de sortie par région.
+# Le site actif des étapes 01 → 12 est choisi par ROSSINI_SITE (défaut : DEFAULT_SITE) ;
+# scripts/build_sites.py génère plusieurs sites en un seul lancement.
+SITES = {
+    "lombardia": {
+        "region": "Lombardia",
+        "wikidata_region": "Q1210",  # QID de la région (repli SPARQL de l'étape 1)
+        "domain": "https://lombardia.rossinienergy.it",
+        "output_dir": "output",
+        "cities_file": "cities_lombardia.json",
+        "enriched_file": "cities_enriched.json",
+        "capoluoghi": [
+            "Milano", "Brescia", "Bergamo", "Como", "Cremona", "Lecco",
+            "Lodi", "Mantova", "Monza", "Pavia", "Sondrio", "Varese"
+        ],
+        # Lac de Garde, Lac de Côme
+        "tourist_cities": [
+            "Desenzano del Garda", "Salò", "Lonato del Garda",
+            "Sirmione", "Limone sul Garda", "Gardone Riviera",
+            "Bellagio", "Menaggio", "Varenna", "Tremezzina"
+        ],
+    },
+    "piemonte": {
+        "region": "Piemonte",
+        "wikidata_region": "Q1216",
+        "domain": "https://piemonte.rossinienergy.it",
+        "output_dir": "sites/piemonte",
+        "cities_file": "cities_piemonte.json",
+        "enriched_file": "cities_piemonte_enriched.json",
+        "capoluoghi": [
+            "Torino", "Alessandria", "Asti", "Biella", "Cuneo",
+            "Novara", "Verbania", "Vercelli"
+        ],
+        # Lac Majeur, Langhe
+        "tourist_cities": ["Stresa", "Cannobio", "Arona", "Alba"],
+    },
+    "veneto": {
+        "region": "Veneto",
+        "wikidata_region": "Q1243",
+        "domain": "https://veneto.rossinienergy.it",
+        "output_dir": "sites/veneto",
+        "cities_file": "cities_veneto.json",
+        "enriched_file": "cities_veneto_enriched.json",
+        "capoluoghi": [
+            "Venezia", "Belluno", "Padova", "Rovigo", "Treviso", "Verona", "Vicenza"
+        ],
+        # Littoral, Dolomites, rive véronaise du Lac de Garde
+        "tourist_cities": [
+            "Jesolo", "Caorle", "San Michele al Tagliamento", "Cavallino-Treporti",
+            "Cortina d'Ampezzo", "Bardolino", "Lazise", "Peschiera del Garda"
+        ],
+    },
+    "emilia-romagna": {
+        "region": "Emilia-Romagna",
+        "wikidata_region": "Q1263",
+        "domain": "https://emilia-romagna.rossinienergy.it",
+        "output_dir": "sites/emilia-romagna",
+        "cities_file": "cities_emilia-romagna.json",
+        "enriched_file": "cities_emilia-romagna_enriched.json",
+        "capoluoghi": [
+            "Bologna", "Ferrara", "Forlì", "Cesena", "Modena", "Parma",
+            "Piacenza", "Ravenna", "Reggio nell'Emilia", "Rimini"
+        ],
+        # Riviera romagnole
+        "tourist_cities": [
+            "Riccione", "Cattolica", "Cervia", "Cesenatico", "Bellaria-Igea Marina"
+        ],
+    },
+}
+DEFAULT_SITE = "lombardia"
+SITE = os.environ.get("ROSSINI_SITE", DEFAULT_SITE)
+
+# Domaine de production du site actif
+DOMAIN = SITES[SITE]["domain"]
 
 # GeoNames username (créer un compte gratuit sur geonames.org)
 GEONAMES_USERNAME = "YOUR_USERNAME"
@@ -27,30 +101,171 @@ COMPANY = {
         {
             "name_it": "Installazione Colonnine di Ricarica EV",
             "name_fr": "Installation de bornes de recharge EV",
+            "name_en": "EV Charging Station Installation",
             "description_it": "Installazione di stazioni di ricarica per veicoli elettrici da 7kW a 22kW, in legno di Douglas o alluminio riciclato.",
+            "description_fr": "Installation de bornes de recharge pour véhicules électriques de 7 kW à 22 kW, en bois de Douglas ou aluminium recyclé.",
+            "description_en": "Installation of 7 kW to 22 kW electric vehicle charging stations, in Douglas fir or recycled aluminium.",
             "keywords": ["colonnina di ricarica", "ricarica veicoli elettrici", "borne de recharge", "EV charging"]
         },
         {
             "name_it": "Pensiline Fotovoltaiche TOSSO®",
             "name_fr": "Carports solaires photovoltaïques TOSSO®",
+            "name_en": "TOSSO® Solar Carports",
             "description_it": "Pensiline per parcheggi con pannelli fotovoltaici bifacciali, struttura in legno sostenibile.",
+            "description_fr": "Ombrières de parking à panneaux photovoltaïques bifaciaux, structure en bois durable.",
+            "description_en": "Car park canopies with bifacial solar panels on a sustainable timber structure.",
             "keywords": ["pensilina fotovoltaica", "carport solare", "ombrière photovoltaïque", "TOSSO"]
         },
         {
             "name_it": "Software di Gestione Ricarica",
             "name_fr": "Logiciel de gestion de recharge",
+            "name_en": "Charging Management Software",
             "description_it": "Piattaforma software per il pilotaggio dinamico della ricarica e gestione dell'energia solare.",
+            "description_fr": "Plateforme logicielle de pilotage dynamique de la recharge et de gestion de l'énergie solaire.",
+            "description_en": "Software platform for dynamic charging control and solar energy management.",
             "keywords": ["gestione ricarica", "pilotage dynamique", "software energia"]
         }
     ]
 }
 
 # Région cible
-REGION = "Lombardia"
+REGION = SITES[SITE]["region"]
+WIKIDATA_REGION = SITES[SITE]["wikidata_region"]
 COUNTRY = "IT"
 MIN_POPULATION = 10000
 
+# Langues du site : la langue par défaut est servie à la racine,
+# les autres sous /<langue>/ (textes dans templates/i18n/<langue>.html)
+DEFAULT_LOCALE = "it"
+LOCALES = ("it", "en", "fr")
+
+# Maillage interne « villes voisines » (scripts/link_graph.py) : liens par page,
+# rayon de recherche (km) et poids de l'équilibrage des liens entrants
+# (0 = simplement les plus proches voisines)
+LINK_BUDGET = 8
+LINK_RADIUS_KM = 50
+LINK_BALANCE = 0.5
+
+# Préchargement des voisines depuis chaque page ville (scripts/prefetch_hints.py) :
+# au plus PREFETCH_MAX_PAGES pages, classées par population / distance, dans un
+# budget d'octets transférés (gzip) pensé pour le mobile ; les autres liens
+# voisins ne sont préchargés qu'au survol
+PREFETCH_MAX_PAGES = 3
+PREFETCH_BUDGET_BYTES = 20_000
+
+# Installations type par profil de ville (get_city_profile), calculées par le
+# modèle PV local (scripts/pv_model.py) : puissance (kWc), inclinaison (°),
+# azimut (0 = sud, 90 = ouest), bifacialité (0 = monofacial), pertes (%)
+# et pose (free = carport / structure libre, building = intégré au bâti)
+PV_SYSTEMS = {
+    "A": {"label": "Parcheggio logistico metropolitano", "kwp": 500, "tilt": 10, "azimuth": 0,
+          "bifaciality": 0.7, "loss": 14, "mounting": "free"},
+    "B": {"label": "Pensilina aziendale industriale", "kwp": 200, "tilt": 10, "azimuth": 0,
+          "bifaciality": 0.7, "loss": 14, "mounting": "free"},
+    "C": {"label": "Parcheggio centro commerciale", "kwp": 300, "tilt": 10, "azimuth": 0,
+          "bifaciality": 0.7, "loss": 14, "mounting": "free"},
+    "D": {"label": "Carport PMI", "kwp": 30, "tilt": 15, "azimuth": 0,
+          "bifaciality": 0.0, "loss": 14, "mounting": "free"},
+    "E": {"label": "Parcheggio turistico", "kwp": 60, "tilt": 10, "azimuth": 0,
+          "bifaciality": 0.7, "loss": 14, "mounting": "free"},
+    "F": {"label": "Parcheggio pubblico capoluogo", "kwp": 150, "tilt": 10, "azimuth": 0,
+          "bifaciality": 0.7, "loss": 14, "mounting": "free"},
+}
+
+# Simulateur d'économies des pages ville (scripts/roi_tables.py) : grille
+# puissance (kWc) × prix d'achat de l'électricité (€/kWh) précalculée par ville
+ROI_SIZES_KWP = (10, 20, 30, 50, 75, 100, 150, 200, 300, 500)
+ROI_PRICES_EUR_KWH = (0.15, 0.20, 0.25, 0.30, 0.35)
+ROI_DEFAULT_KWP = 30
+# Ombrière type du simulateur (paramètres de scripts/pv_model.py)
+ROI_SYSTEM = {"tilt": 10, "azimuth": 0, "bifaciality": 0.7, "loss": 14, "mounting": "free"}
+# Coût installé au kWc selon la puissance (interpolé), entretien annuel en part de l'investissement
+ROI_CAPEX_EUR_KWP = ((10, 2200), (30, 1900), (100, 1600), (500, 1300))
+ROI_OPEX_SHARE = 0.01
+# Part autoconsommée, prix de revente du surplus (€/kWh), dégradation annuelle, horizon (ans)
+ROI_SELF_CONSUMPTION = 0.7
+ROI_FEED_IN_EUR_KWH = 0.10
+ROI_DEGRADATION = 0.005
+ROI_HORIZON_YEARS = 25
+
+# Intégrations tierces remplacées par une façade (scripts/facades.py) : un
+# bouton statique à la place du widget, le vrai script n'étant chargé qu'au
+# premier contact avec le bloc. script : src de la balise retirée ; marker :
+# attribut du bloc du widget ; ready : fonction globale à appeler une fois le
+# script chargé ; requests : requêtes du widget en plus du script (iframe...)
+THIRD_PARTY_EMBEDS = {
+    "typeform": {
+        "script": "//embed.typeform.com/next/embed.js",
+        "marker": "data-tf-widget",
+        "ready": "tf.load",
+        "requests": 1,
+    },
+}
+# Façades par template : intégration → chargement au premier contact
+# (« interaction ») ou aussi à l'approche du viewport (« proximity »).
+# Une intégration absente d'un template y reste chargée normalement.
+FACADES = {
+    "city_template.html": {"typeform": "proximity"},
+    "index_template.html": {"typeform": "interaction"},
+}
+
+# Dictionnaire de compression partagé des pages ville d'une langue
+# (scripts/17_compression_dictionary.py) : lignes présentes dans au moins
+# DICTIONARY_MIN_SHARE des pages, dans la limite de DICTIONARY_MAX_BYTES ;
+# variantes .html.dcz (Compression Dictionary Transport) si zstd est disponible
+DICTIONARY_MIN_SHARE = 0.2
+DICTIONARY_MAX_BYTES = 64 * 1024
+ZSTD_LEVEL = 19
+
+# Polices et icônes auto-hébergées (scripts/16_self_host_fonts.py) : les faces
+# demandées par le lien Google Fonts des templates sont téléchargées une fois
+# (cache HTTP) puis servies depuis output/assets/fonts/ ; les icônes Font
+# Awesome utilisées deviennent un sprite SVG
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2"
+FONT_AWESOME_SVG_URL = "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.4.0/svgs/{style}/{name}.svg"
+# User-Agent d'un navigateur récent : Google Fonts ne sert du WOFF2 qu'à ceux-là
+FONTS_USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
 # Chemins
 DATA_DIR = "data"
-OUTPUT_DIR = "output"
+OUTPUT_DIR = SITES[SITE]["output_dir"]
 TEMPLATES_DIR = "templates"
+
+# Données du site actif dans DATA_DIR : liste brute (01) et enrichie (02 → 08)
+CITIES_FILE = SITES[SITE]["cities_file"]
+ENRICHED_FILE = SITES[SITE]["enriched_file"]
+
+# Étapes d'enrichissement dont aucun champ n'est lu par les templates ni par
+# le code de rendu (scripts/field_usage.py) : sautées par défaut.
+# ROSSINI_ALL_FIELDS=1 les relance (nouveau template en préparation).
+SKIP_UNUSED_ENRICHMENT = os.environ.get("ROSSINI_ALL_FIELDS") != "1"
+
+# Limites de débit adaptatives (AIMD) par API — voir scripts/rate_limit.py
+# interval : intervalle initial entre requêtes (s), borné par min/max_interval
+RATE_LIMITS = {
+    "overpass": {
+        "interval": 3.0,
+        "min_interval": 1.0,
+        "max_interval": 60.0,
+        "status_url": "https://overpass-api.de/api/status",
+    },
+}
+
+# Latence supposée d'une API (s) pour les estimations de 19_fetch_plan.py,
+# tant que le cache HTTP n'a pas mesuré la sienne
+DEFAULT_LATENCY_S = 1.0
+
+# Cache local des outils (non versionné), partagé par tous les sites
+CACHE_DIR = ".cache"
+
+# Durée de vie des réponses API dans le cache HTTP partagé (s) — voir scripts/http_cache.py
+HTTP_CACHE_TTL = 30 * 24 * 3600
+
+# Dumps locaux pour 01_fetch_cities.py (mode hors-ligne, non versionnés)
+# - GeoNames : https://download.geonames.org/export/dump/IT.zip
+# - ISTAT    : https://www.istat.it/storage/codici-unita-amministrative/Elenco-comuni-italiani.csv
+# - Wikidata : export CSV « item,istat » de la propriété P635 (code ISTAT)
+GEONAMES_DUMP = "data/sources/IT.txt"
+ISTAT_COMUNI_CSV = "data/sources/Elenco-comuni-italiani.csv"
+WIKIDATA_ISTAT_CSV = "data/sources/wikidata_istat.csv"
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Serveur de développement : rendu à la demande et rechargement à chaud.
+
+- Les données villes et les templates compilés restent en mémoire
+- /citta/<slug>.html et /index.html (et leurs versions /<langue>/) sont
+  rendus à la requête avec le même code que 03_generate_html.py, puis mis
+  en cache
+- templates/ et data/ sont surveillés : seules les pages concernées sont
+  invalidées, et le navigateur se recharge tout seul (Server-Sent Events)
+
+Usage :
+    python scripts/dev_server.py [port]
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.build_info import build_year
+from scripts.config import DATA_DIR, DEFAULT_LOCALE, LOCALES, OUTPUT_DIR, TEMPLATES_DIR
+from scripts.city_model import load_cities
+from scripts.i18n import page_path
+from scripts.live_data import LIVE_DIR, live_payload
+from scripts.roi_tables import ROI_DIR, quantize, roi_tables
+
+generate = importlib.import_module("scripts.03_generate_html")
+
+# Intervalle de scrutation des fichiers surveillés (s)
+POLL_INTERVAL = 0.3
+
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SNIPPET = (
+    '<script>new EventSource("' + LIVERELOAD_PATH + '")'
+    '.onmessage = function() { location.reload(); };</script>\n'
+)
+
+
+class SiteState:
+    """Données, templates et pages rendues, partagés entre les threads."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        self.env = generate.create_environment()
+        self.year = build_year()
+        self.version = 0
+        self.pages = {}
+        self.views = {}
+        self.cities = []
+        self.nearby = []
+        self.roi = {}
+        self.positions = {}
+        self.load_data()
+
+    # === Données ===
+
+    def load_data(self):
+        """(Re)charge les villes ; retourne les slugs dont les pages changent."""
+        path = generate.find_input_path()
+        cities = generate.sort_cities(load_cities(path)) if path else []
+
+        nearby = generate.plan_nearby(cities)
+        roi = roi_tables(cities)
+
+        with self.lock:
+            old = {c.slug: c for c in self.cities}
+            old_links = {c.slug: [n.slug for n in links] for c, links in zip(self.cities, self.nearby)}
+            same_order = [c.slug for c in cities] == [c.slug for c in self.cities]
+
+            self.cities = cities
+            self.nearby = nearby
+            self.roi = roi
+            self.positions = {c.slug: i for i, c in enumerate(cities)}
+            self.views = {}
+
+            # Liste modifiée : la rotation SEO (par position) change partout
+            if not same_order:
+                return set(self.positions)
+
+            # Pages touchées : villes modifiées, pages dont les liens changent
+            # (l'équilibrage est global) et pages liant une ville modifiée
+            changed = {c.slug for c in cities if c != old[c.slug]}
+            affected = set(changed)
+            for city, links in zip(cities, nearby):
+                slugs = [n.slug for n in links]
+                if slugs != old_links[city.slug] or changed.intersection(slugs):
+                    affected.add(city.slug)
+            return affected
+
+    # === Rendu ===
+
+    def city_view(self, slug):
+        """Vue partagée par toutes les langues (voisines, profil, chiffres)."""
+        if slug not in self.views:
+            i = self.positions[slug]
+            self.views[slug] = generate.build_city_view(self.cities[i], i, self.nearby[i],
+                                                        roi=self.roi.get(slug))
+        return self.views[slug]
+
+    def render_city(self, slug, locale=DEFAULT_LOCALE):
+        key = page_path(locale, f"citta/{slug}")
+        with self.lock:
+            if key not in self.pages:
+                if slug not in self.positions:
+                    return None
+                template = self.env.get_template("city_template.html")
+                self.pages[key] = generate.render_city_page(
+                    template, self.city_view(slug), self.year, locale
+                )
+            return self.pages[key]
+
+    def render_index(self, locale=DEFAULT_LOCALE):
+        key = page_path(locale, "index")
+        with self.lock:
+            if key not in self.pages:
+                template = self.env.get_template("index_template.html")
+                self.pages[key] = generate.render_index_page(template, self.cities, self.year, locale)
+            return self.pages[key]
+
+    def live_fragment(self, slug):
+        with self.lock:
+            if slug not in self.positions:
+                return None
+            return live_payload(self.cities[self.positions[slug]])
+
+    def roi_table(self, slug):
+        with self.lock:
+            table = self.roi.get(slug)
+            return quantize(table) if table is not None else None
+
+    # === Invalidation ===
+
+    def invalidate(self, keys=None):
+        """Supprime des pages du cache (toutes si keys est None) et notifie les navigateurs."""
+        with self.lock:
+            if keys is None:
+                self.pages.clear()
+                self.views.clear()
+            else:
+                for key in keys:
+                    self.pages.pop(key, None)
+                    if "citta/" in key:
+                        self.views.pop(key.rsplit("/", 1)[1], None)
+            self.version += 1
+            self.changed.notify_all()
+
+    def wait_for_change(self, version, timeout):
+        with self.lock:
+            self.changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+def snapshot(paths):
+    """mtime de chaque fichier sous les chemins donnés."""
+    mtimes = {}
+    for root in paths:
+        if os.path.isfile(root):
+            mtimes[root] = os.path.getmtime(root)
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    mtimes[path] = os.path.getmtime(path)
+                except OSError:
+                    pass
+    return mtimes
+
+
+def page_keys(paths):
+    """Clés de cache d'une page dans toutes les langues."""
+    return {page_path(locale, path) for locale in LOCALES for path in paths}
+
+
+def watch(state):
+    """
+    Surveille templates/ et data/ et invalide uniquement les pages concernées.
+    Une erreur (JSON à moitié enregistré, ...) est affichée sans arrêter la
+    surveillance : l'instantané précédent est gardé et le rechargement est
+    retenté à chaque scrutation jusqu'à ce qu'il réussisse.
+    """
+    roots = [TEMPLATES_DIR, DATA_DIR]
+    previous = snapshot(roots)
+    failure = None
+
+    while True:
+        time.sleep(POLL_INTERVAL)
+        current = snapshot(roots)
+        modified = {p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)}
+        if not modified:
+            continue
+
+        try:
+            keys = set()
+            data_changed = False
+            for path in modified:
+                name = os.path.basename(path)
+                if path.startswith(DATA_DIR):
+                    data_changed = data_changed or name.startswith("cities_")
+                elif os.path.basename(os.path.dirname(path)) == "i18n":
+                    # Textes d'une langue (templates/i18n/) : toutes les pages rendues
+                    keys |= set(state.pages)
+                elif name == "city_template.html":
+                    keys |= {k for k in state.pages if "citta/" in k}
+                elif name == "index_template.html":
+                    keys |= page_keys(["index"])
+                # Autres fichiers (assets CSS/JS) : simple rechargement du navigateur
+
+            # Plusieurs fichiers cities_* modifiés : un seul rechargement
+            if data_changed:
+                slugs = state.load_data()
+                keys |= page_keys([f"citta/{s}" for s in slugs] + ["index"])
+
+            state.invalidate(keys)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if error != failure:
+                print(f"⚠️  Rechargement impossible ({error}), nouvel essai en continu")
+                failure = error
+            continue
+
+        previous = current
+        failure = None
+        names = ", ".join(sorted(os.path.relpath(p) for p in modified))
+        print(f"🔄 {names} → {len(keys)} page(s) invalidée(s)")
+
+
+class DevHandler(SimpleHTTPRequestHandler):
+    state = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=OUTPUT_DIR, **kwargs)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+
+        if path == LIVERELOAD_PATH:
+            return self.send_events()
+
+        locale = DEFAULT_LOCALE
+        first = path.split("/")[1]
+        if first in LOCALES and first != DEFAULT_LOCALE:
+            locale = first
+            path = path[len(first) + 1:] or "/"
+
+        if path in ("/", "/index.html"):
+            return self.send_page(lambda: self.state.render_index(locale))
+
+        if path.startswith("/citta/") and path.endswith(".html"):
+            slug = path[len("/citta/"):-len(".html")]
+            return self.send_page(lambda: self.state.render_city(slug, locale))
+
+        if path.startswith(f"/{LIVE_DIR}/") and path.endswith(".json"):
+            payload = self.state.live_fragment(os.path.basename(path)[:-len(".json")])
+            if payload is None:
+                return self.send_error(404)
+            return self.send_body(json.dumps(payload, ensure_ascii=False), "application/json")
+
+        if path.startswith(f"/{ROI_DIR}/") and path.endswith(".json"):
+            table = self.state.roi_table(os.path.basename(path)[:-len(".json")])
+            if table is None:
+                return self.send_error(404)
+            return self.send_body(json.dumps(table, separators=(",", ":")), "application/json")
+
+        if path.startswith("/assets/"):
+            # Assets servis depuis leur source, sans copie préalable
+            self.directory = TEMPLATES_DIR
+
+        return super().do_GET()
+
+    def send_page(self, render):
+        start = time.perf_counter()
+        html = render()
+        if html is None:
+            return self.send_error(404)
+        elapsed = (time.perf_counter() - start) * 1000
+        html = html.replace("</body>", LIVERELOAD_SNIPPET + "</body>", 1)
+        self.send_body(html, "text/html; charset=utf-8", {"X-Render-Time": f"{elapsed:.1f}ms"})
+
+    def send_body(self, text, content_type, headers=None):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        version = self.state.version
+        try:
+            while True:
+                latest = self.state.wait_for_change(version, timeout=15)
+                message = "data: reload\n\n" if latest != version else ": ping\n\n"
+                version = latest
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        if not self.path.startswith(LIVERELOAD_PATH):
+            super().log_message(format, *args)
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+
+    DevHandler.state = SiteState()
+    threading.Thread(target=watch, args=(DevHandler.state,), daemon=True).start()
+
+    server = ThreadingHTTPServer(("", port), DevHandler)
+    server.daemon_threads = True
+    print(f"🚀 Serveur de dev sur http://localhost:{port}/ ({len(DevHandler.state.cities)} villes en mémoire)")
+    print(f"   👀 Surveillance de {TEMPLATES_DIR}/ et {DATA_DIR}/")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Arrêt du serveur")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Façades des intégrations tierces (formulaire Typeform, ...).
+
+Au rendu d'une page, pour chaque intégration que FACADES active sur son
+template, la balise <script> du widget est retirée et son bloc reçoit un
+bouton statique et data-facade-src. assets/js/facade.js charge le vrai
+script au premier contact avec le bloc (survol, clic, focus) ou, en mode
+« proximity », dès qu'il approche du viewport, puis retire le bouton.
+"""
+
+import os
+import re
+
+from scripts.config import FACADES, THIRD_PARTY_EMBEDS
+
+FACADE_SCRIPT = "assets/js/facade.js"
+PREFIX = re.compile(r'href="((?:\.\./)*)assets/css/style\b')
+LABEL = re.compile(r'\btitle="?([^,"]+)')
+DEFERRED = re.compile(r'data-facade="([\w-]+)"')
+
+
+def script_tag(src):
+    return re.compile(r'[ \t]*<script src="%s"[^>]*></script>\n?' % re.escape(src))
+
+
+def facade_block(match, name, embed, mode):
+    """Bloc du widget avec ses attributs de façade et le bouton qui le remplace."""
+    attrs = match.group(1)
+    label = LABEL.search(attrs)
+    facade = f' data-facade="{name}" data-facade-src="{embed["script"]}" data-facade-load="{mode}"'
+    if embed.get("ready"):
+        facade += f' data-facade-ready="{embed["ready"]}"'
+    button = (f'<button type="button" class="btn btn-primary btn-lg facade-placeholder">'
+              f'📝 {label.group(1).strip() if label else name}</button>')
+    return f"<div {attrs}{facade}>{button}"
+
+
+def apply_facades(html, template):
+    """
+    Remplace dans une page rendue les intégrations que FACADES active pour son
+    template (city_template.html ou index_template.html, partagés par toutes
+    les langues). Une intégration dont le script ou le bloc est absent de la
+    page est laissée telle quelle.
+    """
+    deferred = False
+    for name, mode in FACADES.get(os.path.basename(template), {}).items():
+        embed = THIRD_PARTY_EMBEDS[name]
+        script = script_tag(embed["script"])
+        block = re.compile(r'<div ([^>]*\b%s="[^"]*"[^>]*)>' % re.escape(embed["marker"]))
+        if not script.search(html) or not block.search(html):
+            continue
+        html = script.sub("", html)
+        html = block.sub(lambda m: facade_block(m, name, embed, mode), html)
+        deferred = True
+
+    prefix = PREFIX.search(html)
+    if deferred and prefix:
+        tag = f'    <script src="{prefix.group(1)}{FACADE_SCRIPT}" defer></script>\n'
+        html = html.replace("</body>", tag + "</body>", 1)
+    return html
+
+
+def deferred_embeds(output_dir):
+    """
+    Intégrations différées des pages générées, par template :
+    {template: (pages, {intégration: pages})}. Le template se déduit du
+    chemin (index.html ou citta/).
+    """
+    report = {}
+    for dirpath, _, filenames in os.walk(output_dir):
+        for name in filenames:
+            if not name.endswith(".html"):
+                continue
+            template = "index_template.html" if name == "index.html" else "city_template.html"
+            with open(os.path.join(dirpath, name), "r", encoding="utf-8") as f:
+                embeds = set(DEFERRED.findall(f.read()))
+            pages, counts = report.setdefault(template, [0, {}])
+            report[template][0] = pages + 1
+            for embed in embeds:
+                counts[embed] = counts.get(embed, 0) + 1
+    return {template: tuple(value) for template, value in sorted(report.items())}
+
+
+def script_size(name, timeout=5):
+    """Poids (octets) du script d'une intégration, via le cache HTTP ; None hors ligne."""
+    import requests
+    from scripts import http_cache
+
+    src = THIRD_PARTY_EMBEDS[name]["script"]
+    try:
+        resp = http_cache.get("https:" + src if src.startswith("//") else src, timeout=timeout)
+    except requests.RequestException:
+        return None
+    return len(resp.content) if resp.status_code == 200 else None
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Champs d'enrichissement réellement lus par le site.
+
+Analyse statique, sans rien rendre ni importer des étapes :
+- templates Jinja (toutes les langues) : accès `city.<champ>` et
+  `<ville>.<champ>` dans les boucles sur les listes de villes
+- code de rendu : modules atteints depuis 03_generate_html.py et
+  04_generate_sitemap.py par leurs imports scripts.*, accès `.<champ>` et
+  tuples `*_FIELDS` lus par getattr (live_data.LIVE_FIELDS)
+- étapes d'enrichissement (commandes enrich* de rossini) : affectations
+  `city.<champ> = ...`, rattachées à la fonction qui fait la requête
+  (la fonction englobante, ou celle appelée depuis main)
+
+Une étape, ou une fonction d'étape, dont aucun champ n'est lu peut être
+sautée : rossini et 02_fetch_enrichment.py le font si SKIP_UNUSED_ENRICHMENT.
+"""
+
+import ast
+import functools
+import os
+
+from scripts.city_model import ENRICHMENT_FIELDS
+from scripts.config import TEMPLATES_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Points d'entrée du rendu : leurs imports scripts.* sont suivis
+VIEW_ROOTS = ("scripts.03_generate_html", "scripts.04_generate_sitemap")
+# Modules qui décrivent ou recopient les données sans les afficher
+DATA_MODULES = ("scripts.config", "scripts.city_model", "scripts.sites")
+# Variables de template : une ville, ou une liste de villes parcourue par {% for %}
+TEMPLATE_CITY_VARS = ("city",)
+TEMPLATE_CITY_LISTS = ("cities", "nearby_cities")
+
+
+def module_path(module):
+    return os.path.join(ROOT, *module.split(".")) + ".py"
+
+
+def _parse(module):
+    with open(module_path(module), "r", encoding="utf-8") as f:
+        return ast.parse(f.read(), filename=module_path(module))
+
+
+def _sorted_places(found):
+    """Lectures sans doublon, triées par fichier puis par ligne."""
+    def key(place):
+        name, line = place.rsplit(":", 1)
+        return name, int(line)
+    return {field: sorted(set(places), key=key) for field, places in found.items()}
+
+
+def template_fields(templates_dir=TEMPLATES_DIR):
+    """{champ: [« template:ligne », ...]} des champs lus par les templates."""
+    from jinja2 import Environment, nodes
+
+    env = Environment()
+    found = {}
+    for folder, _, files in sorted(os.walk(os.path.join(ROOT, templates_dir))):
+        for name in sorted(files):
+            if not name.endswith(".html"):
+                continue
+            path = os.path.join(folder, name)
+            with open(path, "r", encoding="utf-8") as f:
+                tree = env.parse(f.read())
+
+            city_vars = set(TEMPLATE_CITY_VARS)
+            for loop in tree.find_all(nodes.For):
+                source = loop.iter
+                while isinstance(source, (nodes.Getitem, nodes.Filter)):
+                    source = source.node
+                if (isinstance(source, nodes.Name) and source.name in TEMPLATE_CITY_LISTS
+                        and isinstance(loop.target, nodes.Name)):
+                    city_vars.add(loop.target.name)
+
+            rel = os.path.relpath(path, os.path.join(ROOT, templates_dir))
+            for node in tree.find_all((nodes.Getattr, nodes.Getitem)):
+                if not (isinstance(node.node, nodes.Name) and node.node.name in city_vars):
+                    continue
+                field = node.attr if isinstance(node, nodes.Getattr) else getattr(node.arg, "value", None)
+                if field in ENRICHMENT_FIELDS:
+                    found.setdefault(field, []).append(f"{rel}:{node.lineno}")
+    return _sorted_places(found)
+
+
+def _imported(tree):
+    """Modules scripts.* importés (from scripts import x, importlib.import_module("scripts.…"))."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "scripts":
+            yield from (f"scripts.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("scripts."):
+            yield node.module
+        elif (isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "import_module"
+              and node.args and isinstance(node.args[0], ast.Constant)
+              and str(node.args[0].value).startswith("scripts.")):
+            yield node.args[0].value
+
+
+def code_fields(roots=VIEW_ROOTS):
+    """{champ: [« module:ligne », ...]} des champs lus par le code de rendu."""
+    found, seen, queue = {}, set(DATA_MODULES), list(roots)
+    while queue:
+        module = queue.pop()
+        if module in seen or not os.path.exists(module_path(module)):
+            continue
+        seen.add(module)
+        tree = _parse(module)
+        queue.extend(_imported(tree))
+
+        where = module.split(".")[-1]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load) and node.attr in ENRICHMENT_FIELDS:
+                found.setdefault(node.attr, []).append(f"{where}:{node.lineno}")
+        # Champs lus par nom : LIVE_FIELDS = ("air_quality",) ... getattr(city, name)
+        for node in tree.body:
+            if (isinstance(node, ast.Assign) and isinstance(node.value, (ast.Tuple, ast.List))
+                    and any(isinstance(t, ast.Name) and t.id.endswith("_FIELDS") for t in node.targets)):
+                for item in node.value.elts:
+                    if isinstance(item, ast.Constant) and item.value in ENRICHMENT_FIELDS:
+                        found.setdefault(item.value, []).append(f"{where}:{node.lineno}")
+    return _sorted_places(found)
+
+
+@functools.lru_cache(maxsize=None)
+def consumed_fields():
+    """Champs d'enrichissement lus par les templates ou le code de rendu."""
+    return frozenset(template_fields()) | frozenset(code_fields())
+
+
+def _stage_modules():
+    from scripts.rossini import COMMANDS
+    return {name: module for name, (module, _) in COMMANDS.items() if name.startswith("enrich")}
+
+
+@functools.lru_cache(maxsize=None)
+def enrichment_steps():
+    """
+    {commande: {fonction: champs écrits}} des étapes d'enrichissement.
+    Une étape qui réutilise la fonction d'une autre (02b → enrich_pois) en
+    hérite les champs.
+    """
+    steps, trees = {}, {}
+    for command, module in _stage_modules().items():
+        trees[command] = tree = _parse(module)
+        steps[command] = {}
+        for func in tree.body:
+            if not isinstance(func, ast.FunctionDef):
+                continue
+            for node in ast.walk(func):
+                if not isinstance(node, ast.Assign):
+                    continue
+                for target in node.targets:
+                    if not (isinstance(target, ast.Attribute) and target.attr in ENRICHMENT_FIELDS):
+                        continue
+                    step = func.name
+                    if step == "main" and isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name):
+                        step = node.value.func.id
+                    steps[command].setdefault(step, set()).add(target.attr)
+
+    for command, tree in trees.items():
+        names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        names |= {node.attr for node in ast.walk(tree) if isinstance(node, ast.Attribute)}
+        for other, other_steps in list(steps.items()):
+            for step, fields in other_steps.items():
+                if other != command and step != "main" and step in names and step not in steps[command]:
+                    steps[command][step] = set(fields)
+    return steps
+
+
+def unused_steps(command):
+    """Fonctions de l'étape `command` dont aucun champ n'est lu par le site."""
+    consumed = consumed_fields()
+    return {step for step, fields in enrichment_steps().get(command, {}).items() if not fields & consumed}
+
+
+def unused_stage_fields(command):
+    """Champs écrits par l'étape `command` si aucun n'est lu (étape entière à sauter), sinon []."""
+    steps = enrichment_steps().get(command, {})
+    if not steps or unused_steps(command) != set(steps):
+        return []
+    return sorted(set().union(*steps.values()))
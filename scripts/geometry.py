@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Moteur de géométrie vectorisé (NumPy) pour les surfaces OSM.
+
+- Projection WGS84 → UTM 32N (EPSG:32632, zone de la Lombardie) en un seul lot
+- Assemblage des relations multipolygon (ways fragmentés, anneaux intérieurs)
+- Surface dissoute de l'union des polygones (les chevauchements ne sont
+  comptés qu'une fois) par balayage horizontal vectorisé
+
+Une « forme » est une liste d'anneaux ; le remplissage suit la règle
+pair-impair, donc les anneaux intérieurs (cours, trous) sont soustraits
+sans avoir à distinguer les rôles outer / inner.
+"""
+
+import numpy as np
+
+# Ellipsoïde WGS84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)
+
+# UTM zone 32N
+UTM_K0 = 0.9996
+UTM32_LON0 = 9.0
+UTM_FALSE_EASTING = 500000.0
+
+# Pas vertical du balayage (m) : l'erreur de surface est de l'ordre
+# de pas × périmètre / 2 dans le pire cas, négligeable à l'échelle de l'hectare
+DEFAULT_RESOLUTION = 1.0
+
+
+def _utm_terms(lat, lon):
+    phi = np.radians(lat)
+    sin_phi = np.sin(phi)
+    cos_phi = np.cos(phi)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_phi ** 2)
+    t = np.tan(phi) ** 2
+    c = WGS84_EP2 * cos_phi ** 2
+    a = np.radians(lon - UTM32_LON0) * cos_phi
+    return phi, n, t, c, a
+
+
+def to_utm32n(lat, lon):
+    """
+    Projette des tableaux lat/lon (degrés) en coordonnées UTM 32N (mètres).
+    Formules de Snyder (USGS PP 1395), précision millimétrique dans la zone.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    phi, n, t, c, a = _utm_terms(lat, lon)
+
+    e2, e4, e6 = WGS84_E2, WGS84_E2 ** 2, WGS84_E2 ** 3
+    m = WGS84_A * (
+        (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+        - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * phi)
+        + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * phi)
+        - (35 * e6 / 3072) * np.sin(6 * phi)
+    )
+
+    x = UTM_K0 * n * (
+        a
+        + (1 - t + c) * a ** 3 / 6
+        + (5 - 18 * t + t ** 2 + 72 * c - 58 * WGS84_EP2) * a ** 5 / 120
+    ) + UTM_FALSE_EASTING
+
+    y = UTM_K0 * (m + n * np.tan(phi) * (
+        a ** 2 / 2
+        + (5 - t + 9 * c + 4 * c ** 2) * a ** 4 / 24
+        + (61 - 58 * t + t ** 2 + 600 * c - 330 * WGS84_EP2) * a ** 6 / 720
+    ))
+    return x, y
+
+
+def utm_scale_factor(lat, lon):
+    """Facteur d'échelle ponctuel k de la projection UTM 32N."""
+    _, _, _, c, a = _utm_terms(np.asarray(lat, dtype=float), np.asarray(lon, dtype=float))
+    return UTM_K0 * (1 + (1 + c) * a ** 2 / 2 + (5 - 4 * c) * a ** 4 / 24)
+
+
+def assemble_rings(ways):
+    """
+    Assemble les ways membres d'une relation multipolygon en anneaux fermés.
+    `ways` : listes de points (lat, lon). Les fragments sont raccordés par
+    leurs extrémités communes (en les inversant si besoin) ; un anneau qui
+    ne peut pas être fermé est ignoré.
+    """
+    pending = [list(w) for w in ways if len(w) >= 2]
+    rings = []
+
+    while pending:
+        ring = pending.pop()
+        while ring[0] != ring[-1]:
+            for i, way in enumerate(pending):
+                if way[0] == ring[-1]:
+                    ring = ring + way[1:]
+                elif way[-1] == ring[-1]:
+                    ring = ring + way[-2::-1]
+                elif way[-1] == ring[0]:
+                    ring = way[:-1] + ring
+                elif way[0] == ring[0]:
+                    ring = way[:0:-1] + ring
+                else:
+                    continue
+                pending.pop(i)
+                break
+            else:
+                break
+
+        if len(ring) >= 4 and ring[0] == ring[-1]:
+            rings.append(ring)
+
+    return rings
+
+
+def project_shapes(shapes):
+    """
+    Projette toutes les formes (listes d'anneaux lat/lon) en un seul appel.
+    Retourne la même structure avec des tableaux (n, 2) en mètres.
+    """
+    rings = [np.asarray(r, dtype=float).reshape(-1, 2) for shape in shapes for r in shape]
+    if not rings:
+        return [[] for _ in shapes]
+
+    coords = np.concatenate(rings)
+    x, y = to_utm32n(coords[:, 0], coords[:, 1])
+    projected = np.column_stack([x, y])
+
+    splits = np.cumsum([len(r) for r in rings])[:-1]
+    parts = iter(np.split(projected, splits))
+    return [[next(parts) for _ in shape] for shape in shapes]
+
+
+def _edges(shapes):
+    """Arêtes (x0, y0, x1, y1, forme) de tous les anneaux, fermeture incluse."""
+    rings, ids = [], []
+    for shape_id, shape in enumerate(shapes):
+        for ring in shape:
+            if len(ring) >= 3:
+                rings.append(ring)
+                ids.append(np.full(len(ring), shape_id))
+    if not rings:
+        return None
+
+    start = np.concatenate(rings)
+    end = np.concatenate([np.roll(r, -1, axis=0) for r in rings])
+    return start[:, 0], start[:, 1], end[:, 0], end[:, 1], np.concatenate(ids)
+
+
+def union_area(shapes, resolution=DEFAULT_RESOLUTION):
+    """
+    Surface (m²) de l'union de formes projetées, chevauchements dissous.
+
+    Balayage horizontal : chaque ligne y coupe les arêtes, les intersections
+    d'une même forme sont appariées (pair-impair) en intervalles, puis les
+    intervalles de toutes les formes sont fusionnés ligne par ligne.
+    Tout est vectorisé, sans boucle Python sur les points.
+    """
+    edges = _edges(shapes)
+    if edges is None:
+        return 0.0
+    x0, y0, x1, y1, shape_ids = edges
+
+    y_lo = np.minimum(y0, y1)
+    y_hi = np.maximum(y0, y1)
+    origin = y_lo.min()
+
+    # Lignes k de centre origin + (k + 0.5) * pas, coupées si y_lo <= y < y_hi
+    first = np.ceil((y_lo - origin) / resolution - 0.5).astype(np.int64)
+    last = np.ceil((y_hi - origin) / resolution - 0.5).astype(np.int64) - 1
+    counts = np.maximum(last - first + 1, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return 0.0
+
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    row = first[edge] + (np.arange(total) - offsets[edge])
+    y = origin + (row + 0.5) * resolution
+    x = x0[edge] + (y - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    shape = shape_ids[edge]
+
+    # Appariement pair-impair par (forme, ligne)
+    order = np.lexsort((x, row, shape))
+    x, row = x[order], row[order]
+    starts, ends, rows = x[0::2], x[1::2], row[0::2]
+
+    # Fusion des intervalles par ligne : un décalage par ligne isole les
+    # lignes entre elles pour un seul maximum cumulé global
+    x_min = starts.min()
+    width = ends.max() - x_min + 1
+    shift = rows * width - x_min
+    starts, ends = starts + shift, ends + shift
+
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    previous = np.concatenate([[-np.inf], reach[:-1]])
+    covered = np.maximum(ends - np.maximum(starts, previous), 0).sum()
+
+    return float(covered * resolution)
+
+
+def dissolved_area(shapes, resolution=DEFAULT_RESOLUTION):
+    """
+    Surface réelle (m²) de l'union de formes en lat/lon : projection UTM 32N
+    en lot, union dissoute, puis correction du facteur d'échelle local.
+    """
+    shapes = [s for s in shapes if s]
+    if not shapes:
+        return 0.0
+
+    projected = project_shapes(shapes)
+    area = union_area(projected, resolution)
+
+    points = np.concatenate([np.asarray(r, dtype=float).reshape(-1, 2) for s in shapes for r in s])
+    k = utm_scale_factor(points[:, 0].mean(), points[:, 1].mean())
+    return area / float(k) ** 2
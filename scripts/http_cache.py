@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cache disque des réponses API, partagé par toutes les étapes et tous les sites.
+
+Les données récupérées (Wikidata, Wikipedia, Open-Meteo, PVGIS, comptages
+Overpass) changent peu : une réponse 200 est gardée HTTP_CACHE_TTL secondes
+dans .cache/http/ et relue au lieu de refaire la requête — y compris par un
+autre site régional ou un autre processus (écriture atomique).
+
+La clé est méthode + URL + params + corps : les en-têtes (User-Agent, Accept)
+n'en font pas partie. Les réponses en streaming ne sont jamais mises en cache,
+ni celles que le prédicat `valid` de l'appelant refuse (ex: 200 Overpass avec
+un "remark" de timeout).
+Chaque entrée garde la durée de la requête d'origine : latences mesurées par
+API pour les estimations de 19_fetch_plan.py.
+
+La pause de politesse envers une API (`pause`) n'est faite qu'après une vraie
+requête réseau : une réponse relue en cache repart aussitôt.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import CACHE_DIR, HTTP_CACHE_TTL
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+
+
+def cache_key(method, url, params=None, data=None):
+    raw = json.dumps([method.upper(), url, params, data], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(HTTP_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def is_cached(key, ttl=HTTP_CACHE_TTL):
+    """Réponse en cache encore valide, sans la lire."""
+    try:
+        return time.time() - os.path.getmtime(_path(key)) <= ttl
+    except OSError:
+        return False
+
+
+def load(key, ttl=HTTP_CACHE_TTL):
+    """Réponse en cache encore valide, ou None."""
+    path = _path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = entry["url"]
+    resp.encoding = entry["encoding"]
+    resp._content = base64.b64decode(entry["content"])
+    return resp
+
+
+def store(key, resp):
+    """Enregistre une réponse 200 (écriture atomique : plusieurs sites en parallèle)."""
+    if resp.status_code != 200:
+        return
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "url": resp.url,
+        "encoding": resp.encoding,
+        "content": base64.b64encode(resp.content).decode("ascii"),
+        "elapsed": round(resp.elapsed.total_seconds(), 3),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+def fetch(method, url, ttl=HTTP_CACHE_TTL, send=requests.request, pause=0.0, valid=None, **kwargs):
+    """
+    Comme requests.request, en passant par le cache. `send` effectue la vraie
+    requête (ex: rate_limit.request avec son limiteur) en cas d'absence ;
+    `pause` (s) est attendue après elle, même en erreur, jamais après une
+    réponse lue en cache. valid(resp) faux : réponse renvoyée sans être gardée
+(et entrée déjà en cache ignorée, pour les caches écrits avant la vérification).
+    """
+    if kwargs.get("stream"):
+        return _send(send, pause, method, url, **kwargs)
+
+    key = cache_key(method, url, kwargs.get("params"), kwargs.get("data"))
+    cached = load(key, ttl)
+    if cached is not None and (valid is None or valid(cached)):
+        return cached
+
+    resp = _send(send, pause, method, url, **kwargs)
+    if valid is None or valid(resp):
+        store(key, resp)
+    return resp
+
+
+def _send(send, pause, method, url, **kwargs):
+    try:
+        return send(method, url, **kwargs)
+    finally:
+        if pause:
+            time.sleep(pause)
+
+
+def get(url, ttl=HTTP_CACHE_TTL, **kwargs):
+    return fetch("GET", url, ttl, **kwargs)
+
+
+def latencies():
+    """{hôte: [durées (s)]} des requêtes d'origine, pour les entrées qui l'ont enregistrée."""
+    found = defaultdict(list)
+    for folder, _, files in os.walk(HTTP_CACHE_DIR):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(folder, name), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if entry.get("elapsed"):
+                found[urlsplit(entry["url"]).netloc].append(entry["elapsed"])
+    return dict(found)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Textes générés et URLs par langue (it, en, fr).
+
+La langue par défaut (config.DEFAULT_LOCALE) est servie à la racine du site,
+les autres sous /<langue>/. Toutes les langues partagent les mêmes templates,
+qui importent les textes des pages de templates/i18n/<langue>.html.
+Seuls les textes dépendent de la langue : le calcul par ville (voisines,
+profil, chiffres) est fait une fois dans 03_generate_html.py.
+"""
+
+import os
+import posixpath
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DEFAULT_LOCALE, DOMAIN, LOCALES
+
+
+# === URLs ===
+
+def locale_prefix(locale):
+    """Dossier de la langue dans output/ ("" pour la langue par défaut)."""
+    return "" if locale == DEFAULT_LOCALE else f"{locale}/"
+
+
+def page_path(locale, path):
+    """Chemin d'une page dans output/ (ex: en/citta/milano.html)."""
+    return locale_prefix(locale) + path
+
+
+def page_url(locale, path, domain=DOMAIN):
+    return f"{domain}/{page_path(locale, path)}"
+
+
+def root_prefix(locale, path):
+    """Chemin relatif d'une page vers la racine du site (« ../../ » pour en/citta/milano.html)."""
+    return "../" * page_path(locale, path).count("/")
+
+
+def alternates(path, current, domain=DOMAIN):
+    """
+    Versions d'une page dans toutes les langues, pour les balises hreflang :
+    `url` absolue (sur `domain`, le site actif par défaut), `href` relative
+    à la page `current` affichée. x-default pointe vers la langue par défaut.
+    """
+    origin = posixpath.dirname(page_path(current, path)) or "."
+    links = []
+    for locale in LOCALES + ("x-default",):
+        target = page_path(DEFAULT_LOCALE if locale == "x-default" else locale, path)
+        links.append({
+            "lang": locale,
+            "url": f"{domain}/{target}",
+            "href": posixpath.relpath(target, origin),
+        })
+    return links
+
+
+# === Provinces ===
+
+PROVINCE_PREFIXES = {
+    "en": {"provincia di ": "Province of ", "città metropolitana di ": "Metropolitan City of "},
+    "fr": {"provincia di ": "province de ", "città metropolitana di ": "ville métropolitaine de "},
+}
+
+
+def localize_province(province, locale):
+    """« provincia di Brescia » → « Province of Brescia » / « province de Brescia »."""
+    for prefix, translated in PROVINCE_PREFIXES.get(locale, {}).items():
+        if province.lower().startswith(prefix):
+            return translated + province[len(prefix):]
+    return province
+
+
+# === Régions ===
+
+# Formes du nom de région : (nom, préposition « en », « de la région »,
+# « toute la région », adjectif féminin)
+REGIONS = {
+    "it": {
+        "Lombardia": ("Lombardia", "in", "della Lombardia", "tutta la Lombardia", "lombarda"),
+        "Piemonte": ("Piemonte", "in", "del Piemonte", "tutto il Piemonte", "piemontese"),
+        "Veneto": ("Veneto", "in", "del Veneto", "tutto il Veneto", "veneta"),
+        "Emilia-Romagna": ("Emilia-Romagna", "in", "dell'Emilia-Romagna", "tutta l'Emilia-Romagna",
+                           "emiliano-romagnola"),
+    },
+    "en": {
+        "Lombardia": ("Lombardy", "in", "of Lombardy", "Lombardy", "Lombard"),
+        "Piemonte": ("Piedmont", "in", "of Piedmont", "Piedmont", "Piedmontese"),
+        "Veneto": ("Veneto", "in", "of Veneto", "Veneto", "Venetian"),
+        "Emilia-Romagna": ("Emilia-Romagna", "in", "of Emilia-Romagna", "Emilia-Romagna", "Emilian"),
+    },
+    "fr": {
+        "Lombardia": ("Lombardie", "en", "de Lombardie", "toute la Lombardie", "lombarde"),
+        "Piemonte": ("Piémont", "dans le", "du Piémont", "tout le Piémont", "piémontaise"),
+        "Veneto": ("Vénétie", "en", "de Vénétie", "toute la Vénétie", "vénitienne"),
+        "Emilia-Romagna": ("Émilie-Romagne", "en", "d'Émilie-Romagne", "toute l'Émilie-Romagne", "émilienne"),
+    },
+}
+
+
+def region_forms(region, locale):
+    """Nom de la région dans une langue, avec les formes utilisées par les templates."""
+    name, in_prefix, of_region, all_region, adjective = REGIONS[locale][region]
+    return {
+        "name": name,
+        "in_prefix": in_prefix,
+        "in_region": f"{in_prefix} {name}",
+        "of_region": of_region,
+        "all_region": all_region,
+        "adjective": adjective,
+    }
+
+
+def capfirst(text):
+    """Majuscule initiale sans toucher au reste (« dans le Piémont » → « Dans le Piémont »)."""
+    return text[:1].upper() + text[1:]
+
+
+# === Nombres ===
+
+# Séparateur des milliers (l'italien garde la virgule historique des textes générés)
+THOUSANDS_SEPARATORS = {"it": ",", "en": ",", "fr": " "}
+
+
+def format_number(value, locale):
+    return f"{value:,}".replace(",", THOUSANDS_SEPARATORS[locale])
+
+
+# Chiffres affichés par les templates (filtre `number`) : milliers, décimales
+DISPLAY_SEPARATORS = {"it": (".", ","), "en": (",", "."), "fr": (" ", ",")}
+
+
+def display_number(value, locale, digits=0):
+    """36000 → « 36.000 » (it), « 36,000 » (en), « 36 000 » (fr) ; 0.25 → « 0,25 » avec digits=2."""
+    thousands, point = DISPLAY_SEPARATORS[locale]
+    return f"{value:,.{digits}f}".translate(str.maketrans({",": thousands, ".": point}))
+
+
+# === Textes générés ===
+
+# Variables disponibles : city, province, province_name, population,
+# zones, surface_parking, ev, region_adjective
+TEXTS = {
+    "it": {
+        "seo_titles": [
+            "Tettoia Fotovoltaica per Parcheggio a {city} | Rossini Energy",
+            "Pensilina Fotovoltaica a {city}, {province} - Preventivo Gratuito | Rossini Energy",
+            "Parcheggio Fotovoltaico a {city} | Installazione Chiavi in Mano | Rossini Energy",
+            "Installatore Pensiline Fotovoltaiche a {city} | Rossini Energy",
+            "Tettoia Solare per Parcheggio Aziendale a {city} | Rossini Energy",
+        ],
+        "seo_descriptions": [
+            "Rossini Energy installa tettoie fotovoltaiche per parcheggi aziendali a {city}. Struttura in legno, pannelli bifacciali. Preventivo gratuito.",
+            "Pensilina fotovoltaica a {city}: trasforma il parcheggio della tua azienda in una fonte di energia rinnovabile. Installazione chiavi in mano.",
+            "Parcheggio fotovoltaico a {city}, {province}. Riduci i costi energetici della tua azienda con le pensiline solari TOSSO® di Rossini Energy.",
+            "Installazione tettoie fotovoltaiche per aziende e PMI a {city}. Legno Douglas, pannelli bifacciali. Contattaci per un sopralluogo gratuito.",
+            "Copri il parcheggio della tua azienda a {city} con una pensilina fotovoltaica. Energia solare + protezione veicoli. Rossini Energy.",
+        ],
+        "h1": [
+            "Tettoia Fotovoltaica per Parcheggio a <strong>{city}</strong>",
+            "Pensilina Fotovoltaica a <strong>{city}</strong>",
+            "Parcheggio Fotovoltaico a <strong>{city}</strong>",
+        ],
+        "profiles": {
+            "A": ("Tettoie Fotovoltaiche per Grandi Aziende a {city}",
+                  "{city}, metropoli {region_adjective} con {population} abitanti, concentra numerose aziende e sedi direzionali. "
+                  "I vasti parcheggi aziendali rappresentano un'opportunità unica per installare tettoie fotovoltaiche TOSSO® "
+                  "e produrre energia rinnovabile su larga scala. "),
+            "B": ("Pensiline Fotovoltaiche per Aziende Industriali a {city}",
+                  "{city} è un importante polo industriale{in_province}{with_zones}. "
+                  "Le aziende manifatturiere e logistiche possono ridurre drasticamente i costi energetici "
+                  "coprendo i parcheggi e le aree operative con tettoie fotovoltaiche ad alta efficienza. "),
+            "C": ("Pensiline Fotovoltaiche per Centri Commerciali a {city}",
+                  "{city} dispone di un tessuto commerciale dinamico. "
+                  "Centri commerciali, supermercati e aziende del terziario possono valorizzare i propri parcheggi "
+                  "installando pensiline fotovoltaiche che producono energia e offrono riparo ai clienti. "),
+            "D": ("Parcheggi Fotovoltaici per Aziende e PMI a {city}",
+                  "A {city} ({province}), le aziende locali possono beneficiare dell'energia solare. "
+                  "Installare una tettoia fotovoltaica sul parcheggio aziendale significa produrre energia pulita, "
+                  "proteggere i veicoli e ridurre le bollette energetiche. "),
+            "E": ("Tettoie Fotovoltaiche per Strutture Turistiche a {city}",
+                  "{city}, con la sua vocazione turistica, può beneficiare di pensiline fotovoltaiche "
+                  "per hotel, ristoranti e strutture ricettive. Un investimento che riduce i costi energetici "
+                  "e rafforza l'immagine green dell'attività. "),
+            "F": ("Pensiline Fotovoltaiche a {city}, Capoluogo di Provincia",
+                  "{city}, capoluogo di provincia, riunisce enti pubblici, aziende e PMI. "
+                  "Le tettoie fotovoltaiche TOSSO® sono ideali per parcheggi aziendali, sedi comunali, "
+                  "e strutture sanitarie che vogliono investire in energie rinnovabili. "),
+        },
+        "profile_names": {
+            "A": "Metropoli", "B": "Polo industriale", "C": "Centro commerciale",
+            "D": "Residenziale", "E": "Turistico", "F": "Capoluogo",
+        },
+        "in_province": " della provincia di {province_name}",
+        "with_zones": ", con {zones} zone industriali censite",
+        "parking": "Il territorio conta {surface_parking} parcheggi di superficie, "
+                   "molti dei quali potrebbero essere trasformati in impianti fotovoltaici. ",
+        "ev": "Con {ev} punti di ricarica EV già presenti, {city} dimostra "
+              "attenzione alla mobilità elettrica. Le nostre tettoie integrano colonnine di ricarica. ",
+        "benefits": "I vantaggi per la tua azienda: produzione di energia solare autoconsumata, "
+                    "riduzione dei costi energetici fino al 70%, protezione dei veicoli, "
+                    "valorizzazione dell'immagine aziendale green",
+        "benefits_grid": ", e possibilità di vendere l'energia in eccesso alla rete.",
+        "benefits_incentives": ", e accesso agli incentivi fiscali per le energie rinnovabili.",
+    },
+
+    "en": {
+        "seo_titles": [
+            "Solar Carport for Car Parks in {city} | Rossini Energy",
+            "Solar Canopy in {city}, {province} - Free Quote | Rossini Energy",
+            "Solar Car Park in {city} | Turnkey Installation | Rossini Energy",
+            "Solar Carport Installer in {city} | Rossini Energy",
+            "Solar Canopy for Company Car Parks in {city} | Rossini Energy",
+        ],
+        "seo_descriptions": [
+            "Rossini Energy installs solar carports for company car parks in {city}. Timber structure, bifacial panels. Free quote.",
+            "Solar canopy in {city}: turn your company car park into a source of renewable energy. Turnkey installation.",
+            "Solar car park in {city}, {province}. Cut your company's energy costs with Rossini Energy's TOSSO® solar canopies.",
+            "Solar carport installation for companies and SMEs in {city}. Douglas fir, bifacial panels. Contact us for a free site survey.",
+            "Cover your company car park in {city} with a solar canopy. Solar energy + vehicle protection. Rossini Energy.",
+        ],
+        "h1": [
+            "Solar Carport for Car Parks in <strong>{city}</strong>",
+            "Solar Canopy in <strong>{city}</strong>",
+            "Solar Car Park in <strong>{city}</strong>",
+        ],
+        "profiles": {
+            "A": ("Solar Carports for Large Companies in {city}",
+                  "{city}, a {region_adjective} metropolis of {population} inhabitants, is home to many companies and headquarters. "
+                  "Its large company car parks are a unique opportunity to install TOSSO® solar carports "
+                  "and produce renewable energy at scale. "),
+            "B": ("Solar Canopies for Industrial Companies in {city}",
+                  "{city} is a major industrial hub{in_province}{with_zones}. "
+                  "Manufacturing and logistics companies can drastically cut their energy costs "
+                  "by covering car parks and yards with high-efficiency solar carports. "),
+            "C": ("Solar Canopies for Shopping Centres in {city}",
+                  "{city} has a lively retail sector. "
+                  "Shopping centres, supermarkets and service companies can make the most of their car parks "
+                  "with solar canopies that produce energy and shelter customers. "),
+            "D": ("Solar Car Parks for Companies and SMEs in {city}",
+                  "In {city} ({province}), local businesses can benefit from solar energy. "
+                  "A solar carport over the company car park means clean energy, "
+                  "protected vehicles and lower energy bills. "),
+            "E": ("Solar Carports for Tourism Businesses in {city}",
+                  "{city}, a tourist destination, can benefit from solar canopies "
+                  "for hotels, restaurants and accommodation. An investment that cuts energy costs "
+                  "and strengthens the business's green image. "),
+            "F": ("Solar Canopies in {city}, Provincial Capital",
+                  "{city}, a provincial capital, brings together public bodies, companies and SMEs. "
+                  "TOSSO® solar carports are ideal for company car parks, municipal buildings "
+                  "and healthcare facilities investing in renewable energy. "),
+        },
+        "profile_names": {
+            "A": "Metropolis", "B": "Industrial hub", "C": "Retail centre",
+            "D": "Residential", "E": "Tourism", "F": "Provincial capital",
+        },
+        "in_province": " in the {province}",
+        "with_zones": ", with {zones} recorded industrial zones",
+        "parking": "The area has {surface_parking} surface car parks, "
+                   "many of which could be turned into solar installations. ",
+        "ev": "With {ev} EV charging points already in place, {city} is committed "
+              "to electric mobility. Our carports come with integrated charging stations. ",
+        "benefits": "The benefits for your company: self-consumed solar energy, "
+                    "energy costs cut by up to 70%, vehicle protection, "
+                    "a greener corporate image",
+        "benefits_grid": ", and the option to sell surplus energy to the grid.",
+        "benefits_incentives": ", and access to tax incentives for renewable energy.",
+    },
+
+    "fr": {
+        "seo_titles": [
+            "Ombrière Photovoltaïque pour Parking à {city} | Rossini Energy",
+            "Carport Solaire à {city}, {province} - Devis Gratuit | Rossini Energy",
+            "Parking Photovoltaïque à {city} | Installation Clés en Main | Rossini Energy",
+            "Installateur d'Ombrières Photovoltaïques à {city} | Rossini Energy",
+            "Ombrière Solaire pour Parking d'Entreprise à {city} | Rossini Energy",
+        ],
+        "seo_descriptions": [
+            "Rossini Energy installe des ombrières photovoltaïques pour parkings d'entreprise à {city}. Structure en bois, panneaux bifaciaux. Devis gratuit.",
+            "Carport solaire à {city} : transformez le parking de votre entreprise en source d'énergie renouvelable. Installation clés en main.",
+            "Parking photovoltaïque à {city}, {province}. Réduisez les coûts énergétiques de votre entreprise avec les ombrières TOSSO® de Rossini Energy.",
+            "Installation d'ombrières photovoltaïques pour entreprises et PME à {city}. Bois de Douglas, panneaux bifaciaux. Contactez-nous pour une visite gratuite.",
+            "Couvrez le parking de votre entreprise à {city} d'un carport solaire. Énergie solaire + protection des véhicules. Rossini Energy.",
+        ],
+        "h1": [
+            "Ombrière Photovoltaïque pour Parking à <strong>{city}</strong>",
+            "Carport Solaire à <strong>{city}</strong>",
+            "Parking Photovoltaïque à <strong>{city}</strong>",
+        ],
+        "profiles": {
+            "A": ("Ombrières Photovoltaïques pour Grandes Entreprises à {city}",
+                  "{city}, métropole {region_adjective} de {population} habitants, concentre de nombreuses entreprises et sièges sociaux. "
+                  "Ses vastes parkings d'entreprise sont une occasion unique d'installer des ombrières photovoltaïques TOSSO® "
+                  "et de produire de l'énergie renouvelable à grande échelle. "),
+            "B": ("Carports Solaires pour Entreprises Industrielles à {city}",
+                  "{city} est un pôle industriel important{in_province}{with_zones}. "
+                  "Les entreprises manufacturières et logistiques peuvent réduire fortement leurs coûts énergétiques "
+                  "en couvrant parkings et aires de travail d'ombrières photovoltaïques à haut rendement. "),
+            "C": ("Carports Solaires pour Centres Commerciaux à {city}",
+                  "{city} dispose d'un tissu commercial dynamique. "
+                  "Centres commerciaux, supermarchés et entreprises de services peuvent valoriser leurs parkings "
+                  "avec des carports solaires qui produisent de l'énergie et abritent les clients. "),
+            "D": ("Parkings Photovoltaïques pour Entreprises et PME à {city}",
+                  "À {city} ({province}), les entreprises locales peuvent profiter de l'énergie solaire. "
+                  "Installer une ombrière photovoltaïque sur le parking de l'entreprise, c'est produire une énergie propre, "
+                  "protéger les véhicules et réduire les factures. "),
+            "E": ("Ombrières Photovoltaïques pour le Tourisme à {city}",
+                  "{city}, ville touristique, peut tirer parti de carports solaires "
+                  "pour hôtels, restaurants et hébergements. Un investissement qui réduit les coûts énergétiques "
+                  "et renforce l'image verte de l'établissement. "),
+            "F": ("Carports Solaires à {city}, Chef-lieu de Province",
+                  "{city}, chef-lieu de province, réunit administrations, entreprises et PME. "
+                  "Les ombrières photovoltaïques TOSSO® sont idéales pour les parkings d'entreprise, les bâtiments communaux "
+                  "et les établissements de santé qui investissent dans les énergies renouvelables. "),
+        },
+        "profile_names": {
+            "A": "Métropole", "B": "Pôle industriel", "C": "Pôle commercial",
+            "D": "Résidentiel", "E": "Touristique", "F": "Chef-lieu",
+        },
+        "in_province": " de la {province}",
+        "with_zones": ", avec {zones} zones industrielles recensées",
+        "parking": "Le territoire compte {surface_parking} parkings de surface, "
+                   "dont beaucoup pourraient devenir des centrales photovoltaïques. ",
+        "ev": "Avec {ev} points de recharge déjà en service, {city} montre son intérêt "
+              "pour la mobilité électrique. Nos ombrières intègrent des bornes de recharge. ",
+        "benefits": "Les avantages pour votre entreprise : énergie solaire autoconsommée, "
+                    "coûts énergétiques réduits jusqu'à 70 %, protection des véhicules, "
+                    "image d'entreprise plus verte",
+        "benefits_grid": ", et possibilité de revendre le surplus d'énergie au réseau.",
+        "benefits_incentives": ", et accès aux incitations fiscales pour les énergies renouvelables.",
+    },
+}
+
+
+def texts(locale):
+    return TEXTS[locale]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Graphe des liens internes (NumPy vectorisé) : choix des « villes voisines »
+de chaque page, répartition des liens entrants et PageRank.
+
+Les 8 plus proches voisines forment des grappes fermées dans les zones
+denses, tandis que les comuni isolés (Sondrio, Mantova) ne reçoivent
+presque aucun lien. plan_links() garde un budget fixe de liens par page,
+tous dans le rayon, mais pénalise les cibles déjà très liées :
+
+    score(i → j) = distance(i, j) × (1 + balance × entrants(j) / moyenne)
+
+recalculé sur quelques itérations amorties. Tout est en opérations par
+lot sur une matrice de candidats n × C (C = CANDIDATES × budget plus
+proches), trouvés case par case sur une grille de la taille du rayon :
+quelques secondes pour des dizaines de milliers de pages.
+
+Le graphe est gardé sous forme creuse (COO : tableaux source / cible) ;
+le PageRank itère des produits matrice-vecteur via np.bincount.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Candidats examinés par page, en multiple du budget de liens
+CANDIDATES = 3
+
+# Marge relative du préfiltre par grille / produit scalaire
+GRID_MARGIN = 0.01
+
+BALANCE_ITERATIONS = 12
+PAGERANK_DAMPING = 0.85
+
+
+def coordinates(cities):
+    """Latitude / longitude en tableaux (NaN pour une ville sans coordonnées)."""
+    lat = np.array([c.latitude if c.latitude and c.longitude else np.nan for c in cities], dtype=float)
+    lon = np.array([c.longitude if c.latitude and c.longitude else np.nan for c in cities], dtype=float)
+    return lat, lon
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Distance en km (formule de haversine), par lot."""
+    dlat = np.radians(lat2 - lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _grid_cells(lat, lon, cell_km):
+    """Regroupe les villes par case de cell_km de côté : {(cx, cy): indices triés}."""
+    phi = np.radians(lat)
+    # Échelle est-ouest de la latitude la plus haute : une case couvre au moins cell_km
+    scale = np.cos(np.abs(phi).max())
+    cx = np.floor(EARTH_RADIUS_KM * np.radians(lon) * scale / cell_km).astype(np.int64)
+    cy = np.floor(EARTH_RADIUS_KM * phi / cell_km).astype(np.int64)
+    cells = {}
+    for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+        cells.setdefault(key, []).append(i)
+    return {key: np.array(members) for key, members in cells.items()}
+
+
+def nearest_candidates(lat, lon, count, radius_km):
+    """
+    Les `count` plus proches voisines de chaque ville dans le rayon.
+    Retourne (indices, distances) de forme n × count, triés par distance ;
+    les places vides ont l'indice -1 et une distance infinie.
+
+    Les villes sont rangées dans une grille de cases de la taille du rayon :
+    seules les 9 cases autour d'une ville sont examinées, par produits
+    scalaires de vecteurs unitaires (BLAS), puis la distance exacte n'est
+    calculée que pour les candidates retenues.
+    """
+    n = len(lat)
+    count = max(min(count, n - 1), 0)
+    indices = np.full((n, count), -1, dtype=np.int64)
+    distances = np.full((n, count), np.inf)
+    valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+    if count == 0 or len(valid) < 2:
+        return indices, distances
+
+    phi = np.radians(lat[valid])
+    lam = np.radians(lon[valid])
+    xyz = np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+    # Marge : le préfiltre ne doit écarter aucune ville dans le rayon
+    min_dot = np.cos(radius_km * (1 + GRID_MARGIN) / EARTH_RADIUS_KM)
+
+    cells = _grid_cells(lat[valid], lon[valid], radius_km * (1 + GRID_MARGIN))
+    for (cx, cy), rows in cells.items():
+        neighbours = [cells[key] for key in ((cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                      if key in cells]
+        cols = np.sort(np.concatenate(neighbours))
+
+        dots = xyz[rows] @ xyz[cols].T
+        dots[rows[:, None] == cols[None, :]] = -np.inf
+        dots[dots < min_dot] = -np.inf
+
+        k = min(count, len(cols) - 1)
+        if k <= 0:
+            continue
+        part = np.argpartition(-dots, k - 1, axis=1)[:, :k]
+        keep = np.isfinite(np.take_along_axis(dots, part, axis=1))
+
+        src = valid[rows][:, None]
+        dst = valid[cols[part]]
+        d = haversine(lat[src], lon[src], lat[dst], lon[dst])
+        d[~keep | (d > radius_km)] = np.inf
+
+        order = _sort_rows(d, dst)
+        dst = np.take_along_axis(dst, order, axis=1)
+        d = np.take_along_axis(d, order, axis=1)
+        dst[np.isinf(d)] = -1
+        indices[valid[rows], :k] = dst
+        distances[valid[rows], :k] = d
+
+    return indices, distances
+
+
+def _sort_rows(keys, tiebreak):
+    """Ordre par ligne selon keys, puis tiebreak (stable et déterministe)."""
+    order = np.argsort(tiebreak, axis=1, kind="stable")
+    keys_sorted = np.take_along_axis(keys, order, axis=1)
+    return np.take_along_axis(order, np.argsort(keys_sorted, axis=1, kind="stable"), axis=1)
+
+
+def select_links(indices, scores, budget):
+    """Les `budget` candidats de plus petit score par ligne (-1 si aucun candidat)."""
+    budget = min(budget, indices.shape[1])
+    order = _sort_rows(scores, indices)[:, :budget]
+    chosen = np.take_along_axis(indices, order, axis=1)
+    chosen[np.isinf(np.take_along_axis(scores, order, axis=1))] = -1
+    return chosen
+
+
+def inbound_counts(chosen, n):
+    targets = chosen[chosen >= 0]
+    return np.bincount(targets, minlength=n).astype(float)
+
+
+def plan_links(lat, lon, budget, radius_km, balance):
+    """
+    Liens « villes voisines » de chaque page : tableau n × budget d'indices
+    (-1 = pas de lien), triés par distance. balance = 0 donne simplement
+    les plus proches voisines.
+    """
+    n = len(lat)
+    indices, distances = nearest_candidates(lat, lon, budget * CANDIDATES, radius_km)
+    chosen = select_links(indices, distances, budget)
+
+    if balance > 0 and n > 1:
+        inbound = inbound_counts(chosen, n)
+        for _ in range(BALANCE_ITERATIONS):
+            mean = max(inbound.mean(), 1e-9)
+            weight = np.where(indices >= 0, inbound[indices.clip(0)], 0.0)
+            scores = distances * (1 + balance * weight / mean)
+            chosen = select_links(indices, scores, budget)
+            # Amortissement : évite l'oscillation entre deux répartitions
+            inbound = (inbound + inbound_counts(chosen, n)) / 2
+
+    # Affichage par distance croissante
+    link_d = np.where(chosen >= 0, _distance_of(indices, distances, chosen), np.inf)
+    order = _sort_rows(link_d, chosen)
+    return np.take_along_axis(chosen, order, axis=1)
+
+
+def _distance_of(indices, distances, chosen):
+    """Distance de chaque lien choisi, retrouvée dans la matrice des candidats."""
+    match = indices[:, None, :] == chosen[:, :, None]
+    return np.where(match, distances[:, None, :], np.inf).min(axis=2)
+
+
+def edges(chosen, hub=True):
+    """
+    Graphe creux des pages ville (0..n-1) et de l'index (n) : (sources, cibles).
+    L'index lie toutes les villes et chaque ville lie l'index (fil d'Ariane).
+    """
+    n = len(chosen)
+    rows, cols = np.nonzero(chosen >= 0)
+    src = [rows]
+    dst = [chosen[rows, cols]]
+    if hub:
+        cities = np.arange(n)
+        src += [np.full(n, n), cities]
+        dst += [cities, np.full(n, n)]
+    return np.concatenate(src), np.concatenate(dst)
+
+
+def pagerank(src, dst, n_nodes, damping=PAGERANK_DAMPING, tol=1e-10, max_iter=200):
+    """PageRank par itération de puissance sur le graphe creux (pages sans lien : saut uniforme)."""
+    out_degree = np.bincount(src, minlength=n_nodes).astype(float)
+    dangling = out_degree == 0
+    weights = 1.0 / out_degree[src]
+    rank = np.full(n_nodes, 1.0 / n_nodes)
+
+    for _ in range(max_iter):
+        spread = np.bincount(dst, weights=rank[src] * weights, minlength=n_nodes)
+        new = (1 - damping) / n_nodes + damping * (spread + rank[dangling].sum() / n_nodes)
+        if np.abs(new - rank).sum() < tol:
+            return new
+        rank = new
+    return rank
+
+
+def gini(values):
+    """Coefficient de Gini (0 = liens entrants parfaitement répartis)."""
+    values = np.sort(np.asarray(values, dtype=float))
+    total = values.sum()
+    if total == 0:
+        return 0.0
+    n = len(values)
+    return float((2 * np.arange(1, n + 1) - n - 1) @ values / (n * total))
+
+
+def link_stats(chosen):
+    """Répartition des liens entrants et PageRank d'un plan de liens."""
+    n = len(chosen)
+    inbound = inbound_counts(chosen, n)
+    src, dst = edges(chosen)
+    rank = pagerank(src, dst, n + 1)[:n]
+    return {
+        "links": int((chosen >= 0).sum()),
+        "inbound": inbound,
+        "zero_inbound": int((inbound == 0).sum()),
+        "gini": gini(inbound),
+        "pagerank": rank,
+    }
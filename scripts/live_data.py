@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fragments de données « live » : les champs qui changent vite (qualité de
+l'air, ...) sont publiés en petits JSON par ville dans output/live/,
+chargés à la demande par assets/js/live.js.
+
+Une mise à jour quotidienne ne réécrit que ces fragments (quelques
+centaines d'octets par ville) au lieu de régénérer toutes les pages.
+"""
+
+import json
+import os
+from dataclasses import asdict
+
+# Sous-dossier de output/ contenant les fragments
+LIVE_DIR = "live"
+
+# Champs de City publiés dans les fragments
+LIVE_FIELDS = ("air_quality",)
+
+
+def live_payload(city):
+    """Contenu du fragment d'une ville (None pour un champ absent)."""
+    payload = {}
+    for name in LIVE_FIELDS:
+        value = getattr(city, name)
+        payload[name] = asdict(value) if value is not None else None
+    return payload
+
+
+def write_live_fragments(cities, output_dir):
+    """
+    Écrit output/live/<slug>.json pour chaque ville.
+    Un fragment identique n'est pas réécrit (mtime inchangé → pas de redéploiement).
+    Retourne (fragments écrits, octets écrits).
+    """
+    live_dir = os.path.join(output_dir, LIVE_DIR)
+    os.makedirs(live_dir, exist_ok=True)
+
+    written, size = 0, 0
+    for city in cities:
+        content = json.dumps(live_payload(city), ensure_ascii=False, separators=(",", ":"))
+        path = os.path.join(live_dir, f"{city.slug}.json")
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    continue
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        written += 1
+        size += len(content.encode("utf-8"))
+
+    return written, size
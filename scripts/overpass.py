@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Accès partagé à l'API Overpass (OpenStreetMap).
+
+Les réponses sont lues en streaming : les éléments du tableau "elements"
+sont décodés un par un au fil des chunks HTTP, sans jamais charger la
+réponse complète en mémoire.
+
+Les comptages de POIs (count_pois) tiennent en une seule requête : un
+ensemble nommé par catégorie, puis un `out count` par ensemble.
+"""
+
+import codecs
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import HTTP_CACHE_TTL
+from scripts.city_model import Pois
+from scripts.rate_limit import get_limiter, request
+
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+# Taille des chunks lus sur la socket
+CHUNK_SIZE = 64 * 1024
+
+# Jetons suivis par iter_elements : chaîne complète (accolades ignorées),
+# accolade / crochet, ou guillemet d'une chaîne encore incomplète
+TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]|"')
+
+# Rayon de comptage des POIs autour du centre-ville (m)
+POI_RADIUS_M = 5000
+
+# Champ de Pois → sélecteurs OSM comptés ensemble (nom de l'ensemble Overpass)
+POI_CATEGORIES = {
+    "parking_count": ('node["amenity"="parking"]', 'way["amenity"="parking"]'),
+    "ev_charging_stations": ('node["amenity"="charging_station"]',),
+    "fuel_stations": ('node["amenity"="fuel"]', 'way["amenity"="fuel"]'),
+    "supermarkets": ('node["shop"="supermarket"]', 'way["shop"="supermarket"]'),
+    "malls": ('node["shop"="mall"]', 'way["shop"="mall"]'),
+}
+
+
+class OverpassError(Exception):
+    """Réponse Overpass invalide ou incomplète (timeout / mémoire côté serveur)."""
+
+
+def post_query(query, timeout=60, stream=True, **kwargs):
+    """Envoie une requête Overpass QL au rythme du limiteur partagé."""
+    return request(
+        get_limiter("overpass"), "POST", OVERPASS_URL,
+        data={"data": query}, timeout=timeout, stream=stream, **kwargs
+    )
+
+
+def iter_elements(chunks):
+    """
+    Décode incrémentalement les objets du tableau "elements" d'une réponse
+    Overpass JSON. `chunks` est un itérable de bytes (ex: iter_content()).
+    Seuls l'élément en cours et le chunk courant sont gardés en mémoire.
+
+    La profondeur d'accolades / crochets est suivie au fil des chunks depuis
+    la dernière position analysée : un élément réparti sur de nombreux chunks
+    (relation `out geom`) n'est décodé qu'une fois, à son accolade fermante.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    in_array = False
+    done = False
+    scan = 0     # position où reprendre l'analyse dans buf
+    depth = 0    # profondeur dans l'élément en cours (0 : entre deux éléments)
+    start = 0    # début de l'élément en cours
+
+    for chunk in chunks:
+        buf += utf8.decode(chunk)
+
+        if not in_array:
+            begin = buf.find('"elements"')
+            if begin < 0:
+                continue
+            bracket = buf.find("[", begin)
+            if bracket < 0:
+                continue
+            buf = buf[bracket + 1:]
+            in_array = True
+
+        if done:
+            continue  # la fin du document est minuscule : gardée pour "remark"
+
+        consumed = 0
+        for match in TOKENS.finditer(buf, scan):
+            token = match.group()
+            if token == '"':
+                break  # chaîne coupée par la fin du chunk : attendre la suite
+            scan = match.end()
+            if depth == 0:
+                if token == "]":
+                    done = True
+                    consumed = scan
+                    break
+                if token == "{":
+                    start = match.start()
+                    depth = 1
+            elif token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    element, consumed = decoder.raw_decode(buf, start)
+                    yield element
+
+        # Un seul découpage par chunk : le reste commence à l'élément en cours
+        keep = consumed if depth == 0 else start
+        buf = buf[keep:]
+        scan -= keep
+        start -= keep
+
+    if not done:
+        raise OverpassError("réponse Overpass tronquée")
+
+    # Overpass signale les timeouts / dépassements mémoire dans "remark",
+    # après un tableau "elements" partiel
+    if '"remark"' in buf:
+        tail = buf.strip().rstrip("}").lstrip(",")
+        try:
+            remark = json.loads("{" + tail + "}").get("remark", "")
+        except json.JSONDecodeError:
+            remark = tail
+        raise OverpassError(f"réponse Overpass incomplète : {remark}")
+
+
+def stream_elements(query, timeout=60):
+    """Exécute une requête et itère sur ses éléments en streaming."""
+    response = post_query(query, timeout=timeout)
+    try:
+        if response.status_code != 200:
+            raise OverpassError(f"HTTP {response.status_code}")
+        yield from iter_elements(response.iter_content(chunk_size=CHUNK_SIZE))
+    finally:
+        response.close()
+
+
+def poi_count_query(lat, lon, radius=POI_RADIUS_M):
+    """Requête Overpass QL : un ensemble nommé par catégorie de POI, puis un `out count` par ensemble."""
+    sets = []
+    outputs = []
+    for name, selectors in POI_CATEGORIES.items():
+        union = " ".join(f"{selector}(around:{radius},{lat},{lon});" for selector in selectors)
+        sets.append(f"({union})->.{name};")
+        outputs.append(f".{name} out count;")
+    return "[out:json][timeout:30];\n" + "\n".join(sets + outputs) + "\n"
+
+
+def poi_counts(data):
+    """Éléments "count" d'une réponse de poi_count_query ; OverpassError si incomplète."""
+    if data.get("remark"):
+        raise OverpassError(f"réponse Overpass incomplète : {data['remark']}")
+    counts = [e for e in data.get("elements", []) if e.get("type") == "count"]
+    if len(counts) != len(POI_CATEGORIES):
+        raise OverpassError(f"{len(counts)} comptages reçus pour {len(POI_CATEGORIES)} catégories")
+    return counts
+
+
+def _complete_counts(response):
+    try:
+        poi_counts(response.json())
+    except (ValueError, OverpassError):
+        return False
+    return True
+
+
+def count_pois(lat, lon, radius=POI_RADIUS_M):
+    """
+    Comptages de toutes les catégories de POI_CATEGORIES en une requête.
+    Les éléments "count" reviennent dans l'ordre des `out count`. Seule une
+    réponse complète est gardée dans le cache HTTP : un timeout serveur
+    (200 + "remark") est retenté au prochain appel.
+    """
+    response = post_query(poi_count_query(lat, lon, radius), stream=False,
+                          cache_ttl=HTTP_CACHE_TTL, valid=_complete_counts)
+    if response.status_code != 200:
+        raise OverpassError(f"HTTP {response.status_code}")
+    counts = poi_counts(response.json())
+    return Pois(**{name: int(e["tags"]["total"]) for name, e in zip(POI_CATEGORIES, counts)})
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Préchargement des pages voisines probables depuis chaque page ville.
+
+Le bloc « villes voisines » (plan_nearby) est le principal chemin de
+navigation entre pages ville. Chaque page reçoit des règles de spéculation :
+- préchargement immédiat des voisines les plus probables, classées par
+  population / distance (modèle gravitaire), dans la limite de
+  PREFETCH_MAX_PAGES pages et de PREFETCH_BUDGET_BYTES octets transférés
+  (poids gzip des pages rendues)
+- préchargement au survol (eagerness « moderate ») des autres liens voisins
+
+Les navigateurs sans Speculation Rules reçoivent les mêmes URLs en
+<link rel="prefetch"> depuis assets/js/main.js (sauf en mode économie de données).
+"""
+
+import json
+import zlib
+
+from scripts.config import PREFETCH_BUDGET_BYTES, PREFETCH_MAX_PAGES
+from scripts.link_graph import haversine
+
+# Lien du bloc « villes voisines » (templates city_template.html)
+NEARBY_SELECTOR = ".nearby-card"
+# Distance minimale du classement (km) : évite de surpondérer une voisine collée
+MIN_DISTANCE_KM = 1.0
+
+
+def transfer_size(html):
+    """Poids transféré estimé d'une page (gzip niveau 6)."""
+    return len(zlib.compress(html.encode("utf-8"), 6))
+
+
+def prefetch_targets(city, nearby, sizes):
+    """
+    Slugs des voisines à précharger : classées par population / distance,
+    ajoutées tant que le nombre de pages et le budget d'octets le permettent.
+    `sizes` : {slug: poids transféré} des pages de la même langue.
+    """
+    def score(other):
+        if not (city.latitude and city.longitude and other.latitude and other.longitude):
+            return 0.0
+        distance = float(haversine(city.latitude, city.longitude, other.latitude, other.longitude))
+        return other.population / max(distance, MIN_DISTANCE_KM)
+
+    chosen, used = [], 0
+    for other in sorted(nearby, key=lambda c: (-score(c), c.slug)):
+        size = sizes.get(other.slug)
+        if size is None or used + size > PREFETCH_BUDGET_BYTES:
+            continue
+        chosen.append(other.slug)
+        used += size
+        if len(chosen) == PREFETCH_MAX_PAGES:
+            break
+    return chosen
+
+
+def speculation_rules(slugs):
+    rules = [{"source": "document", "where": {"selector_matches": NEARBY_SELECTOR}, "eagerness": "moderate"}]
+    if slugs:
+        rules.insert(0, {"source": "list", "urls": [f"{slug}.html" for slug in slugs], "eagerness": "eager"})
+    return json.dumps({"prefetch": rules}, separators=(",", ":"))
+
+
+def add_prefetch_hints(html, slugs):
+    """Insère les règles de spéculation d'une page ville avant </head>."""
+    tag = f'    <script type="speculationrules">{speculation_rules(slugs)}</script>\n'
+    return html.replace("</head>", tag + "</head>", 1)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Modèle local de production photovoltaïque (NumPy vectorisé) : production
+mensuelle et annuelle de n'importe quelle installation (kWc, inclinaison,
+orientation, bifacialité, pertes), pour toutes les villes et toutes les
+configurations en une passe.
+
+Entrées par ville, mensuelles : irradiation horizontale (kWh/m²), part
+diffuse et température moyenne, telles que PVGIS MRcalc les donne
+(06_fetch_solar.py les garde dans Solar). Pour une ville qui n'a que le
+calcul PVGIS de référence (30 kWc, 15°, sud, 14 % de pertes),
+invert_reference() retrouve l'irradiation horizontale qui reproduit ses
+productions mensuelles : aucun appel distant de plus.
+
+Méthode (Duffie & Beckman, moyennes mensuelles) :
+- jour représentatif de chaque mois (Klein), géométrie solaire sur une
+  grille d'angles horaires
+- part diffuse : celle de PVGIS, sinon corrélation d'Erbs sur l'indice de
+  clarté KT
+- plan incliné : modèle isotrope de Liu & Jordan, rapport direct Rb intégré
+  sur la journée (toute orientation) ; face arrière pour le bifacial
+- température de cellule de Faiman (coefficients PVGIS selon la pose),
+  éclairement pondéré par l'énergie, coefficient de puissance -0,4 %/°C
+
+Axes des tableaux : villes (n) × configurations (k) × mois (12).
+"""
+
+import numpy as np
+
+SOLAR_CONSTANT_KW_M2 = 1.367
+
+# Jour de l'année représentatif de chaque mois (Klein, 1977)
+REPRESENTATIVE_DAYS = np.array([17, 47, 75, 105, 135, 162, 198, 228, 258, 288, 318, 344])
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Pas de la grille d'angles horaires (par jour)
+HOUR_STEPS = 72
+
+ALBEDO = 0.2
+# Face arrière d'un carport : sol ombragé par la structure et les véhicules
+REAR_SHADING = 0.5
+TEMP_COEFF = -0.004
+
+# Modèle thermique de Faiman : Tcell = Tair + G / (U0 + U1 × vent), coefficients PVGIS
+MOUNTINGS = {
+    "free": (26.9, 6.2),      # structure libre (carport, au sol)
+    "building": (20.0, 0.0),  # intégré au bâti (calcul de référence PVGIS)
+}
+WIND_MS = 1.0
+# Écart entre la température des heures productives et la moyenne journalière (°C)
+DAYTIME_WARMING = 3.0
+# Réflexion sous incidence oblique et spectre (pris en compte par PVGIS)
+OPTICAL_LOSS = 0.03
+# Rendement en faible éclairement (modèle de Huld de PVGIS, en moyenne annuelle)
+LOW_IRRADIANCE_LOSS = 0.03
+
+# Calcul PVGIS de 06_fetch_solar.py, gardé dans Solar
+REFERENCE = {"kwp": 30.0, "tilt": 15.0, "azimuth": 0.0, "bifaciality": 0.0, "loss": 14.0,
+             "mounting": "building"}
+
+# Températures mensuelles (°C) sans donnée PVGIS ni climat : plaine du Pô (Milan, normales 1991-2020)
+FALLBACK_TEMP_C = np.array([2.5, 4.5, 9.0, 13.0, 17.5, 21.5, 24.0, 23.5, 19.0, 13.5, 8.0, 3.5])
+
+# Villes traitées par bloc (la grille horaire multiplie la mémoire par HOUR_STEPS)
+CHUNK_CELLS = 4_000_000
+
+
+def solar_geometry(lat):
+    """
+    Géométrie solaire mensuelle des latitudes `lat` (n,) :
+    - h0 : irradiation extraterrestre horizontale du mois (kWh/m²), (n, 12)
+    - sunset : angle horaire du coucher (rad), (n, 12)
+    - peak_factor : éclairement pondéré par l'énergie / moyen de la journée, (n, 12)
+    - phi, delta, omega : latitude (n, 1, 1), déclinaison (1, 12, 1), angles horaires (1, 1, h)
+    """
+    phi = np.radians(np.asarray(lat, dtype=float))[:, None, None]
+    delta = np.radians(23.45 * np.sin(2 * np.pi * (284 + REPRESENTATIVE_DAYS) / 365))[None, :, None]
+    omega = (-np.pi + (np.arange(HOUR_STEPS) + 0.5) * 2 * np.pi / HOUR_STEPS)[None, None, :]
+
+    cos_zenith = np.sin(phi) * np.sin(delta) + np.cos(phi) * np.cos(delta) * np.cos(omega)
+    eccentricity = 1 + 0.033 * np.cos(2 * np.pi * REPRESENTATIVE_DAYS / 365)
+    daily = SOLAR_CONSTANT_KW_M2 * eccentricity * np.clip(cos_zenith, 0, None).sum(axis=2) * 24 / HOUR_STEPS
+    sunset = np.arccos(np.clip(-np.tan(phi[:, :, 0]) * np.tan(delta[:, :, 0]), -1, 1))
+
+    # Éclairement pondéré par l'énergie / éclairement moyen de la journée
+    sun = np.clip(cos_zenith, 0, None)
+    daylight = np.maximum((sun > 0).sum(axis=2), 1)
+    peak_factor = (sun ** 2).sum(axis=2) * daylight / np.maximum(sun.sum(axis=2) ** 2, 1e-9)
+
+    return {
+        "h0": daily * MONTH_DAYS,
+        "sunset": sunset,
+        "peak_factor": peak_factor,
+        "phi": phi,
+        "delta": delta,
+        "omega": omega,
+        "cos_zenith": cos_zenith,
+    }
+
+
+def beam_ratio(geo, tilt, azimuth):
+    """
+    Rapport direct incliné / horizontal Rb, (n, k, 12). Azimut PVGIS :
+    0 = sud, 90 = ouest, -90 = est ; les cosinus sont intégrés sur les
+    heures où le soleil est au-dessus de l'horizon et devant le panneau.
+    """
+    beta = np.radians(np.asarray(tilt, dtype=float))[None, :, None, None]
+    gamma = np.radians(np.asarray(azimuth, dtype=float))[None, :, None, None]
+    phi, delta, omega = (a[:, None] for a in (geo["phi"], geo["delta"], geo["omega"]))
+    cos_zenith = geo["cos_zenith"][:, None]
+
+    cos_incidence = (
+        np.sin(delta) * np.sin(phi) * np.cos(beta)
+        - np.sin(delta) * np.cos(phi) * np.sin(beta) * np.cos(gamma)
+        + np.cos(delta) * np.cos(phi) * np.cos(beta) * np.cos(omega)
+        + np.cos(delta) * np.sin(phi) * np.sin(beta) * np.cos(gamma) * np.cos(omega)
+        + np.cos(delta) * np.sin(beta) * np.sin(gamma) * np.sin(omega)
+    )
+    daylight = cos_zenith > 0
+    tilted = np.where(daylight, np.clip(cos_incidence, 0, None), 0).sum(axis=3)
+    horizontal = np.clip(cos_zenith, 0, None).sum(axis=3)
+    return tilted / np.maximum(horizontal, 1e-9)
+
+
+def diffuse_ratio(horizontal, geo):
+    """Part diffuse mensuelle (corrélation d'Erbs sur l'indice de clarté), (n, 12)."""
+    kt = np.clip(horizontal / np.maximum(geo["h0"], 1e-9), 0.05, 0.8)
+    low_sun = np.degrees(geo["sunset"]) <= 81.4
+    ratio = np.where(
+        low_sun,
+        1.391 - 3.560 * kt + 4.189 * kt ** 2 - 2.137 * kt ** 3,
+        1.311 - 3.022 * kt + 3.427 * kt ** 2 - 1.821 * kt ** 3,
+    )
+    return np.clip(ratio, 0, 1)
+
+
+def monthly_temperatures(climate):
+    """Températures mensuelles d'un bloc Climate (sinusoïde min → max, pic mi-juillet)."""
+    if climate is None:
+        return FALLBACK_TEMP_C.copy()
+    mid = (climate.temp_max_month + climate.temp_min_month) / 2
+    amplitude = (climate.temp_max_month - climate.temp_min_month) / 2
+    return mid + amplitude * np.cos(2 * np.pi * (np.arange(12) - 6.5) / 12)
+
+
+def _production(geo, rb, horizontal, diffuse, temperature, kwp, tilt, bifaciality, loss, mounting):
+    """Production mensuelle (kWh), (n, k, 12), à partir d'un Rb déjà calculé."""
+    beta = np.radians(np.asarray(tilt, dtype=float))[None, :, None]
+    kwp = np.asarray(kwp, dtype=float)[None, :, None]
+    bifaciality = np.asarray(bifaciality, dtype=float)[None, :, None]
+    loss = np.asarray(loss, dtype=float)[None, :, None]
+    h = horizontal[:, None, :]
+    hd = h * diffuse[:, None, :]
+
+    front = (h - hd) * rb + hd * (1 + np.cos(beta)) / 2 + h * ALBEDO * (1 - np.cos(beta)) / 2
+    rear = (hd * (1 - np.cos(beta)) / 2 + h * ALBEDO * (1 + np.cos(beta)) / 2) * (1 - REAR_SHADING)
+    plane = front + bifaciality * rear
+
+    # Éclairement sur le plan pendant les heures productives (W/m²) → température de cellule
+    daylight_hours = 2 * np.degrees(geo["sunset"])[:, None, :] / 15 * MONTH_DAYS
+    irradiance = 1000 * front / np.maximum(daylight_hours, 1e-9) * geo["peak_factor"][:, None, :]
+    u0, u1 = MOUNTINGS[mounting]
+    cell = temperature[:, None, :] + DAYTIME_WARMING + irradiance / (u0 + u1 * WIND_MS)
+    thermal = 1 + TEMP_COEFF * (cell - 25)
+
+    return kwp * plane * thermal * (1 - OPTICAL_LOSS) * (1 - LOW_IRRADIANCE_LOSS) * (1 - loss / 100)
+
+
+def _broadcast_configs(kwp, tilt, azimuth, bifaciality, loss):
+    return np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                 for v in (kwp, tilt, azimuth, bifaciality, loss)))
+
+
+def production(lat, horizontal, temperature, kwp, tilt, azimuth=0.0, bifaciality=0.0, loss=14.0,
+               diffuse=None, mounting="free"):
+    """
+    Production mensuelle (kWh) de k configurations dans n villes : (n, k, 12).
+
+    lat (n,) ; horizontal, temperature et diffuse (n, 12) ; paramètres des
+    configurations en scalaires ou tableaux (k,). diffuse=None : part diffuse
+    estimée (Erbs). mounting : clé de MOUNTINGS, commune aux k configurations.
+    Les villes sont traitées par blocs pour borner la mémoire.
+    """
+    lat = np.asarray(lat, dtype=float)
+    horizontal = np.asarray(horizontal, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    kwp, tilt, azimuth, bifaciality, loss = _broadcast_configs(kwp, tilt, azimuth, bifaciality, loss)
+
+    n, k = len(lat), len(kwp)
+    out = np.zeros((n, k, 12))
+    step = max(1, CHUNK_CELLS // (k * 12 * HOUR_STEPS))
+    for start in range(0, n, step):
+        rows = slice(start, start + step)
+        geo = solar_geometry(lat[rows])
+        d = diffuse_ratio(horizontal[rows], geo) if diffuse is None else np.asarray(diffuse, dtype=float)[rows]
+        rb = beam_ratio(geo, tilt, azimuth)
+        out[rows] = _production(geo, rb, horizontal[rows], d, temperature[rows],
+                                kwp, tilt, bifaciality, loss, mounting)
+    return out
+
+
+def plane_irradiation(lat, horizontal, tilt, azimuth=0.0, diffuse=None):
+    """Irradiation mensuelle sur le plan des modules (kWh/m²), (n, k, 12), comme H(i) de PVGIS."""
+    lat = np.asarray(lat, dtype=float)
+    horizontal = np.asarray(horizontal, dtype=float)
+    tilt, azimuth = np.broadcast_arrays(np.atleast_1d(np.asarray(tilt, dtype=float)),
+                                        np.atleast_1d(np.asarray(azimuth, dtype=float)))
+    geo = solar_geometry(lat)
+    d = diffuse_ratio(horizontal, geo) if diffuse is None else np.asarray(diffuse, dtype=float)
+    rb = beam_ratio(geo, tilt, azimuth)
+    beta = np.radians(tilt)[None, :, None]
+    h = horizontal[:, None, :]
+    hd = h * d[:, None, :]
+    return (h - hd) * rb + hd * (1 + np.cos(beta)) / 2 + h * ALBEDO * (1 - np.cos(beta)) / 2
+
+
+def invert_reference(lat, monthly_kwh, temperature, iterations=40):
+    """
+    Irradiation horizontale mensuelle (n, 12) qui redonne les productions
+    PVGIS de la configuration REFERENCE (monthly_kwh, (n, 12)). Dichotomie
+    vectorisée : la production croît avec l'irradiation, mois par mois.
+    """
+    lat = np.asarray(lat, dtype=float)
+    target = np.asarray(monthly_kwh, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    ref = REFERENCE
+    geo = solar_geometry(lat)
+    rb = beam_ratio(geo, [ref["tilt"]], [ref["azimuth"]])
+
+    low = np.zeros_like(target)
+    high = np.full_like(target, 400.0)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        produced = _production(geo, rb, mid, diffuse_ratio(mid, geo), temperature,
+                               [ref["kwp"]], [ref["tilt"]], [ref["bifaciality"]], [ref["loss"]],
+                               ref["mounting"])[:, 0]
+        below = produced < target
+        low = np.where(below, mid, low)
+        high = np.where(below, high, mid)
+    return (low + high) / 2
+
+
+def location_inputs(cities):
+    """
+    Entrées mensuelles des villes avec un bloc Solar : (lat, horizontal,
+    diffuse, temperature, measured). measured[i] indique des données PVGIS
+    MRcalc ; sinon l'irradiation est retrouvée depuis le calcul de référence
+    et la part diffuse vaut NaN (estimée par Erbs).
+    """
+    n = len(cities)
+    lat = np.array([c.latitude for c in cities], dtype=float)
+    horizontal = np.full((n, 12), np.nan)
+    diffuse = np.full((n, 12), np.nan)
+    temperature = np.empty((n, 12))
+    measured = np.zeros(n, dtype=bool)
+    reference = np.zeros((n, 12))
+
+    for i, city in enumerate(cities):
+        solar = city.solar
+        if solar.monthly_horizontal_kwh_m2 and len(solar.monthly_horizontal_kwh_m2) == 12:
+            measured[i] = True
+            horizontal[i] = solar.monthly_horizontal_kwh_m2
+            diffuse[i] = solar.monthly_diffuse_ratio or np.nan
+            temperature[i] = solar.monthly_temp_c or monthly_temperatures(city.climate)
+        else:
+            temperature[i] = monthly_temperatures(city.climate)
+            reference[i] = solar.monthly_production
+
+    derived = ~measured
+    if derived.any():
+        horizontal[derived] = invert_reference(lat[derived], reference[derived], temperature[derived])
+    return lat, horizontal, diffuse, temperature, measured
+
+
+def city_production(cities, kwp, tilt, azimuth=0.0, bifaciality=0.0, loss=14.0, mounting="free",
+                    inputs=None):
+    """production() pour des City avec un bloc Solar (part diffuse PVGIS si connue)."""
+    lat, horizontal, diffuse, temperature, _ = inputs or location_inputs(cities)
+    out = production(lat, horizontal, temperature, kwp, tilt, azimuth, bifaciality, loss, mounting=mounting)
+    known = ~np.isnan(diffuse).any(axis=1)
+    if known.any():
+        out[known] = production(lat[known], horizontal[known], temperature[known], kwp, tilt, azimuth,
+                                bifaciality, loss, diffuse=diffuse[known], mounting=mounting)
+    return out
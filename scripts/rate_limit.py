@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Contrôle de débit adaptatif (AIMD) pour les APIs à fair-use (Overpass, ...).
+
+- Augmentation additive du débit à chaque succès
+- Diminution multiplicative sur 429 / 503 / 504 / timeout
+- Respect de l'en-tête Retry-After et, pour Overpass, de /api/status
+- Nouvelles tentatives avec backoff exponentiel « full jitter »
+
+Le débit converge ainsi vers le plus rapide toléré par le serveur, au lieu
+d'un time.sleep() fixe trop lent à vide et trop rapide en charge.
+"""
+
+import functools
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts import http_cache
+from scripts.config import RATE_LIMITS
+
+# Statuts HTTP signalant une surcharge du serveur
+THROTTLE_STATUSES = (429, 503, 504)
+
+
+class RateLimitError(Exception):
+    """Le serveur refuse toujours la requête après toutes les tentatives."""
+
+
+class AdaptiveRateLimiter:
+    """
+    Espace les requêtes vers un même hôte selon un débit AIMD.
+    Le débit est exprimé en requêtes/seconde : +increase à chaque succès,
+    ×decrease_factor à chaque signal de surcharge.
+    """
+
+    def __init__(self, name, interval=3.0, min_interval=0.5, max_interval=60.0,
+                 increase=0.05, decrease_factor=0.5):
+        self.name = name
+        self.min_rate = 1.0 / max_interval
+        self.max_rate = 1.0 / min_interval
+        self.rate = min(max(1.0 / interval, self.min_rate), self.max_rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._next_at = 0.0
+
+    @property
+    def interval(self):
+        return 1.0 / self.rate
+
+    def wait(self):
+        """Bloque jusqu'au prochain créneau autorisé."""
+        delay = self._next_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_at = time.monotonic() + self.interval
+
+    def on_success(self):
+        self.rate = min(self.rate + self.increase, self.max_rate)
+
+    def on_throttle(self, retry_after=None):
+        self.rate = max(self.rate * self.decrease_factor, self.min_rate)
+        pause = self.interval if retry_after is None else max(retry_after, self.interval)
+        self._next_at = max(self._next_at, time.monotonic() + pause)
+
+    def server_wait(self):
+        """Attente imposée par le serveur quand il n'envoie pas Retry-After."""
+        return None
+
+
+class OverpassRateLimiter(AdaptiveRateLimiter):
+    """Limiteur AIMD qui consulte /api/status pour connaître les slots libres."""
+
+    def __init__(self, name, status_url, **kwargs):
+        super().__init__(name, **kwargs)
+        self.status_url = status_url
+
+    def server_wait(self):
+        try:
+            resp = requests.get(self.status_url, timeout=10)
+            if resp.ok:
+                return parse_overpass_status(resp.text)
+        except requests.RequestException:
+            pass
+        return None
+
+
+def parse_overpass_status(text):
+    """
+    Extrait de la page /api/status le délai (s) avant le prochain slot libre.
+    Exemple : « 0 slots available now. Slot available after: ..., in 12 seconds. »
+    """
+    match = re.search(r"(\d+) slots? available now", text)
+    if match and int(match.group(1)) > 0:
+        return 0.0
+
+    waits = [int(s) for s in re.findall(r"in (-?\d+) seconds", text)]
+    if waits:
+        return float(max(min(waits), 0))
+    return None
+
+
+def parse_retry_after(value):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Backoff exponentiel avec full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+_LIMITERS = {}
+
+
+def get_limiter(name):
+    """Limiteur partagé par nom d'API (paramètres dans config.RATE_LIMITS)."""
+    if name not in _LIMITERS:
+        params = dict(RATE_LIMITS[name])
+        status_url = params.pop("status_url", None)
+        if status_url:
+            _LIMITERS[name] = OverpassRateLimiter(name, status_url, **params)
+        else:
+            _LIMITERS[name] = AdaptiveRateLimiter(name, **params)
+    return _LIMITERS[name]
+
+
+def request(limiter, method, url, max_retries=4, cache_ttl=None, valid=None, **kwargs):
+    """
+    Envoie une requête HTTP au rythme du limiteur, avec nouvelles tentatives.
+    Retourne la réponse (éventuellement en erreur non liée à la surcharge) ;
+    lève RateLimitError si le serveur reste saturé après max_retries essais.
+
+    Avec cache_ttl, une réponse présente dans le cache HTTP partagé est
+    relue sans attendre le limiteur ; `valid` : voir http_cache.fetch.
+    """
+    if cache_ttl:
+        send = functools.partial(_send, limiter, max_retries=max_retries)
+        return http_cache.fetch(method, url, cache_ttl, send=send, valid=valid, **kwargs)
+    return _send(limiter, method, url, max_retries, **kwargs)
+
+
+def _send(limiter, method, url, max_retries=4, **kwargs):
+    last_error = None
+
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+
+        try:
+            resp = requests.request(method, url, **kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            last_error = f"{type(e).__name__}: {e}"
+            limiter.on_throttle()
+        else:
+            if resp.status_code not in THROTTLE_STATUSES:
+                limiter.on_success()
+                return resp
+
+            last_error = f"HTTP {resp.status_code}"
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = limiter.server_wait()
+            limiter.on_throttle(retry_after)
+
+        if attempt < max_retries:
+            time.sleep(backoff_delay(attempt))
+
+    raise RateLimitError(f"{limiter.name}: {last_error} après {max_retries + 1} tentatives")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tables de rentabilité par ville pour le simulateur d'économies des pages.
+
+Le build précalcule, pour chaque ville avec un bloc solar, une petite table
+quantifiée sur une grille puissance × prix de l'énergie (ROI_SIZES_KWP ×
+ROI_PRICES_EUR_KWH) : production annuelle, économies de la première année et
+temps de retour. Elle est publiée dans output/roi/<slug>.json et
+assets/js/roi.js l'interpole dans la page à chaque mouvement des curseurs,
+sans aucun appel serveur.
+
+Production : modèle PV local (scripts/pv_model.py) pour l'ombrière type
+ROI_SYSTEM, toutes les villes en une passe. Quantification : kWh et € à la
+dizaine, retour en dixièmes d'année (null au-delà de ROI_HORIZON_YEARS).
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import (ROI_CAPEX_EUR_KWP, ROI_DEGRADATION, ROI_DEFAULT_KWP, ROI_FEED_IN_EUR_KWH,
+                            ROI_HORIZON_YEARS, ROI_OPEX_SHARE, ROI_PRICES_EUR_KWH, ROI_SELF_CONSUMPTION,
+                            ROI_SIZES_KWP, ROI_SYSTEM)
+from scripts import pv_model
+
+# Sous-dossier de output/ contenant les tables
+ROI_DIR = "roi"
+
+
+def has_table(city):
+    return bool(city.solar and city.latitude and city.longitude and len(city.solar.monthly_production) == 12)
+
+
+def capex(sizes):
+    """Investissement (€) par puissance : coût au kWc interpolé en échelle logarithmique."""
+    sizes = np.asarray(sizes, dtype=float)
+    points, costs = zip(*ROI_CAPEX_EUR_KWP)
+    return sizes * np.interp(np.log(sizes), np.log(points), costs)
+
+
+def energy_value(prices):
+    """Valeur d'un kWh produit (€) : part autoconsommée au prix d'achat, le reste revendu."""
+    prices = np.asarray(prices, dtype=float)
+    return ROI_SELF_CONSUMPTION * prices + (1 - ROI_SELF_CONSUMPTION) * ROI_FEED_IN_EUR_KWH
+
+
+def payback_years(savings, investment):
+    """
+    Années avant que les économies cumulées, dégradation des modules et
+    entretien compris, couvrent l'investissement (interpolé dans l'année).
+    savings (..., s, p) et investment (s,) ; NaN au-delà de l'horizon.
+    """
+    years = np.arange(ROI_HORIZON_YEARS)
+    opex = (ROI_OPEX_SHARE * investment)[:, None, None]
+    cash = savings[..., None] * (1 - ROI_DEGRADATION) ** years - opex
+    cumulative = np.cumsum(cash, axis=-1)
+    reached = cumulative >= investment[:, None, None]
+    target = investment[:, None]
+    first = reached.argmax(axis=-1)
+    before = np.take_along_axis(cumulative, np.maximum(first - 1, 0)[..., None], axis=-1)[..., 0]
+    before = np.where(first > 0, before, 0.0)
+    during = np.take_along_axis(cash, first[..., None], axis=-1)[..., 0]
+    years_needed = first + (target - before) / np.maximum(during, 1e-9)
+    return np.where(reached.any(axis=-1), years_needed, np.nan)
+
+
+def roi_tables(cities):
+    """
+    Tables de toutes les villes (celles sans has_table() sont ignorées) :
+    {slug: {"kwh": (s,), "eur": (s, p), "payback": (s, p)}}, non quantifiées.
+    """
+    cities = [c for c in cities if has_table(c)]
+    if not cities:
+        return {}
+
+    specific = pv_model.city_production(cities, 1.0, ROI_SYSTEM["tilt"], ROI_SYSTEM["azimuth"],
+                                        ROI_SYSTEM["bifaciality"], ROI_SYSTEM["loss"],
+                                        mounting=ROI_SYSTEM["mounting"]).sum(axis=2)[:, 0]
+    sizes = np.array(ROI_SIZES_KWP, dtype=float)
+    production = specific[:, None] * sizes                                # (n, s)
+    savings = production[:, :, None] * energy_value(ROI_PRICES_EUR_KWH)  # (n, s, p)
+    payback = payback_years(savings, capex(sizes))
+
+    return {
+        city.slug: {"kwh": production[i], "eur": savings[i], "payback": payback[i]}
+        for i, city in enumerate(cities)
+    }
+
+
+def quantize(table):
+    """Table publiée : kWh et € à la dizaine, retour en dixièmes d'année (None = au-delà de l'horizon)."""
+    return {
+        "sizes": list(ROI_SIZES_KWP),
+        "prices": list(ROI_PRICES_EUR_KWH),
+        "horizon": ROI_HORIZON_YEARS,
+        "kwh": [int(round(v, -1)) for v in table["kwh"]],
+        "eur": [[int(round(v, -1)) for v in row] for row in table["eur"]],
+        "payback": [[None if np.isnan(v) else int(round(v * 10)) for v in row] for row in table["payback"]],
+    }
+
+
+def roi_summary(table):
+    """Chiffres cités dans la page : puissance par défaut, fourchette de prix de la grille centrale."""
+    if table is None:
+        return None
+    row = ROI_SIZES_KWP.index(ROI_DEFAULT_KWP)
+    middle = len(ROI_PRICES_EUR_KWH) // 2
+    low, high = max(middle - 1, 0), min(middle + 1, len(ROI_PRICES_EUR_KWH) - 1)
+    payback = table["payback"][row][middle]
+    return {
+        "kwp": ROI_DEFAULT_KWP,
+        "kwh": int(round(table["kwh"][row], -2)),
+        "price": ROI_PRICES_EUR_KWH[middle],
+        "price_low": ROI_PRICES_EUR_KWH[low],
+        "price_high": ROI_PRICES_EUR_KWH[high],
+        "eur_low": int(round(table["eur"][row][low], -2)),
+        "eur_high": int(round(table["eur"][row][high], -2)),
+        "payback": None if np.isnan(payback) else round(float(payback), 1),
+        "self_consumption": int(ROI_SELF_CONSUMPTION * 100),
+        "sizes": ROI_SIZES_KWP,
+        "prices": ROI_PRICES_EUR_KWH,
+    }
+
+
+def write_roi_tables(cities, output_dir):
+    """
+    Écrit output/roi/<slug>.json pour chaque ville avec données solaires.
+    Une table identique n'est pas réécrite (mtime inchangé → pas de redéploiement).
+    Retourne (tables écrites, octets au total).
+    """
+    roi_dir = os.path.join(output_dir, ROI_DIR)
+    os.makedirs(roi_dir, exist_ok=True)
+
+    written, size = 0, 0
+    for slug, table in roi_tables(cities).items():
+        content = json.dumps(quantize(table), separators=(",", ":"))
+        size += len(content)
+        path = os.path.join(roi_dir, f"{slug}.json")
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    continue
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        written += 1
+
+    return written, size
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée unique : toutes les étapes en sous-commandes, enchaînables
+dans un même processus.
+
+    ./rossini generate sitemap validate --full
+    ./rossini fetch --all enrich enrich-solar
+    ./rossini serve 8000
+
+Chaque nom de sous-commande commence une nouvelle étape ; les arguments qui
+suivent sont passés à cette étape (mêmes options que le script NN_*.py). Une
+étape en échec arrête la chaîne.
+
+Le module d'une étape n'est importé qu'au moment de la lancer : `rossini`
+lui-même ne charge ni requests, ni jinja2, ni numpy, et enchaîner les étapes
+évite de repayer le démarrage de l'interpréteur et ces imports à chaque
+script. `./rossini startup` mesure le démarrage à froid.
+
+Une étape enrich* dont aucun champ n'est lu par le site (scripts/field_usage.py,
+`./rossini fields`) est sautée, sauf avec ROSSINI_ALL_FIELDS=1.
+
+    ./rossini --dry-run enrich enrich-industrial
+
+n'exécute rien : affiche les requêtes API que feraient les étapes enrich* de
+la chaîne et leur durée estimée (`./rossini plan`, sans réseau).
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Sous-commande → (module de l'étape, description)
+COMMANDS = {
+    "fetch": ("scripts.01_fetch_cities", "liste des villes (dumps GeoNames/ISTAT, sinon API)"),
+    "enrich": ("scripts.02_fetch_enrichment", "Wikidata, climat Open-Meteo, POIs OSM"),
+    "enrich-pois": ("scripts.02b_enrich_remaining_pois", "POIs des villes restantes"),
+    "enrich-images": ("scripts.05_fetch_images", "images Wikimedia Commons"),
+    "enrich-solar": ("scripts.06_fetch_solar", "irradiation solaire PVGIS"),
+    "enrich-industrial": ("scripts.07_fetch_industrial", "zones industrielles et commerciales OSM"),
+    "enrich-airquality": ("scripts.08_fetch_airquality", "qualité de l'air Open-Meteo"),
+    "generate": ("scripts.03_generate_html", "pages HTML (toutes les langues)"),
+    "sitemap": ("scripts.04_generate_sitemap", "sitemap.xml"),
+    "refresh": ("scripts.09_refresh_live_data", "fragments live sans régénérer le site"),
+    "fonts": ("scripts.16_self_host_fonts", "polices et icônes auto-hébergées (avant fingerprint)"),
+    "fingerprint": ("scripts.10_fingerprint_assets", "assets versionnés + _headers"),
+    "dictionary": ("scripts.17_compression_dictionary", "dictionnaire de compression des pages ville (après fingerprint)"),
+    "validate": ("scripts.11_validate_site", "liens, assets, JSON-LD, sitemap"),
+    "duplicates": ("scripts.12_check_duplicates", "pages ville trop proches"),
+    "manifest": ("scripts.13_deploy_manifest", "fichiers à publier depuis le dernier build"),
+    "links": ("scripts.14_link_graph", "maillage « villes voisines »"),
+    "fields": ("scripts.18_field_usage", "champs d'enrichissement lus par le site, étapes inutiles"),
+    "plan": ("scripts.19_fetch_plan", "requêtes enrich* en attente et durée estimée, sans réseau"),
+    "pv": ("scripts.15_pv_yield", "production PV locale par profil, validée contre PVGIS"),
+    "sites": ("scripts.build_sites", "tous les sites régionaux"),
+    "serve": ("scripts.dev_server", "serveur de développement"),
+    "startup": (None, "mesure du démarrage à froid de rossini et des étapes"),
+}
+
+# Imports lourds qui ne doivent pas être payés avant de lancer une étape
+HEAVY_MODULES = ("requests", "jinja2", "numpy")
+
+STARTUP_RUNS = 5
+STARTUP_BUDGET_MS = 150
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    print("Usage : ./rossini [--dry-run] COMMANDE [options] [COMMANDE [options] ...]\n")
+    print("Commandes :")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+
+
+def split_stages(argv):
+    """[commande, arg, commande, ...] → [(commande, [args]), ...]."""
+    stages = []
+    for arg in argv:
+        if arg in COMMANDS:
+            stages.append((arg, []))
+        elif stages:
+            stages[-1][1].append(arg)
+        else:
+            raise ValueError(f"commande inconnue : {arg}")
+    return stages
+
+
+def run_stage(name, args):
+    """Importe le module de l'étape et lance son main() avec ses arguments. Retourne le code de sortie."""
+    if name == "startup":
+        return startup(args)
+    if name.startswith("enrich"):
+        from scripts.config import SKIP_UNUSED_ENRICHMENT
+        from scripts.field_usage import unused_stage_fields
+
+        unused = unused_stage_fields(name) if SKIP_UNUSED_ENRICHMENT else []
+        if unused:
+            print(f"⏭️  {name} sautée : aucune page ne lit {', '.join(unused)} (ROSSINI_ALL_FIELDS=1 pour la lancer)")
+            return 0
+
+    module = importlib.import_module(COMMANDS[name][0])
+    saved = sys.argv
+    sys.argv = [f"rossini {name}", *args]
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            return e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = saved
+    return 0
+
+
+def _timed(code, runs):
+    """Durées (ms) de `runs` interpréteurs neufs exécutant `code`."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        durations.append((time.perf_counter() - start) * 1000)
+    return sorted(durations)
+
+
+def _median(values):
+    return values[len(values) // 2]
+
+
+def startup(args):
+    """
+    Démarrage à froid, mesuré dans des interpréteurs neufs :
+    - interpréteur nu, puis `import scripts.rossini` : ce dernier doit rester
+      sous --budget ms de plus et ne charger aucun module de HEAVY_MODULES
+    - import du module de chaque étape (coût payé une seule fois par chaîne)
+    Retourne 1 si le budget est dépassé ou si un import lourd a fui.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="rossini startup", description=COMMANDS["startup"][1])
+    parser.add_argument("--runs", type=int, default=STARTUP_RUNS, help="lancements par mesure (médiane)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                        help="surcoût maximal de rossini sur l'interpréteur nu (ms)")
+    parser.add_argument("--stages", action="store_true", help="mesure aussi l'import de chaque étape")
+    args = parser.parse_args(args)
+
+    bare = _median(_timed("pass", args.runs))
+    cli = _median(_timed("import scripts.rossini", args.runs))
+    overhead = cli - bare
+
+    leaked = subprocess.run(
+        [sys.executable, "-c", "import sys, scripts.rossini as r; "
+                               "print(' '.join(m for m in r.HEAVY_MODULES if m in sys.modules))"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout.split()
+
+    print(f"⏱️  Interpréteur nu : {bare:.0f} ms, rossini : {cli:.0f} ms (+{overhead:.0f} ms, "
+          f"budget {args.budget:.0f} ms, médiane sur {args.runs})")
+
+    if args.stages:
+        print("\n📦 Import des étapes (en plus de l'interpréteur) :")
+        for name, (module, _) in COMMANDS.items():
+            if module is None:
+                continue
+            code = f"import sys; sys.path.insert(0, {ROOT!r}); import importlib; importlib.import_module({module!r})"
+            cost = _median(_timed(code, args.runs)) - bare
+            print(f"   {name:<18} {cost:6.0f} ms")
+
+    failed = False
+    if leaked:
+        print(f"❌ Imports lourds au démarrage : {', '.join(leaked)}")
+        failed = True
+    if overhead > args.budget:
+        print(f"❌ Démarrage au-dessus du budget ({overhead:.0f} > {args.budget:.0f} ms)")
+        failed = True
+    if not failed:
+        print("✅ Démarrage à froid dans le budget, aucun import lourd")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        usage()
+        return 0
+
+    dry_run = argv[0] == "--dry-run"
+    if dry_run:
+        argv = argv[1:]
+
+    try:
+        stages = split_stages(argv)
+    except ValueError as e:
+        print(f"❌ {e}\n")
+        usage()
+        return 2
+
+    if dry_run:
+        fetching = [name for name, _ in stages if name.startswith("enrich")]
+        if stages and not fetching:
+            print("✅ Aucune étape enrich* dans la chaîne : pas de requête API à prévoir")
+            return 0
+        return run_stage("plan", [f"--only={','.join(fetching)}"] if fetching else [])
+
+    timings = []
+    for name, args in stages:
+        if len(stages) > 1:
+            print(f"\n▶️  rossini {' '.join([name, *args])}")
+        start = time.perf_counter()
+        code = run_stage(name, args)
+        timings.append((name, time.perf_counter() - start))
+        if code:
+            print(f"❌ Étape {name} en échec (code {code}), chaîne interrompue")
+            return code
+
+    if len(stages) > 1:
+        print("\n⏱️  " + ", ".join(f"{name} {elapsed:.1f}s" for name, elapsed in timings))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sites régionaux (config.SITES) : un même pipeline, un domaine, des données
+et un dossier de sortie par région.
+
+Les étapes 01 → 12 travaillent sur le site actif (ROSSINI_SITE) ;
+build_sites.py en génère plusieurs d'un coup. Les comuni présents dans
+plusieurs sites (communes frontalières) ne sont enrichis qu'une fois :
+reuse_enrichment() reprend les blocs déjà récupérés par un autre site.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.config import DATA_DIR, SITE, SITES
+from scripts.city_model import ENRICHMENT_FIELDS, load_cities, save_cities
+
+
+@dataclass(frozen=True)
+class Site:
+    key: str
+    region: str
+    wikidata_region: str
+    domain: str
+    output_dir: str
+    cities_file: str
+    enriched_file: str
+    capoluoghi: tuple = ()
+    tourist_cities: tuple = ()
+
+    @property
+    def cities_path(self):
+        return os.path.join(DATA_DIR, self.cities_file)
+
+    @property
+    def enriched_path(self):
+        return os.path.join(DATA_DIR, self.enriched_file)
+
+    def input_path(self):
+        """Fichier de données à utiliser (enrichi si disponible), ou None."""
+        for path in (self.enriched_path, self.cities_path):
+            if os.path.exists(path):
+                return path
+        return None
+
+
+def get_site(key=SITE):
+    conf = dict(SITES[key])
+    conf["capoluoghi"] = tuple(conf.get("capoluoghi", ()))
+    conf["tourist_cities"] = tuple(conf.get("tourist_cities", ()))
+    return Site(key=key, **conf)
+
+
+def all_sites():
+    return [get_site(key) for key in SITES]
+
+
+def city_key(city):
+    """Identifiant d'un comune commun à tous les sites (ISTAT, sinon GeoNames/Wikidata)."""
+    if city.istat_code:
+        return f"istat:{city.istat_code}"
+    if city.geonames_id:
+        return f"geonames:{city.geonames_id}"
+    if city.wikidata_id:
+        return f"wikidata:{city.wikidata_id}"
+    return f"slug:{city.slug}"
+
+
+def copy_enrichment(target, source):
+    """Complète les blocs manquants de `target` ; retourne True si un bloc a été repris."""
+    copied = False
+    for name in ENRICHMENT_FIELDS:
+        value = getattr(source, name)
+        if getattr(target, name) is None and value is not None:
+            setattr(target, name, value)
+            copied = True
+    return copied
+
+
+def reuse_enrichment(cities, site):
+    """
+    Reprend l'enrichissement des mêmes comuni dans les fichiers enrichis
+    des autres sites. Retourne les slugs des villes complétées.
+    """
+    known = {}
+    for other in all_sites():
+        if other.key == site.key or not os.path.exists(other.enriched_path):
+            continue
+        for city in load_cities(other.enriched_path):
+            known.setdefault(city_key(city), city)
+
+    reused = set()
+    for city in cities:
+        source = known.get(city_key(city))
+        if source is not None and copy_enrichment(city, source):
+            reused.add(city.slug)
+    return reused
+
+
+def share_enrichment(sites):
+    """
+    Propage entre sites les blocs d'enrichissement des comuni communs,
+    puis réécrit les fichiers enrichis modifiés. Retourne {site: nb villes}.
+    """
+    shared = {}
+    for site in sites:
+        if not os.path.exists(site.enriched_path):
+            continue
+        cities = load_cities(site.enriched_path)
+        reused = reuse_enrichment(cities, site)
+        if reused:
+            save_cities(cities, site.enriched_path)
+            shared[site.key] = len(reused)
+    return shared
@@ -0,0 +1,59 @@
+// Façades des intégrations tierces (scripts/facades.py) : le script du widget
+// n'est chargé qu'au premier contact avec son bloc, ou dès que le bloc
+// approche du viewport pour data-facade-load="proximity".
+(function() {
+    var requested = {};
+
+    function ready(block) {
+        var fn = (block.dataset.facadeReady || '').split('.').reduce(function(obj, key) {
+            return obj && key ? obj[key] : undefined;
+        }, window);
+        if (typeof fn === 'function') fn();
+    }
+
+    function load(block) {
+        var src = block.dataset.facadeSrc;
+        if (requested[src]) return;
+        requested[src] = true;
+
+        var script = document.createElement('script');
+        script.src = src;
+        script.async = true;
+        script.onload = function() {
+            var blocks = document.querySelectorAll('[data-facade-src="' + src + '"]');
+            blocks.forEach(function(el) {
+                el.querySelectorAll('.facade-placeholder').forEach(function(button) { button.remove(); });
+                el.removeAttribute('data-facade');
+            });
+            if (blocks.length) ready(blocks[0]);
+        };
+        document.head.appendChild(script);
+    }
+
+    var blocks = document.querySelectorAll('[data-facade-src]');
+    blocks.forEach(function(block) {
+        ['pointerenter', 'pointerdown', 'focusin'].forEach(function(type) {
+            block.addEventListener(type, function() { load(block); }, { once: true });
+        });
+    });
+
+    var near = Array.prototype.filter.call(blocks, function(block) {
+        return block.dataset.facadeLoad === 'proximity';
+    });
+    if (!near.length) return;
+    if (!('IntersectionObserver' in window)) {
+        near.forEach(load);
+        return;
+    }
+
+    var observer = new IntersectionObserver(function(entries) {
+        entries.forEach(function(entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                load(entry.target);
+            }
+        });
+    }, { rootMargin: '600px 0px' });
+
+    near.forEach(function(block) { observer.observe(block); });
+})();
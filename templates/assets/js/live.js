@@ -0,0 +1,48 @@
+// Données live (qualité de l'air, ...) : chargées quand le bloc approche du viewport.
+// Le conteneur [data-live-src] reste dans le flux ; son contenu [hidden] n'est
+// affiché qu'une fois tous les champs remplis.
+(function() {
+    function lookup(data, path) {
+        return path.split('.').reduce(function(obj, key) {
+            return obj == null ? obj : obj[key];
+        }, data);
+    }
+
+    function load(block) {
+        fetch(block.dataset.liveSrc, { cache: 'no-cache' })
+            .then(function(resp) { return resp.ok ? resp.json() : null; })
+            .then(function(data) {
+                if (!data) return;
+                var fields = block.querySelectorAll('[data-live-field]');
+                var filled = 0;
+                fields.forEach(function(el) {
+                    var value = lookup(data, el.dataset.liveField);
+                    if (value != null) {
+                        el.textContent = value;
+                        filled++;
+                    }
+                });
+                if (filled === fields.length) {
+                    block.querySelectorAll('[hidden]').forEach(function(el) { el.hidden = false; });
+                }
+            })
+            .catch(function() {});
+    }
+
+    var blocks = document.querySelectorAll('[data-live-src]');
+    if (!('IntersectionObserver' in window)) {
+        blocks.forEach(load);
+        return;
+    }
+
+    var observer = new IntersectionObserver(function(entries) {
+        entries.forEach(function(entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                load(entry.target);
+            }
+        });
+    }, { rootMargin: '400px 0px' });
+
+    blocks.forEach(function(block) { observer.observe(block); });
+})();
@@ -0,0 +1,65 @@
+// Mobile menu toggle
+document.addEventListener('DOMContentLoaded', function() {
+    const burger = document.querySelector('.burger-menu');
+    const nav = document.querySelector('nav');
+    const body = document.body;
+
+    if (burger) {
+        burger.addEventListener('click', function() {
+            nav.classList.toggle('active');
+            burger.classList.toggle('active');
+            body.classList.toggle('menu-open');
+        });
+    }
+
+    // Close menu when clicking outside
+    document.addEventListener('click', function(e) {
+        if (!e.target.closest('nav') && !e.target.closest('.burger-menu') && nav.classList.contains('active')) {
+            nav.classList.remove('active');
+            burger.classList.remove('active');
+            body.classList.remove('menu-open');
+        }
+    });
+
+    // Submenu toggle for touch devices
+    const menuItemsWithChildren = document.querySelectorAll('.menu-item-has-children > a');
+    menuItemsWithChildren.forEach(function(item) {
+        item.addEventListener('click', function(e) {
+            if (window.innerWidth <= 768) {
+                e.preventDefault();
+                const parent = this.parentElement;
+                parent.classList.toggle('open');
+                const submenu = parent.querySelector('.sub-menu');
+                if (submenu) {
+                    submenu.style.display = parent.classList.contains('open') ? 'block' : 'none';
+                }
+            }
+        });
+    });
+});
+
+// Service worker (sw.js, généré par 10_fingerprint_assets.py) : assets partagés
+// et pages déjà vues servis depuis le cache. Pas en développement (http).
+if ('serviceWorker' in navigator && location.protocol === 'https:') {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(function() {});
+    });
+}
+
+// Voisines à précharger (règles de spéculation générées par 03_generate_html.py) :
+// repli <link rel="prefetch"> pour les navigateurs sans Speculation Rules
+(function() {
+    var rules = document.querySelector('script[type="speculationrules"]');
+    var connection = navigator.connection || {};
+    if (!rules || connection.saveData || /2g/.test(connection.effectiveType || '')) return;
+    if (HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules')) return;
+
+    JSON.parse(rules.textContent).prefetch.forEach(function(rule) {
+        (rule.urls || []).forEach(function(url) {
+            var link = document.createElement('link');
+            link.rel = 'prefetch';
+            link.href = url;
+            document.head.appendChild(link);
+        });
+    });
+})();
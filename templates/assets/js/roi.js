@@ -0,0 +1,94 @@
+// Simulateur d'économies : table précalculée par ville (roi/<slug>.json,
+// scripts/roi_tables.py), interpolée à chaque mouvement des curseurs.
+// Chargée quand le bloc approche du viewport ou au premier contact.
+(function() {
+    // Position de x dans une grille croissante : [indice, fraction]
+    function locate(grid, x) {
+        if (x <= grid[0]) return [0, 0];
+        var last = grid.length - 1;
+        if (x >= grid[last]) return [last - 1, 1];
+        var i = 0;
+        while (grid[i + 1] < x) i++;
+        return [i, (x - grid[i]) / (grid[i + 1] - grid[i])];
+    }
+
+    function lerp(a, b, t) {
+        if (a == null || b == null) return t < 0.5 ? a : b;
+        return a + (b - a) * t;
+    }
+
+    function bilinear(rows, s, p) {
+        var top = lerp(rows[s[0]][p[0]], rows[s[0]][p[0] + 1], p[1]);
+        var bottom = lerp(rows[s[0] + 1][p[0]], rows[s[0] + 1][p[0] + 1], p[1]);
+        return lerp(top, bottom, s[1]);
+    }
+
+    function setup(block, table) {
+        var lang = document.documentElement.lang || 'it';
+        var integer = new Intl.NumberFormat(lang, { maximumFractionDigits: 0 });
+        var decimal = new Intl.NumberFormat(lang, { minimumFractionDigits: 1, maximumFractionDigits: 1 });
+        var price = new Intl.NumberFormat(lang, { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+        var inputs = {};
+        block.querySelectorAll('[data-roi-input]').forEach(function(el) {
+            inputs[el.dataset.roiInput] = el;
+        });
+
+        function show(name, text) {
+            block.querySelectorAll('[data-roi-field="' + name + '"]').forEach(function(el) {
+                el.textContent = text;
+            });
+        }
+
+        function update() {
+            var size = parseFloat(inputs.size.value);
+            var energy = parseFloat(inputs.price.value);
+            var s = locate(table.sizes, size);
+            var p = locate(table.prices, energy);
+            var payback = bilinear(table.payback, s, p);
+
+            show('size', integer.format(size));
+            show('price', price.format(energy));
+            show('kwh', integer.format(Math.round(lerp(table.kwh[s[0]], table.kwh[s[0] + 1], s[1]) / 100) * 100));
+            show('eur', integer.format(Math.round(bilinear(table.eur, s, p) / 100) * 100));
+            show('payback', payback == null ? '> ' + table.horizon : decimal.format(payback / 10));
+        }
+
+        Object.keys(inputs).forEach(function(name) {
+            inputs[name].addEventListener('input', update);
+        });
+        update();
+        block.querySelectorAll('[hidden]').forEach(function(el) { el.hidden = false; });
+    }
+
+    function load(block) {
+        if (block.dataset.roiLoaded) return;
+        block.dataset.roiLoaded = '1';
+        fetch(block.dataset.roiSrc)
+            .then(function(resp) { return resp.ok ? resp.json() : null; })
+            .then(function(table) { if (table) setup(block, table); })
+            .catch(function() {});
+    }
+
+    var blocks = document.querySelectorAll('[data-roi-src]');
+    blocks.forEach(function(block) {
+        ['pointerdown', 'focusin'].forEach(function(type) {
+            block.addEventListener(type, function() { load(block); }, { once: true });
+        });
+    });
+
+    if (!('IntersectionObserver' in window)) {
+        blocks.forEach(load);
+        return;
+    }
+
+    var observer = new IntersectionObserver(function(entries) {
+        entries.forEach(function(entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                load(entry.target);
+            }
+        });
+    }, { rootMargin: '400px 0px' });
+
+    blocks.forEach(function(block) { observer.observe(block); });
+})();
@@ -0,0 +1,111 @@
+// Service worker généré par scripts/10_fingerprint_assets.py : BUILD (version,
+// assets empreintés à précharger, limite de pages) est inséré au-dessus.
+// - assets empreintés : cache d'abord (immuables)
+// - pages HTML et tables du simulateur : cache puis revalidation en arrière-plan
+// - fragments live : réseau d'abord, cache hors ligne
+// Un nouveau build change BUILD.version : les caches de l'ancien sont supprimés.
+var ASSETS = 'rossini-assets-' + BUILD.version;
+var PAGES = 'rossini-pages-' + BUILD.version;
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        caches.open(ASSETS)
+            .then(function(cache) { return cache.addAll(BUILD.precache); })
+            .then(function() { return self.skipWaiting(); })
+    );
+});
+
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys()
+            .then(function(keys) {
+                return Promise.all(keys.filter(function(key) {
+                    return key.indexOf('rossini-') === 0 && key !== ASSETS && key !== PAGES;
+                }).map(function(key) { return caches.delete(key); }));
+            })
+            .then(function() { return self.clients.claim(); })
+    );
+});
+
+// Garde les BUILD.pages dernières pages (ordre d'insertion du cache)
+function trim(cache) {
+    return cache.keys().then(function(keys) {
+        return Promise.all(keys.slice(0, Math.max(keys.length - BUILD.pages, 0)).map(function(key) {
+            return cache.delete(key);
+        }));
+    });
+}
+
+// Réponse obtenue après une redirection (/citta/x → /citta/x/) : jamais mise en
+// cache, et renvoyée comme redirection — une navigation (redirect: 'manual')
+// refuse une réponse redirigée, et le navigateur doit afficher l'URL finale.
+function cacheable(resp) {
+    return resp.ok && !resp.redirected;
+}
+
+function unredirected(resp) {
+    return resp.redirected ? Response.redirect(resp.url, 302) : resp;
+}
+
+function cacheFirst(request) {
+    return caches.match(request).then(function(cached) {
+        return cached || fetch(request).then(function(resp) {
+            if (cacheable(resp)) {
+                var copy = resp.clone();
+                caches.open(ASSETS).then(function(cache) { cache.put(request, copy); });
+            }
+            return unredirected(resp);
+        });
+    });
+}
+
+function staleWhileRevalidate(event, request) {
+    return caches.open(PAGES).then(function(cache) {
+        return cache.match(request).then(function(cached) {
+            var update = fetch(request).then(function(resp) {
+                if (cacheable(resp)) {
+                    return cache.delete(request)
+                        .then(function() { return cache.put(request, resp.clone()); })
+                        .then(function() { return trim(cache); })
+                        .then(function() { return resp; });
+                }
+                return unredirected(resp);
+            });
+            if (cached) {
+                event.waitUntil(update.catch(function() {}));
+                return cached;
+            }
+            return update;
+        });
+    });
+}
+
+function networkFirst(request) {
+    return fetch(request)
+        .then(function(resp) {
+            if (cacheable(resp)) {
+                var copy = resp.clone();
+                caches.open(PAGES).then(function(cache) { cache.put(request, copy); });
+            }
+            return unredirected(resp);
+        })
+        .catch(function() {
+            return caches.match(request).then(function(cached) { return cached || Response.error(); });
+        });
+}
+
+self.addEventListener('fetch', function(event) {
+    var request = event.request;
+    var url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+    var path = url.pathname;
+    if (path.indexOf('/assets/') === 0) {
+        event.respondWith(cacheFirst(request));
+    } else if (path.indexOf('/' + BUILD.live + '/') === 0) {
+        event.respondWith(networkFirst(request));
+    } else if (request.mode === 'navigate' || /\.html$|\/$/.test(path) || path.indexOf('/' + BUILD.roi + '/') === 0) {
+        // Clé sans paramètres : une même page quels que soient les paramètres de campagne
+        event.respondWith(staleWhileRevalidate(event, new Request(url.origin + path)));
+    }
+});